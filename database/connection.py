@@ -3,6 +3,7 @@
 import os
 from dotenv import load_dotenv
 from sqlmodel import SQLModel, create_engine, Session
+from sqlalchemy.orm import scoped_session, sessionmaker
 from typing import Generator, TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -29,6 +30,7 @@ engine = create_engine(
     pool_size=5,
     max_overflow=10,
     pool_pre_ping=True,  # Verifica conexiones antes de usarlas
+    pool_recycle=3600,  # Renueva conexiones de más de 1 hora (timeouts del servidor/proxy)
 )
 
 
@@ -61,6 +63,16 @@ def get_session_context() -> Session:
     return Session(engine)
 
 
+def get_scoped_session() -> scoped_session:
+    """
+    Registro de sesiones por hilo: cada hilo reutiliza siempre la misma Session.
+    Llamar al registro devuelve la sesión del hilo actual; session.close() la
+    libera (devuelve la conexión al pool) sin descartarla.
+    IMPORTANTE: Llamar a .remove() al dejar de usarlo
+    """
+    return scoped_session(sessionmaker(bind=engine, class_=Session))
+
+
 # Función de inicialización
 def init_database():
     """Inicializa la base de datos"""
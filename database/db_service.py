@@ -1,10 +1,12 @@
 """Repositorio para operaciones CRUD"""
 
-from typing import List, Optional
-from sqlmodel import Session, select
+import hmac
+import secrets
+from typing import Dict, Iterator, List, Optional
+from sqlmodel import Session, select, func, and_, update
 from datetime import datetime
 
-from models.cliente import Cliente
+from models.cliente import Cliente, ClienteResumen
 from models.producto import Producto
 from models.venta import Venta
 from models.abono import Abono
@@ -28,12 +30,44 @@ class ClienteRepository:
         """Obtiene un cliente por ID"""
         return session.get(Cliente, cliente_id)
     
+    @staticmethod
+    def _select_con_deuda_real(*columnas):
+        """
+        Consulta de clientes activos con las columnas dadas y la deuda real como
+        última columna (LEFT JOIN con las ventas fiadas pendientes, agrupado por cliente)
+        """
+        return select(*columnas, func.coalesce(func.sum(Venta.resto), 0.0)).outerjoin(
+            Venta,
+            and_(
+                Venta.cliente_id == Cliente.id,
+                Venta.es_fiado,
+                Venta.pagado_completamente == False
+            )
+        ).where(Cliente.activo).group_by(Cliente.id).order_by(Cliente.nombre)
+
     @staticmethod
     def listar_activos(session: Session) -> List[Cliente]:
         """Lista todos los clientes activos"""
         statement = select(Cliente).where(Cliente.activo).order_by(Cliente.nombre)
         return session.exec(statement).all()
-    
+
+    @staticmethod
+    def iterar_activos_resumen(session: Session, tamano_lote: Optional[int] = 500) -> Iterator[ClienteResumen]:
+        """
+        Clientes activos para el listado: solo las columnas que muestra la tarjeta
+        y la deuda real, sin cargar el modelo completo. Se leen de a tamano_lote
+        filas (yield_per), así que la sesión debe seguir abierta mientras se
+        recorre; el Cliente completo se pide con obtener_por_id al editarlo.
+        """
+        statement = ClienteRepository._select_con_deuda_real(
+            Cliente.id, Cliente.nombre, Cliente.telefono, Cliente.direccion, Cliente.limite_credito
+        )
+        if tamano_lote:
+            statement = statement.execution_options(yield_per=tamano_lote)
+
+        for fila in session.exec(statement):
+            yield ClienteResumen(*fila)
+
     @staticmethod
     def buscar_por_nombre(session: Session, nombre: str) -> List[Cliente]:
         """Busca clientes por nombre (parcial)"""
@@ -107,35 +141,57 @@ class ClienteRepository:
         """
         Sincroniza las deudas de TODOS los clientes activos.
         Retorna un diccionario con estadísticas de la sincronización.
-        """
-        clientes = ClienteRepository.listar_activos(session)
-        stats = {
-            'total_clientes': len(clientes),
-            'clientes_corregidos': 0,
-            'diferencias': []
-        }
-
-        for cliente in clientes:
-            deuda_bd = cliente.deuda_total
-            deuda_real = ClienteRepository.calcular_deuda_real(session, cliente.id)
-
-            # Si hay diferencia, corregir
-            if abs(deuda_bd - deuda_real) > 0.01:  # Tolerancia de 1 centavo
-                cliente.deuda_total = deuda_real
-                cliente.fecha_actualizacion = datetime.now()
-                session.add(cliente)
 
-                stats['clientes_corregidos'] += 1
-                stats['diferencias'].append({
-                    'cliente_id': cliente.id,
-                    'nombre': cliente.nombre,
-                    'deuda_bd': deuda_bd,
-                    'deuda_real': deuda_real,
-                    'diferencia': deuda_real - deuda_bd
-                })
+        La corrección se hace con un único UPDATE ... RETURNING: la deuda real se
+        calcula una vez por cliente (CTE con subconsulta correlacionada con las
+        ventas) y el mismo UPDATE devuelve las diferencias, sin cargar objetos.
+        Usa UPDATE ... FROM ... RETURNING de PostgreSQL.
+        """
+        deuda_real = func.coalesce(
+            select(func.sum(Venta.resto)).where(
+                Venta.cliente_id == Cliente.id,
+                Venta.es_fiado,
+                Venta.pagado_completamente == False
+            ).correlate(Cliente).scalar_subquery(),
+            0.0
+        )
+        # Deuda guardada y deuda real de cada cliente activo, calculadas una sola vez
+        recalculo = (
+            select(Cliente.id.label('cliente_id'), Cliente.deuda_total.label('deuda_bd'), deuda_real.label('deuda_real'))
+            .where(Cliente.activo)
+            .cte('recalculo')
+        )
 
+        total_clientes = session.exec(select(func.count(Cliente.id)).where(Cliente.activo)).one()
+        diferencias = session.exec(
+            update(Cliente)
+            .where(
+                Cliente.id == recalculo.c.cliente_id,
+                func.abs(recalculo.c.deuda_bd - recalculo.c.deuda_real) > 0.01  # Tolerancia de 1 centavo
+            )
+            .values(deuda_total=recalculo.c.deuda_real, fecha_actualizacion=datetime.now())
+            .returning(Cliente.id, Cliente.nombre, recalculo.c.deuda_bd, recalculo.c.deuda_real)
+            .execution_options(synchronize_session=False)
+        ).all()
         session.commit()
-        return stats
+
+        return {
+            'total_clientes': total_clientes,
+            'clientes_corregidos': len(diferencias),
+            'diferencias': sorted(
+                (
+                    {
+                        'cliente_id': cliente_id,
+                        'nombre': nombre,
+                        'deuda_bd': deuda_bd,
+                        'deuda_real': deuda,
+                        'diferencia': deuda - deuda_bd
+                    }
+                    for cliente_id, nombre, deuda_bd, deuda in diferencias
+                ),
+                key=lambda diff: diff['nombre']
+            )
+        }
 
 
 class ProductoRepository:
@@ -268,6 +324,77 @@ class VentaRepository:
         # Devolver la venta actualizada
         return session.get(Venta, venta_id)
     
+    @staticmethod
+    def registrar_abonos_bulk(session: Session, abonos: List[tuple], notas: Optional[str] = None, usuario_id: Optional[int] = None, usuario_nombre: Optional[str] = None) -> List[Venta]:
+        """
+        Registra varios abonos [(venta_id, monto), ...] con un solo commit.
+        Hace las mismas validaciones que AbonoRepository.crear, pero antes de tocar nada:
+        si un abono no es válido no se registra ninguno.
+        Retorna las ventas actualizadas en el mismo orden.
+        """
+        if not abonos:
+            return []
+        venta_ids = [venta_id for venta_id, _ in abonos]
+
+        # Ventas y lo abonado hasta ahora, una consulta cada uno
+        ventas = {v.id: v for v in VentaRepository.obtener_por_ids(session, venta_ids)}
+        statement = select(Abono.venta_id, func.sum(Abono.monto)).where(
+            Abono.venta_id.in_(venta_ids)
+        ).group_by(Abono.venta_id)
+        abonado_actual = dict(session.exec(statement).all())
+
+        for venta_id, monto in abonos:
+            venta = ventas.get(venta_id)
+            if not venta:
+                raise ValueError(f"Venta con id {venta_id} no encontrada")
+            if not venta.es_fiado:
+                raise ValueError("Solo se pueden registrar abonos en ventas fiadas")
+            if monto <= 0:
+                raise ValueError("El monto del abono debe ser mayor a 0")
+            resto_pendiente = venta.total - (abonado_actual.get(venta_id) or 0.0)
+            if monto > resto_pendiente:
+                raise ValueError(f"El monto del abono (${monto:.2f}) excede el resto pendiente (${resto_pendiente:.2f})")
+
+        # Crear los abonos y actualizar las ventas
+        descuento_por_cliente = {}
+        for venta_id, monto in abonos:
+            venta = ventas[venta_id]
+            session.add(Abono(
+                venta_id=venta_id,
+                monto=monto,
+                notas=notas,
+                usuario_id=usuario_id,
+                usuario_nombre=usuario_nombre
+            ))
+            abonado_actual[venta_id] = (abonado_actual.get(venta_id) or 0.0) + monto
+            venta.abonado = abonado_actual[venta_id]
+            venta.calcular_totales()
+            session.add(venta)
+            if venta.cliente_id:
+                descuento_por_cliente[venta.cliente_id] = descuento_por_cliente.get(venta.cliente_id, 0.0) + monto
+
+        # Actualizar deuda de los clientes (una vez por cliente)
+        for cliente_id, monto in descuento_por_cliente.items():
+            cliente = session.get(Cliente, cliente_id)
+            if cliente:
+                cliente.deuda_total -= monto
+                cliente.fecha_actualizacion = datetime.now()
+                session.add(cliente)
+
+        session.commit()
+
+        # Recargar las ventas (quedan expiradas tras el commit) en una sola consulta
+        ventas = {v.id: v for v in VentaRepository.obtener_por_ids(session, venta_ids)}
+        return [ventas[venta_id] for venta_id in venta_ids]
+
+    @staticmethod
+    def obtener_por_ids(session: Session, venta_ids: List[int]) -> List[Venta]:
+        """Obtiene varias ventas por ID en una sola consulta"""
+        if not venta_ids:
+            return []
+        statement = select(Venta).where(Venta.id.in_(venta_ids))
+        return session.exec(statement).all()
+
     @staticmethod
     def listar_fiados_cliente(session: Session, cliente_id: int) -> List[Venta]:
         """Lista ventas fiadas pendientes de un cliente"""
@@ -399,6 +526,20 @@ class AbonoRepository:
         statement = select(Abono).where(Abono.venta_id == venta_id).order_by(Abono.fecha)
         return session.exec(statement).all()
 
+    @staticmethod
+    def listar_por_ventas(session: Session, venta_ids: List[int]) -> Dict[int, List[Abono]]:
+        """
+        Igual que listar_por_venta pero para varias ventas en una sola consulta.
+        Retorna {venta_id: abonos ordenados por fecha}; las ventas sin abonos no aparecen.
+        """
+        abonos_por_venta: Dict[int, List[Abono]] = {}
+        if not venta_ids:
+            return abonos_por_venta
+        statement = select(Abono).where(Abono.venta_id.in_(venta_ids)).order_by(Abono.fecha)
+        for abono in session.exec(statement):
+            abonos_por_venta.setdefault(abono.venta_id, []).append(abono)
+        return abonos_por_venta
+
     @staticmethod
     def obtener_por_id(session: Session, abono_id: int) -> Optional[Abono]:
         """Obtiene un abono por ID"""
@@ -434,6 +575,9 @@ class AbonoRepository:
 class UsuarioRepository:
     """Repositorio para operaciones de Usuario"""
 
+    # Contraseña contra la que se compara cuando el usuario no existe (ver autenticar)
+    _CONTRASEÑA_FICTICIA = secrets.token_urlsafe(16)
+
     @staticmethod
     def crear(session: Session, usuario: Usuario) -> Usuario:
         """Crea un nuevo usuario"""
@@ -481,7 +625,13 @@ class UsuarioRepository:
     def autenticar(session: Session, nombre: str, contraseña: str) -> Optional[Usuario]:
         """Autentica un usuario con nombre y contraseña"""
         usuario = UsuarioRepository.obtener_por_nombre(session, nombre)
-        if usuario and usuario.contraseña == contraseña and usuario.activo:
+
+        # La contraseña se compara siempre y en tiempo constante (contra una ficticia
+        # si el usuario no existe), para que la demora no delate qué usuarios existen
+        guardada = usuario.contraseña if usuario else UsuarioRepository._CONTRASEÑA_FICTICIA
+        coincide = hmac.compare_digest(guardada.encode(), contraseña.encode())
+
+        if usuario and coincide and usuario.activo:
             # Actualizar último acceso
             usuario.actualizar_ultimo_acceso()
             session.add(usuario)
@@ -29,6 +29,9 @@ class MainApp:
         self.api = APIController(self.state)
         self.sidebar = None
 
+        # Página mostrada en el área de contenido (para liberarla al navegar)
+        self.pagina_actual = None
+
         # Usuario y sesión actuales
         self.usuario_actual = None
         self.token_sesion = None
@@ -144,13 +147,22 @@ class MainApp:
         self.content_area.content = self.content_loading
         self.page.update()
 
+        self._liberar_pagina_actual()
+
         page_obj = self.router.get_current_page()
+        self.pagina_actual = page_obj
         if page_obj:
             if self.sidebar and hasattr(self.sidebar, 'loading_indicator'):
                 self.sidebar.loading_indicator.visible = False
             self.content_area.content = page_obj.build()
             self.page.update()
 
+    def _liberar_pagina_actual(self):
+        """Libera los recursos de la página que se deja (sesiones de BD, timers)"""
+        if self.pagina_actual is not None and hasattr(self.pagina_actual, 'dispose'):
+            self.pagina_actual.dispose()
+        self.pagina_actual = None
+
     def _validar_sesion(self) -> bool:
         """Valida que la sesión actual siga siendo válida"""
         if not self.token_sesion:
@@ -237,6 +249,7 @@ class MainApp:
         """Vuelve a la pantalla de login"""
 
         # Limpiar estado
+        self._liberar_pagina_actual()
         self.usuario_actual = None
         self.token_sesion = None
         self.state.set("usuario_actual", None)
@@ -1,10 +1,10 @@
 """Modelos de la aplicación"""
 
-from .cliente import Cliente
+from .cliente import Cliente, ClienteResumen
 from .producto import Producto
 from .venta import Venta, ItemVenta
 from .abono import Abono
 from .usuario import Usuario, RolUsuario
 from .sesion import Sesion
 
-__all__ = ["Cliente", "Producto", "Venta", "ItemVenta", "Abono", "Usuario", "RolUsuario", "Sesion"]
\ No newline at end of file
+__all__ = ["Cliente", "ClienteResumen", "Producto", "Venta", "ItemVenta", "Abono", "Usuario", "RolUsuario", "Sesion"]
\ No newline at end of file
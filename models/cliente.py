@@ -1,6 +1,6 @@
 """Modelo de Cliente"""
 
-from typing import Optional
+from typing import NamedTuple, Optional
 from datetime import datetime
 from sqlmodel import SQLModel, Field
 
@@ -44,4 +44,19 @@ class Cliente(SQLModel, table=True):
         return self.deuda_total > 0
     
     def __repr__(self):
-        return f"Cliente(id={self.id}, nombre={self.nombre}, deuda={self.deuda_total})"
\ No newline at end of file
+        return f"Cliente(id={self.id}, nombre={self.nombre}, deuda={self.deuda_total})"
+
+
+class ClienteResumen(NamedTuple):
+    """Datos de un cliente para listados (sin cargar el modelo completo)"""
+
+    id: int
+    nombre: str
+    telefono: Optional[str]
+    direccion: Optional[str]
+    limite_credito: float
+    deuda_total: float  # Deuda real, calculada desde las ventas pendientes
+
+    def tiene_deuda(self) -> bool:
+        """Verifica si el cliente tiene deuda pendiente"""
+        return self.deuda_total > 0
\ No newline at end of file
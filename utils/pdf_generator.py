@@ -2,19 +2,534 @@
 
 import os
 import io
+import asyncio
+import sys
 import base64
+import queue
+import shutil
 import tempfile
+import threading
+import platform
+import subprocess
+import time
+import traceback
+import uuid
+from collections import namedtuple
+from xml.sax.saxutils import escape
 from datetime import datetime
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib import colors
-from reportlab.lib.units import inch, mm
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
+import flet as ft
+
+try:
+    import win32print  # Solo disponible en Windows con pywin32
+    import win32api
+except ImportError:
+    win32print = None
+    win32api = None
+
+try:
+    import ferropdf  # Motor HTML->PDF en Rust (opcional, más rápido para A4)
+except ImportError:
+    ferropdf = None
+
+# Sistema operativo (se consulta una sola vez; lo usa es_web())
+try:
+    _PLATFORM_SYSTEM = platform.system()
+except Exception:
+    _PLATFORM_SYSTEM = ''
+
+# Marca "todavía no se buscó" (None significa "se buscó y no está instalado")
+_SENTINEL = object()
+
+# Rutas de instalación conocidas de SumatraPDF y GhostScript (Windows)
+_SUMATRA_RUTAS_SISTEMA = (
+    r"C:\Program Files\SumatraPDF\SumatraPDF.exe",
+    r"C:\Program Files (x86)\SumatraPDF\SumatraPDF.exe",
+)
+_GS_RUTAS = (
+    r"C:\Program Files\gs\gs10.03.1\bin\gswin64c.exe",
+    r"C:\Program Files\gs\gs10.03.0\bin\gswin64c.exe",
+    r"C:\Program Files (x86)\gs\gs10.03.1\bin\gswin32c.exe",
+    r"C:\Program Files (x86)\gs\gs10.03.0\bin\gswin32c.exe",
+)
+
+# Argumentos fijos de GhostScript para imprimir directo a una impresora de Windows
+_GS_FIXED = ("-dPrinted", "-dBATCH", "-dNOPAUSE", "-dNOSAFER", "-dNumCopies=1", "-sDEVICE=mswinpr2")
+
+# Formatos de las filas de ventas abonadas (ya ligados, se usan una vez por venta)
+_VENTA_HDR = "Venta #%s".__mod__
+_MONEY = "$%.2f".__mod__
+_FECHA_FMT = "Fecha: %s"
+
+# Fechas ya formateadas (dd/mm/aaaa) por día; hay pocas distintas por liquidación
+_fechas_fmt = {}
+
+
+def _fmt_fecha(d):
+    """Formatea una fecha como dd/mm/aaaa sin pasar por strftime"""
+    clave = (d.year, d.month, d.day)
+    texto = _fechas_fmt.get(clave)
+    if texto is None:
+        texto = _fechas_fmt[clave] = "%02d/%02d/%04d" % (d.day, d.month, d.year)
+    return texto
+
+
+def _ejecutar_silencioso(cmd):
+    """Ejecuta un comando de impresión sin ventana y con timeout (si el spooler se cuelga, falla)"""
+    subprocess.run(
+        cmd,
+        creationflags=subprocess.CREATE_NO_WINDOW,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        close_fds=False,  # No hace falta filtrar handles heredados (más rápido en Windows)
+        timeout=30,
+        check=True
+    )
+
+
+def _imprimir_sumatra(sumatra_path, ruta_pdf, nombre_impresora):
+    """Imprime con SumatraPDF en modo silencioso (más confiable)"""
+    if nombre_impresora:
+        _ejecutar_silencioso([sumatra_path, "-print-to", nombre_impresora, ruta_pdf])
+    else:
+        _ejecutar_silencioso([sumatra_path, "-print-to-default", ruta_pdf])
+
+
+def _imprimir_gs(gs_path, ruta_pdf, nombre_impresora):
+    """Imprime con GhostScript directo a la impresora"""
+    _ejecutar_silencioso([gs_path, *_GS_FIXED, f"-sOutputFile=%printer%{nombre_impresora or 'default'}", ruta_pdf])
+
+
+def _imprimir_shell(_, ruta_pdf, nombre_impresora):
+    """Usa el verbo print/printto del visor PDF asociado (ShellExecute directo, sin cmd/start)"""
+    print("Usando el visor PDF del sistema para imprimir (puede abrir ventana brevemente)...")
+    if win32api is not None:
+        if nombre_impresora:
+            win32api.ShellExecute(0, 'printto', ruta_pdf, f'"{nombre_impresora}"', '.', 0)
+        else:
+            win32api.ShellExecute(0, 'print', ruta_pdf, None, '.', 0)
+    elif nombre_impresora:
+        os.startfile(ruta_pdf, 'printto', f'"{nombre_impresora}"', show_cmd=0)
+    else:
+        os.startfile(ruta_pdf, 'print', show_cmd=0)
+
+
+# Métodos de impresión en Windows, en orden de preferencia.
+# buscar() devuelve el ejecutable a usar (o None si no está disponible)
+_Backend = namedtuple('_Backend', 'nombre buscar imprimir')
+
+_WIN_BACKENDS = (
+    _Backend('SumatraPDF', lambda: PDFGenerator._obtener_ejecutables_impresion()[0], _imprimir_sumatra),
+    _Backend('GhostScript', lambda: PDFGenerator._obtener_ejecutables_impresion()[1], _imprimir_gs),
+    _Backend('el visor PDF del sistema', lambda: True, _imprimir_shell),
+)
+
+
+# ============================================
+# CARGA DIFERIDA DE REPORTLAB
+# ============================================
+# ReportLab es pesado de importar y este módulo se importa desde las vistas al
+# arrancar la app, aunque el primer comprobante recién se genere al cerrar una
+# venta. Por eso los nombres de ReportLab (y los estilos que dependen de ellos)
+# se cargan en _cargar_reportlab(), que se llama al entrar a cada generador.
+
+A4 = colors = inch = mm = None
+SimpleDocTemplate = Table = TableStyle = Paragraph = Spacer = None
+getSampleStyleSheet = ParagraphStyle = TA_CENTER = simpleSplit = canvas = None
+
+# Tamaño del ticket 80mm (se calcula al cargar ReportLab)
+TICKET_80MM = None
+
+# Colores del comprobante (se crean una sola vez al cargar ReportLab)
+C_GRAY6 = C_GREEN = C_RED = C_BGLIGHT = C_BLUE = None
+
+_reportlab_cargado = False
+_reportlab_lock = threading.Lock()
+
+
+def _cargar_reportlab():
+    """Importa ReportLab y construye los estilos la primera vez que se necesitan"""
+    global _reportlab_cargado, TICKET_80MM
+    global C_GRAY6, C_GREEN, C_RED, C_BGLIGHT, C_BLUE
+    global A4, colors, inch, mm
+    global SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    global getSampleStyleSheet, ParagraphStyle, TA_CENTER, simpleSplit, canvas
+
+    if _reportlab_cargado:
+        return
+
+    with _reportlab_lock:
+        if _reportlab_cargado:
+            return
+
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib import colors
+        from reportlab.lib.units import inch, mm
+        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.enums import TA_CENTER
+        from reportlab.lib.utils import simpleSplit
+        from reportlab.pdfgen import canvas
+        from reportlab.pdfbase.pdfmetrics import getFont
+
+        # Tamaños de papel personalizados
+        # Para impresoras térmicas, usamos altura más corta y ajustable
+        TICKET_80MM = (80*mm, 200*mm)  # 80mm de ancho, altura ajustable para térmica
+
+        C_GRAY6 = colors.HexColor('#424242')
+        C_GREEN = colors.HexColor('#2E7D32')
+        C_RED = colors.HexColor('#D32F2F')
+        C_BGLIGHT = colors.HexColor('#F5F5F5')
+        C_BLUE = colors.HexColor('#1976D2')
+
+        # Cargar las métricas de Helvetica para que el primer comprobante no pague ese costo
+        getFont('Helvetica')
+        getFont('Helvetica-Bold')
+
+        _construir_estilos()
+        _reportlab_cargado = True
+
+
+def _precargar_reportlab():
+    """Carga ReportLab en segundo plano para que el primer comprobante salga rápido"""
+    try:
+        _cargar_reportlab()
+    except Exception as e:
+        print(f"No se pudo precargar ReportLab: {e}")
+
+
+# Precarga en segundo plano para no demorar el import del módulo (ni el arranque de la UI)
+threading.Thread(target=_precargar_reportlab, daemon=True).start()
+
+
+# Pool de buffers en memoria para los comprobantes web: se reutilizan en vez de
+# crear un BytesIO nuevo (y hacerlo crecer de a poco) en cada generación
+_buf_pool = queue.LifoQueue(maxsize=8)
+
+
+def _acquire_buf():
+    """Obtiene un buffer vacío del pool (o uno nuevo si el pool está vacío)"""
+    try:
+        return _buf_pool.get_nowait()
+    except queue.Empty:
+        return io.BytesIO()
+
+
+def _release_buf(buf):
+    """Vacía el buffer y lo devuelve al pool (se descarta si el pool está lleno)"""
+    buf.seek(0)
+    buf.truncate(0)
+    try:
+        _buf_pool.put_nowait(buf)
+    except queue.Full:
+        pass
+
+
+def _leer_buf(buf):
+    """Copia el contenido del buffer a bytes con una sola copia"""
+    with buf.getbuffer() as vista:
+        return bytes(vista)
+
+
+# ============================================
+# ESTILOS PRECALCULADOS
+# ============================================
+# Los estilos solo dependen del tamaño de papel: se construyen una vez (al cargar
+# ReportLab) y se reutilizan en cada comprobante (TableStyle es de solo lectura
+# una vez aplicado con setStyle, así que compartirlo entre documentos es seguro).
+
+_SAMPLE = _HEADING1 = _NORMAL = None
+_STYLES_80MM = None
+_STYLES_A4 = None
 
-# Tamaños de papel personalizados
-# Para impresoras térmicas, usamos altura más corta y ajustable
-TICKET_80MM = (80*mm, 200*mm)  # 80mm de ancho, altura ajustable para térmica
+
+def _construir_estilos():
+    """Construye los estilos de 80mm y A4 (se llama una sola vez desde _cargar_reportlab)"""
+    global _SAMPLE, _HEADING1, _NORMAL, _STYLES_80MM, _STYLES_A4
+
+    # Solo se usan dos estilos de la hoja de ejemplo como padres
+    _SAMPLE = getSampleStyleSheet()
+    _HEADING1 = _SAMPLE['Heading1']
+    _NORMAL = _SAMPLE['Normal']
+
+    _STYLES_80MM = {
+        # Estilos para ticket 80mm - optimizados para impresora térmica
+        'titulo': ParagraphStyle(
+            'CustomTitle',
+            parent=_HEADING1,
+            fontSize=12,
+            textColor=colors.black,
+            spaceAfter=4,
+            alignment=TA_CENTER,
+            wordWrap='CJK',
+            leading=14,
+        ),
+        'subtitulo': ParagraphStyle(
+            'CustomSubtitle',
+            parent=_NORMAL,
+            fontSize=7,
+            textColor=colors.black,
+            alignment=TA_CENTER,
+            spaceAfter=3,
+            leading=9,
+        ),
+        'normal': ParagraphStyle(
+            'Normal80mm',
+            parent=_NORMAL,
+            fontSize=7,
+            wordWrap='CJK',
+            leading=9,
+        ),
+        'nota': ParagraphStyle(
+            'Nota',
+            parent=_NORMAL,
+            fontSize=7,
+            textColor=colors.black,
+            alignment=TA_CENTER,
+            borderWidth=1,
+            borderPadding=3,
+            borderColor=colors.black,
+            leading=9,
+        ),
+        'pie': ParagraphStyle(
+            'Pie',
+            parent=_NORMAL,
+            fontSize=6,
+            textColor=colors.black,
+            alignment=TA_CENTER,
+            leading=8,
+        ),
+        'info_table': TableStyle([
+            ('FONT', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONT', (1, 0), (1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 7),
+            ('TEXTCOLOR', (0, 0), (0, -1), colors.black),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+            ('TOPPADDING', (0, 0), (-1, -1), 1),
+        ]),
+        # Estilo simplificado para impresoras térmicas (sin colores de fondo)
+        'prod_table': TableStyle([
+            # Encabezado
+            ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 7),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 2),
+            ('TOPPADDING', (0, 0), (-1, 0), 2),
+            ('LINEBELOW', (0, 0), (-1, 0), 1, colors.black),
+            # Contenido
+            ('FONT', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 7),
+            ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
+            ('ALIGN', (2, 1), (2, -1), 'RIGHT'),
+            ('ALIGN', (0, 1), (0, -1), 'LEFT'),
+            ('BOTTOMPADDING', (0, 1), (-1, -1), 2),
+            ('TOPPADDING', (0, 1), (-1, -1), 2),
+            # Línea simple de separación
+            ('LINEBELOW', (0, 1), (-1, -1), 0.5, colors.black),
+        ]),
+        'totales_table': TableStyle([
+            ('FONT', (1, 0), (1, -1), 'Helvetica-Bold'),
+            ('FONT', (2, 0), (2, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (1, 0), (2, -1), 8),
+            ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
+            ('TEXTCOLOR', (1, 0), (2, -1), colors.black),
+            ('BOTTOMPADDING', (1, 0), (2, -1), 2),
+            ('TOPPADDING', (1, 0), (2, -1), 2),
+            ('LINEABOVE', (1, 0), (2, 0), 1.5, colors.black),
+        ]),
+    }
+    # En 80mm el título de la liquidación es igual al de la venta
+    _STYLES_80MM['titulo_liquidacion'] = _STYLES_80MM['titulo']
+
+    _STYLES_A4 = {
+        'titulo': ParagraphStyle(
+            'CustomTitle',
+            parent=_HEADING1,
+            fontSize=24,
+            textColor=C_GREEN,
+            spaceAfter=30,
+            alignment=TA_CENTER,
+        ),
+        'titulo_liquidacion': ParagraphStyle(
+            'CustomTitle',
+            parent=_HEADING1,
+            fontSize=24,
+            textColor=C_BLUE,
+            spaceAfter=30,
+            alignment=TA_CENTER,
+        ),
+        'subtitulo': ParagraphStyle(
+            'CustomSubtitle',
+            parent=_NORMAL,
+            fontSize=12,
+            textColor=colors.grey,
+            alignment=TA_CENTER,
+            spaceAfter=20,
+        ),
+        'normal': _NORMAL,
+        'nota': ParagraphStyle(
+            'Nota',
+            parent=_NORMAL,
+            fontSize=10,
+            textColor=C_RED,
+            alignment=TA_CENTER,
+            borderColor=C_RED,
+            borderWidth=1,
+            borderPadding=10,
+        ),
+        'pie': ParagraphStyle(
+            'Pie',
+            parent=_NORMAL,
+            fontSize=9,
+            textColor=colors.grey,
+            alignment=TA_CENTER,
+            leading=12,
+        ),
+        'info_table': TableStyle([
+            ('FONT', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONT', (1, 0), (1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 11),
+            ('TEXTCOLOR', (0, 0), (0, -1), colors.black),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+        ]),
+        # Estilo completo para A4
+        'prod_table': TableStyle([
+            # Encabezado
+            ('BACKGROUND', (0, 0), (-1, 0), C_GREEN),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 11),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('TOPPADDING', (0, 0), (-1, 0), 12),
+            # Contenido
+            ('FONT', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 10),
+            ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
+            ('ALIGN', (0, 1), (0, -1), 'LEFT'),
+            ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
+            ('TOPPADDING', (0, 1), (-1, -1), 8),
+            # Bordes
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('BOX', (0, 0), (-1, -1), 2, C_GREEN),
+            # Alternar colores de filas
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, C_BGLIGHT]),
+        ]),
+        'totales_table': TableStyle([
+            ('FONT', (1, 0), (1, -1), 'Helvetica-Bold'),
+            ('FONT', (2, 0), (2, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (1, 0), (2, -1), 12),
+            ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
+            ('TEXTCOLOR', (2, 0), (2, -1), C_GREEN),
+            ('BOTTOMPADDING', (1, 0), (2, -1), 8),
+        ]),
+    }
+
+    # Tablas de la liquidación
+    _STYLES_80MM['liq_info_table'] = TableStyle([
+        ('FONT', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONT', (1, 0), (1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 7),
+        ('TEXTCOLOR', (0, 0), (0, -1), colors.black),
+        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+        ('TOPPADDING', (0, 0), (-1, -1), 1),
+        ('FONT', (0, 5), (1, 5), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 5), (1, 5), 9),
+        ('TEXTCOLOR', (1, 5), (1, 5), colors.black),
+        ('LINEABOVE', (0, 5), (1, 5), 1.5, colors.black),
+    ])
+    _STYLES_80MM['liq_ventas_table'] = TableStyle([
+        ('FONT', (0, 0), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 7),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+    ])
+
+    # En A4 el color del nuevo saldo depende de si quedó deuda: se aplica encima del estilo base
+    _STYLES_A4['liq_info_table'] = TableStyle([
+        ('FONT', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONT', (1, 0), (1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 12),
+        ('TEXTCOLOR', (0, 0), (0, -1), C_GRAY6),
+        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+        ('FONT', (0, 5), (1, 5), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 5), (1, 5), 14),
+        ('BACKGROUND', (0, 5), (1, 5), C_BGLIGHT),
+    ])
+    _STYLES_A4['liq_saldo_liquidado'] = TableStyle([('TEXTCOLOR', (1, 5), (1, 5), C_GREEN)])
+    _STYLES_A4['liq_saldo_pendiente'] = TableStyle([('TEXTCOLOR', (1, 5), (1, 5), C_RED)])
+    # Base de la tabla de ventas abonadas (los comandos por fila se agregan al armarla)
+    _STYLES_A4['liq_ventas_table'] = TableStyle([
+        ('FONT', (0, 0), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+    ])
+
+    # Mensaje final de la liquidación (deuda liquidada / saldo pendiente)
+    _STYLES_80MM['mensaje_liquidada'] = ParagraphStyle(
+        'Mensaje',
+        parent=_NORMAL,
+        fontSize=8,
+        textColor=colors.black,
+        alignment=TA_CENTER,
+        borderColor=colors.black,
+        borderWidth=1,
+        borderPadding=3,
+        leading=10,
+    )
+    _STYLES_80MM['mensaje_pendiente'] = ParagraphStyle(
+        'Mensaje',
+        parent=_NORMAL,
+        fontSize=7,
+        textColor=colors.black,
+        alignment=TA_CENTER,
+        borderColor=colors.black,
+        borderWidth=1,
+        borderPadding=3,
+        leading=9,
+    )
+    _STYLES_A4['mensaje_liquidada'] = ParagraphStyle(
+        'Mensaje',
+        parent=_NORMAL,
+        fontSize=14,
+        textColor=C_GREEN,
+        alignment=TA_CENTER,
+        borderColor=C_GREEN,
+        borderWidth=2,
+        borderPadding=15,
+    )
+    _STYLES_A4['mensaje_pendiente'] = ParagraphStyle(
+        'Mensaje',
+        parent=_NORMAL,
+        fontSize=12,
+        textColor=C_RED,
+        alignment=TA_CENTER,
+        borderColor=C_RED,
+        borderWidth=1,
+        borderPadding=10,
+    )
+
+    # Anchos de columna (fijos por tamaño de papel)
+    _STYLES_80MM.update({
+        'colw_info': (18*mm, 56*mm),
+        'colw_prod': (46*mm, 12*mm, 16*mm),
+        'colw_totales': (46*mm, 12*mm, 16*mm),
+        'colw_liq_info': (22*mm, 52*mm),
+        'colw_liq_ventas': (50*mm, 24*mm),
+    })
+    _STYLES_A4.update({
+        'colw_info': (2*inch, 4*inch),
+        'colw_prod': (3.5*inch, 1.2*inch, 1*inch, 1.3*inch),
+        'colw_totales': (3.5*inch, 1.5*inch, 2*inch),
+        'colw_liq_info': (2.5*inch, 3.5*inch),
+        'colw_liq_ventas': (3*inch, 0.8*inch, 1*inch, 1.2*inch),
+    })
 
 
 class PDFGenerator:
@@ -33,6 +548,7 @@ class PDFGenerator:
         Returns:
             str: Ruta del archivo PDF generado
         """
+        _cargar_reportlab()
 
         # Si no se proporciona ruta, crear archivo temporal
         if not ruta_salida:
@@ -46,338 +562,23 @@ class PDFGenerator:
             ruta_salida = temp_file.name
             temp_file.close()
 
-        # Seleccionar tamaño de papel
-        pagesize = TICKET_80MM if tipo_papel == '80mm' else A4
+        # El ticket 80mm se dibuja directo en canvas (ver _render_ticket_80mm_canvas)
+        if tipo_papel == '80mm':
+            PDFGenerator._render_ticket_80mm_canvas(venta, ruta_salida)
+            return ruta_salida
 
-        # Crear documento PDF
+        # Crear documento PDF (A4)
         doc = SimpleDocTemplate(
             ruta_salida,
-            pagesize=pagesize,
-            leftMargin=3*mm if tipo_papel == '80mm' else 0.75*inch,
-            rightMargin=3*mm if tipo_papel == '80mm' else 0.75*inch,
-            topMargin=3*mm if tipo_papel == '80mm' else 0.75*inch,
-            bottomMargin=3*mm if tipo_papel == '80mm' else 0.75*inch,
+            pagesize=A4,
+            leftMargin=0.75*inch,
+            rightMargin=0.75*inch,
+            topMargin=0.75*inch,
+            bottomMargin=0.75*inch,
         )
-        elementos = []
-        
-        # Estilos adaptados al tamaño de papel
-        estilos = getSampleStyleSheet()
-
-        if tipo_papel == '80mm':
-            # Estilos para ticket 80mm - optimizados para impresora térmica
-            estilo_titulo = ParagraphStyle(
-                'CustomTitle',
-                parent=estilos['Heading1'],
-                fontSize=12,
-                textColor=colors.black,
-                spaceAfter=4,
-                alignment=TA_CENTER,
-                wordWrap='CJK',
-                leading=14,
-            )
-
-            estilo_subtitulo = ParagraphStyle(
-                'CustomSubtitle',
-                parent=estilos['Normal'],
-                fontSize=7,
-                textColor=colors.black,
-                alignment=TA_CENTER,
-                spaceAfter=3,
-                leading=9,
-            )
-
-            estilo_normal = ParagraphStyle(
-                'Normal80mm',
-                parent=estilos['Normal'],
-                fontSize=7,
-                wordWrap='CJK',
-                leading=9,
-            )
-        else:
-            # Estilos para A4
-            estilo_titulo = ParagraphStyle(
-                'CustomTitle',
-                parent=estilos['Heading1'],
-                fontSize=24,
-                textColor=colors.HexColor('#2E7D32'),
-                spaceAfter=30,
-                alignment=TA_CENTER,
-            )
-
-            estilo_subtitulo = ParagraphStyle(
-                'CustomSubtitle',
-                parent=estilos['Normal'],
-                fontSize=12,
-                textColor=colors.grey,
-                alignment=TA_CENTER,
-                spaceAfter=20,
-            )
-
-            estilo_normal = estilos['Normal']
-        
-        # ============================================
-        # ENCABEZADO
-        # ============================================
-        
-        # Logo (opcional - si tienes un logo)
-        # elementos.append(Image("logo.png", width=2*inch, height=1*inch))
-        # elementos.append(Spacer(1, 0.2*inch))
-        
-        # Título
-        elementos.append(Paragraph("LA MILAGROSA", estilo_titulo))
-        if tipo_papel != '80mm':
-            elementos.append(Paragraph("Sistema de Gestión de Ventas", estilo_subtitulo))
-
-        # Tipo de comprobante
-        tipo_comprobante = "VENTA FIADA" if venta.es_fiado else "VENTA"
-        elementos.append(Paragraph(
-            f"<b>{tipo_comprobante}</b>",
-            estilo_subtitulo
-        ))
-        elementos.append(Spacer(1, 2*mm if tipo_papel == '80mm' else 0.3*inch))
-        
-        # ============================================
-        # INFORMACIÓN DE LA VENTA
-        # ============================================
-        
-        info_data = [
-            ["Nº Venta:", f"#{venta.id}"],
-            ["Fecha:", venta.fecha.strftime("%d/%m/%Y %H:%M")],
-        ]
-
-        if venta.cliente_nombre:
-            info_data.append(["Cliente:", venta.cliente_nombre])
-
-        if venta.usuario_nombre:
-            info_data.append(["Vendedor:", venta.usuario_nombre])
-
-        if tipo_papel == '80mm':
-            col_widths = [18*mm, 56*mm]
-            font_size = 7
-            padding = 2
-        else:
-            col_widths = [2*inch, 4*inch]
-            font_size = 11
-            padding = 8
-
-        info_table = Table(info_data, colWidths=col_widths)
-        info_table.setStyle(TableStyle([
-            ('FONT', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONT', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), font_size),
-            ('TEXTCOLOR', (0, 0), (0, -1), colors.black),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), padding),
-            ('TOPPADDING', (0, 0), (-1, -1), 1 if tipo_papel == '80mm' else padding),
-        ]))
-
-        elementos.append(info_table)
-        elementos.append(Spacer(1, 2*mm if tipo_papel == '80mm' else 0.4*inch))
-        
-        # ============================================
-        # DETALLE DE PRODUCTOS
-        # ============================================
-        
-        elementos.append(Paragraph("<b>DETALLE DE PRODUCTOS</b>", estilo_normal))
-        elementos.append(Spacer(1, 2*mm if tipo_papel == '80mm' else 0.2*inch))
-
-        # Encabezados de tabla
-        if tipo_papel == '80mm':
-            # Para ticket 80mm: formato compacto para térmica
-            productos_data = [['Producto', 'Cant', 'Total']]
-            for item in venta.productos:
-                productos_data.append([
-                    item['nombre'],
-                    str(item['cantidad']),
-                    f"${item['subtotal']:.2f}"
-                ])
-            prod_col_widths = [46*mm, 12*mm, 16*mm]
-            header_font = 7
-            content_font = 7
-            header_pad = 2
-            content_pad = 2
-        else:
-            # Para A4: formato completo
-            productos_data = [['Producto', 'Precio Unit.', 'Cantidad', 'Subtotal']]
-            for item in venta.productos:
-                productos_data.append([
-                    item['nombre'],
-                    f"${item['precio_unitario']:.2f}",
-                    str(item['cantidad']),
-                    f"${item['subtotal']:.2f}"
-                ])
-            prod_col_widths = [3.5*inch, 1.2*inch, 1*inch, 1.3*inch]
-            header_font = 11
-            content_font = 10
-            header_pad = 12
-            content_pad = 8
-
-        productos_table = Table(productos_data, colWidths=prod_col_widths)
-
-        if tipo_papel == '80mm':
-            # Estilo simplificado para impresoras térmicas (sin colores de fondo)
-            productos_table.setStyle(TableStyle([
-                # Encabezado
-                ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), header_font),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), header_pad),
-                ('TOPPADDING', (0, 0), (-1, 0), header_pad),
-                ('LINEBELOW', (0, 0), (-1, 0), 1, colors.black),
-
-                # Contenido
-                ('FONT', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), content_font),
-                ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
-                ('ALIGN', (2, 1), (2, -1), 'RIGHT'),
-                ('ALIGN', (0, 1), (0, -1), 'LEFT'),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), content_pad),
-                ('TOPPADDING', (0, 1), (-1, -1), content_pad),
-
-                # Línea simple de separación
-                ('LINEBELOW', (0, 1), (-1, -1), 0.5, colors.black),
-            ]))
-        else:
-            # Estilo completo para A4
-            productos_table.setStyle(TableStyle([
-                # Encabezado
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E7D32')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), header_font),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), header_pad),
-                ('TOPPADDING', (0, 0), (-1, 0), header_pad),
-
-                # Contenido
-                ('FONT', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), content_font),
-                ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
-                ('ALIGN', (0, 1), (0, -1), 'LEFT'),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), content_pad),
-                ('TOPPADDING', (0, 1), (-1, -1), content_pad),
-
-                # Bordes
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('BOX', (0, 0), (-1, -1), 2, colors.HexColor('#2E7D32')),
-
-                # Alternar colores de filas
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F5F5F5')]),
-            ]))
-
-        elementos.append(productos_table)
-        elementos.append(Spacer(1, 2*mm if tipo_papel == '80mm' else 0.3*inch))
-
-        # ============================================
-        # TOTALES
-        # ============================================
-
-        totales_data = [
-            ['', 'TOTAL:', f"${venta.total:.2f}"],
-        ]
-
-        if venta.es_fiado:
-            totales_data.extend([
-                ['', 'Abonado:', f"${venta.abonado:.2f}"],
-                ['', 'RESTA:', f"${venta.resto:.2f}"],
-            ])
-
-        if tipo_papel == '80mm':
-            total_col_widths = [46*mm, 12*mm, 16*mm]
-            total_font = 8
-            total_pad = 2
-        else:
-            total_col_widths = [3.5*inch, 1.5*inch, 2*inch]
-            total_font = 12
-            total_pad = 8
-
-        totales_table = Table(totales_data, colWidths=total_col_widths)
-
-        if tipo_papel == '80mm':
-            # Estilo simplificado para térmica
-            totales_table.setStyle(TableStyle([
-                ('FONT', (1, 0), (1, -1), 'Helvetica-Bold'),
-                ('FONT', (2, 0), (2, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (1, 0), (2, -1), total_font),
-                ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
-                ('TEXTCOLOR', (1, 0), (2, -1), colors.black),
-                ('BOTTOMPADDING', (1, 0), (2, -1), total_pad),
-                ('TOPPADDING', (1, 0), (2, -1), total_pad),
-                ('LINEABOVE', (1, 0), (2, 0), 1.5, colors.black),
-            ]))
-        else:
-            totales_table.setStyle(TableStyle([
-                ('FONT', (1, 0), (1, -1), 'Helvetica-Bold'),
-                ('FONT', (2, 0), (2, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (1, 0), (2, -1), total_font),
-                ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
-                ('TEXTCOLOR', (2, 0), (2, -1), colors.HexColor('#2E7D32')),
-                ('BOTTOMPADDING', (1, 0), (2, -1), total_pad),
-            ]))
-
-        elementos.append(totales_table)
-        
-        # Si es fiado, agregar nota
-        if venta.es_fiado:
-            elementos.append(Spacer(1, 2*mm if tipo_papel == '80mm' else 0.4*inch))
-            if tipo_papel == '80mm':
-                # Nota simplificada para térmica
-                nota_estilo = ParagraphStyle(
-                    'Nota',
-                    parent=estilos['Normal'],
-                    fontSize=7,
-                    textColor=colors.black,
-                    alignment=TA_CENTER,
-                    borderWidth=1,
-                    borderPadding=3,
-                    borderColor=colors.black,
-                    leading=9,
-                )
-                elementos.append(Paragraph(
-                    f"<b>FIADO - RESTA: ${venta.resto:.2f}</b>",
-                    nota_estilo
-                ))
-            else:
-                nota_estilo = ParagraphStyle(
-                    'Nota',
-                    parent=estilos['Normal'],
-                    fontSize=10,
-                    textColor=colors.HexColor('#D32F2F'),
-                    alignment=TA_CENTER,
-                    borderColor=colors.HexColor('#D32F2F'),
-                    borderWidth=1,
-                    borderPadding=10,
-                )
-                elementos.append(Paragraph(
-                    "<b>IMPORTANTE:</b> Esta es una venta fiada. "
-                    f"El saldo pendiente de ${venta.resto:.2f} debe ser abonado.",
-                    nota_estilo
-                ))
-
-        # ============================================
-        # PIE DE PÁGINA
-        # ============================================
-        elementos.append(Spacer(1, 2*mm if tipo_papel == '80mm' else 0.5*inch))
-        pie_estilo = ParagraphStyle(
-            'Pie',
-            parent=estilos['Normal'],
-            fontSize=6 if tipo_papel == '80mm' else 9,
-            textColor=colors.black if tipo_papel == '80mm' else colors.grey,
-            alignment=TA_CENTER,
-            leading=8 if tipo_papel == '80mm' else 12,
-        )
-        elementos.append(Paragraph(
-            "Gracias por su compra",
-            pie_estilo
-        ))
-        if tipo_papel != '80mm':
-            elementos.append(Paragraph(
-                f"Comprobante generado el {datetime.now().strftime('%d/%m/%Y a las %H:%M')}",
-                pie_estilo
-            ))
-        
-        # Construir PDF
+        elementos = PDFGenerator._crear_elementos_venta(venta, tipo_papel)
         doc.build(elementos)
-        
+
         return ruta_salida
     
     @staticmethod
@@ -396,6 +597,7 @@ class PDFGenerator:
         Returns:
             str: Ruta del archivo PDF generado
         """
+        _cargar_reportlab()
 
         if not ruta_salida:
             # Crear archivo temporal
@@ -419,279 +621,9 @@ class PDFGenerator:
             topMargin=3*mm if tipo_papel == '80mm' else 0.75*inch,
             bottomMargin=3*mm if tipo_papel == '80mm' else 0.75*inch,
         )
-        elementos = []
-        
-        estilos = getSampleStyleSheet()
-
-        if tipo_papel == '80mm':
-            # Estilos optimizados para impresora térmica
-            estilo_titulo = ParagraphStyle(
-                'CustomTitle',
-                parent=estilos['Heading1'],
-                fontSize=12,
-                textColor=colors.black,
-                spaceAfter=4,
-                alignment=TA_CENTER,
-                wordWrap='CJK',
-                leading=14,
-            )
-
-            estilo_subtitulo = ParagraphStyle(
-                'CustomSubtitle',
-                parent=estilos['Normal'],
-                fontSize=7,
-                textColor=colors.black,
-                alignment=TA_CENTER,
-                spaceAfter=3,
-                leading=9,
-            )
-
-            estilo_normal = ParagraphStyle(
-                'Normal80mm',
-                parent=estilos['Normal'],
-                fontSize=7,
-                wordWrap='CJK',
-                leading=9,
-            )
-        else:
-            estilo_titulo = ParagraphStyle(
-                'CustomTitle',
-                parent=estilos['Heading1'],
-                fontSize=24,
-                textColor=colors.HexColor('#1976D2'),
-                spaceAfter=30,
-                alignment=TA_CENTER,
-            )
-
-            estilo_subtitulo = ParagraphStyle(
-                'CustomSubtitle',
-                parent=estilos['Normal'],
-                fontSize=12,
-                textColor=colors.grey,
-                alignment=TA_CENTER,
-                spaceAfter=20,
-            )
-
-            estilo_normal = estilos['Normal']
-        
-        # Encabezado
-        elementos.append(Paragraph("LA MILAGROSA", estilo_titulo))
-        if tipo_papel != '80mm':
-            elementos.append(Paragraph("Sistema de Gestión de Ventas", estilo_subtitulo))
-        elementos.append(Paragraph("<b>COMPROBANTE DE PAGO</b>", estilo_subtitulo))
-        elementos.append(Spacer(1, 2*mm if tipo_papel == '80mm' else 0.5*inch))
-
-        # Información del pago
-        info_data = [
-            ["Fecha:", datetime.now().strftime("%d/%m/%Y %H:%M")],
-            ["Cliente:", cliente.nombre],
-            ["", ""],
-            ["Saldo Anterior:", f"${cliente.deuda_total:.2f}"],
-            ["Abono:", f"${abono:.2f}"],
-            ["Nuevo Saldo:", f"${nuevo_saldo:.2f}"],
-        ]
-
-        if tipo_papel == '80mm':
-            info_col_widths = [22*mm, 52*mm]
-            info_font = 7
-            info_pad = 2
-            nuevo_saldo_font = 9
-        else:
-            info_col_widths = [2.5*inch, 3.5*inch]
-            info_font = 12
-            info_pad = 10
-            nuevo_saldo_font = 14
-
-        info_table = Table(info_data, colWidths=info_col_widths)
-
-        if tipo_papel == '80mm':
-            # Estilo simplificado para térmica
-            info_table.setStyle(TableStyle([
-                ('FONT', (0, 0), (0, -1), 'Helvetica-Bold'),
-                ('FONT', (1, 0), (1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), info_font),
-                ('TEXTCOLOR', (0, 0), (0, -1), colors.black),
-                ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-                ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), info_pad),
-                ('TOPPADDING', (0, 0), (-1, -1), 1),
-
-                # Resaltar nuevo saldo
-                ('FONT', (0, 5), (1, 5), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 5), (1, 5), nuevo_saldo_font),
-                ('TEXTCOLOR', (1, 5), (1, 5), colors.black),
-                ('LINEABOVE', (0, 5), (1, 5), 1.5, colors.black),
-            ]))
-        else:
-            info_table.setStyle(TableStyle([
-                ('FONT', (0, 0), (0, -1), 'Helvetica-Bold'),
-                ('FONT', (1, 0), (1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), info_font),
-                ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#424242')),
-                ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-                ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), info_pad),
-
-                # Resaltar nuevo saldo
-                ('FONT', (0, 5), (1, 5), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 5), (1, 5), nuevo_saldo_font),
-                ('TEXTCOLOR', (1, 5), (1, 5), colors.HexColor('#2E7D32') if nuevo_saldo == 0 else colors.HexColor('#D32F2F')),
-                ('BACKGROUND', (0, 5), (1, 5), colors.HexColor('#F5F5F5')),
-            ]))
-
-        elementos.append(info_table)
-        elementos.append(Spacer(1, 2*mm if tipo_papel == '80mm' else 0.5*inch))
-
-        # ============================================
-        # DETALLE DE VENTAS PAGADAS (NUEVO)
-        # ============================================
-        if ventas_pagadas and len(ventas_pagadas) > 0:
-            elementos.append(Paragraph("<b>DETALLE DE VENTAS ABONADAS</b>", estilo_normal))
-            elementos.append(Spacer(1, 2*mm if tipo_papel == '80mm' else 0.2*inch))
-
-            for venta_info in ventas_pagadas:
-                venta = venta_info['venta']
-                monto_abonado = venta_info['monto']
-
-                # Información de la venta
-                venta_data = [
-                    [f"Venta #{venta.id}", f"${monto_abonado:.2f}"],
-                    [f"Fecha: {venta.fecha.strftime('%d/%m/%Y')}", ""],
-                ]
-
-                if tipo_papel == '80mm':
-                    venta_col_widths = [50*mm, 24*mm]
-                    venta_font = 7
-                else:
-                    venta_col_widths = [4*inch, 2*inch]
-                    venta_font = 9
-
-                venta_table = Table(venta_data, colWidths=venta_col_widths)
-                venta_table.setStyle(TableStyle([
-                    ('FONT', (0, 0), (-1, -1), 'Helvetica'),
-                    ('FONTSIZE', (0, 0), (-1, -1), venta_font),
-                    ('ALIGN', (1, 0), (1, 0), 'RIGHT'),
-                    ('TEXTCOLOR', (0, 0), (0, 0), colors.HexColor('#1976D2')),
-                    ('FONT', (0, 0), (0, 0), 'Helvetica-Bold'),
-                    ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
-                ]))
-
-                elementos.append(venta_table)
-
-                # Productos de esta venta
-                if tipo_papel == '80mm':
-                    # Formato compacto para 80mm
-                    for item in venta.productos:
-                        prod_text = f"  • {item['nombre']} x{item['cantidad']}"
-                        elementos.append(Paragraph(prod_text, estilo_normal))
-                else:
-                    # Formato tabla para A4
-                    productos_data = [["Producto", "Cant", "Precio"]]
-                    for item in venta.productos:
-                        productos_data.append([
-                            item['nombre'],
-                            str(item['cantidad']),
-                            f"${item['subtotal']:.2f}"
-                        ])
-
-                    prod_table = Table(productos_data, colWidths=[3*inch, 0.8*inch, 1*inch])
-                    prod_table.setStyle(TableStyle([
-                        ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                        ('FONTSIZE', (0, 0), (-1, -1), 8),
-                        ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
-                        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-                        ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
-                        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                    ]))
-                    elementos.append(prod_table)
-
-                elementos.append(Spacer(1, 2*mm if tipo_papel == '80mm' else 0.15*inch))
-
-            elementos.append(Spacer(1, 2*mm if tipo_papel == '80mm' else 0.3*inch))
-        
-        # Mensaje según si quedó saldo
-        if nuevo_saldo == 0:
-            if tipo_papel == '80mm':
-                mensaje_estilo = ParagraphStyle(
-                    'Mensaje',
-                    parent=estilos['Normal'],
-                    fontSize=8,
-                    textColor=colors.black,
-                    alignment=TA_CENTER,
-                    borderColor=colors.black,
-                    borderWidth=1,
-                    borderPadding=3,
-                    leading=10,
-                )
-                elementos.append(Paragraph(
-                    "<b>DEUDA LIQUIDADA</b>",
-                    mensaje_estilo
-                ))
-            else:
-                mensaje_estilo = ParagraphStyle(
-                    'Mensaje',
-                    parent=estilos['Normal'],
-                    fontSize=14,
-                    textColor=colors.HexColor('#2E7D32'),
-                    alignment=TA_CENTER,
-                    borderColor=colors.HexColor('#2E7D32'),
-                    borderWidth=2,
-                    borderPadding=15,
-                )
-                elementos.append(Paragraph(
-                    "<b>✓ DEUDA LIQUIDADA COMPLETAMENTE</b>",
-                    mensaje_estilo
-                ))
-        else:
-            if tipo_papel == '80mm':
-                mensaje_estilo = ParagraphStyle(
-                    'Mensaje',
-                    parent=estilos['Normal'],
-                    fontSize=7,
-                    textColor=colors.black,
-                    alignment=TA_CENTER,
-                    borderColor=colors.black,
-                    borderWidth=1,
-                    borderPadding=3,
-                    leading=9,
-                )
-                elementos.append(Paragraph(
-                    f"<b>Saldo: ${nuevo_saldo:.2f}</b>",
-                    mensaje_estilo
-                ))
-            else:
-                mensaje_estilo = ParagraphStyle(
-                    'Mensaje',
-                    parent=estilos['Normal'],
-                    fontSize=12,
-                    textColor=colors.HexColor('#D32F2F'),
-                    alignment=TA_CENTER,
-                    borderColor=colors.HexColor('#D32F2F'),
-                    borderWidth=1,
-                    borderPadding=10,
-                )
-                elementos.append(Paragraph(
-                    f"<b>Saldo pendiente: ${nuevo_saldo:.2f}</b>",
-                    mensaje_estilo
-                ))
-
-        # Pie de página
-        elementos.append(Spacer(1, 2*mm if tipo_papel == '80mm' else 1*inch))
-        pie_estilo = ParagraphStyle(
-            'Pie',
-            parent=estilos['Normal'],
-            fontSize=6 if tipo_papel == '80mm' else 9,
-            textColor=colors.black if tipo_papel == '80mm' else colors.grey,
-            alignment=TA_CENTER,
-            leading=8 if tipo_papel == '80mm' else 12,
-        )
-        elementos.append(Paragraph(
-            "Gracias por su pago",
-            pie_estilo
-        ))
-        
+        elementos = PDFGenerator._crear_elementos_liquidacion(cliente, abono, nuevo_saldo, ventas_pagadas, tipo_papel)
         doc.build(elementos)
-        
+
         return ruta_salida
     
     @staticmethod
@@ -702,8 +634,6 @@ class PDFGenerator:
         Args:
             ruta_pdf: Ruta del archivo PDF
         """
-        import subprocess
-        import platform
         
         sistema = platform.system()
         
@@ -730,223 +660,210 @@ class PDFGenerator:
         Returns:
             bool: True si se envió correctamente
         """
-        import platform
-        import subprocess
-        import time
 
         sistema = platform.system()
 
         try:
             if sistema == 'Windows':
-                # Método 1: Intentar con SumatraPDF (más confiable y silencioso)
-                # Obtener ruta relativa al proyecto (funciona tanto en dev como empaquetado)
-                import sys
+                # Impresora predeterminada (memorizada); None si no hay win32print o
+                # no se pudo consultar, en ese caso cada método usa su propia opción
+                # "predeterminada"
+                if not nombre_impresora:
+                    nombre_impresora = PDFGenerator._obtener_impresora_predeterminada()
+
+                # Probar los métodos en orden (SumatraPDF -> GhostScript -> visor del sistema)
+                # y quedarse con el primero que funcione
+                for backend in _WIN_BACKENDS:
+                    ejecutable = backend.buscar()
+                    if not ejecutable:
+                        continue
+                    try:
+                        backend.imprimir(ejecutable, ruta_pdf, nombre_impresora)
+                        print(f"PDF enviado a impresora usando {backend.nombre}")
+                        break
+                    except subprocess.TimeoutExpired:
+                        print(f"{backend.nombre} no respondió a tiempo")
+                    except Exception as e_backend:
+                        print(f"{backend.nombre} falló: {e_backend}")
+                else:
+                    raise RuntimeError("Ningún método de impresión funcionó")
 
-                if getattr(sys, 'frozen', False):
-                    # Si está empaquetado con flet pack/PyInstaller
-                    script_dir = os.path.dirname(sys.executable)
+            elif sistema == 'Darwin':  # macOS
+                if nombre_impresora:
+                    subprocess.run(['lpr', '-P', nombre_impresora, ruta_pdf], stdin=subprocess.DEVNULL, check=True)
                 else:
-                    # Si está en modo desarrollo
-                    script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+                    subprocess.run(['lpr', ruta_pdf], stdin=subprocess.DEVNULL, check=True)
 
-                sumatra_local = os.path.join(script_dir, "Sumatra", "SumatraPDF-3.5.2-64.exe")
+            else:  # Linux
+                if nombre_impresora:
+                    subprocess.run(['lp', '-d', nombre_impresora, ruta_pdf], stdin=subprocess.DEVNULL, check=True)
+                else:
+                    subprocess.run(['lp', ruta_pdf], stdin=subprocess.DEVNULL, check=True)
 
-                sumatra_paths = [
-                    sumatra_local,  # Buscar primero en la carpeta del proyecto
-                    r"C:\Program Files\SumatraPDF\SumatraPDF.exe",
-                    r"C:\Program Files (x86)\SumatraPDF\SumatraPDF.exe",
-                ]
+            # Eliminar archivo temporal si se solicita
+            if eliminar_despues:
+                # Esperar un momento para que termine de enviar a la cola de impresión,
+                # pero en segundo plano para no bloquear a quien llamó (normalmente la UI)
+                threading.Timer(3.0, PDFGenerator._eliminar_seguro, args=(ruta_pdf,)).start()
 
-                sumatra_found = False
-                for sumatra_path in sumatra_paths:
-                    if os.path.exists(sumatra_path):
-                        try:
-                            if not nombre_impresora:
-                                # Obtener impresora predeterminada
-                                try:
-                                    import win32print
-                                    nombre_impresora = win32print.GetDefaultPrinter()
-                                except ImportError:
-                                    # Si no hay win32print, SumatraPDF usará la predeterminada
-                                    nombre_impresora = None
-
-                            if nombre_impresora:
-                                cmd = [sumatra_path, "-print-to", nombre_impresora, ruta_pdf]
-                            else:
-                                cmd = [sumatra_path, "-print-to-default", ruta_pdf]
-
-                            # Ejecutar SumatraPDF en modo silencioso
-                            subprocess.run(
-                                cmd,
-                                creationflags=subprocess.CREATE_NO_WINDOW,
-                                stdout=subprocess.DEVNULL,
-                                stderr=subprocess.DEVNULL,
-                                check=True
-                            )
-                            sumatra_found = True
-                            print("PDF enviado a impresora usando SumatraPDF")
-                            break
-                        except Exception as e_sumatra:
-                            print(f"SumatraPDF falló: {e_sumatra}")
-                            continue
-
-                # Si no encontró SumatraPDF, usar método alternativo con GhostScript o PowerShell
-                if not sumatra_found:
-                    # Método 2: Intentar con GhostScript (gs)
-                    gs_paths = [
-                        r"C:\Program Files\gs\gs10.03.1\bin\gswin64c.exe",
-                        r"C:\Program Files\gs\gs10.03.0\bin\gswin64c.exe",
-                        r"C:\Program Files (x86)\gs\gs10.03.1\bin\gswin32c.exe",
-                        r"C:\Program Files (x86)\gs\gs10.03.0\bin\gswin32c.exe",
-                    ]
+            return True
 
-                    gs_found = False
-                    for gs_path in gs_paths:
-                        if os.path.exists(gs_path):
-                            try:
-                                # Obtener nombre de impresora
-                                if not nombre_impresora:
-                                    try:
-                                        import win32print
-                                        nombre_impresora = win32print.GetDefaultPrinter()
-                                    except ImportError:
-                                        nombre_impresora = "default"
-
-                                # Comando GhostScript para imprimir directamente
-                                cmd = [
-                                    gs_path,
-                                    "-dPrinted",
-                                    "-dBATCH",
-                                    "-dNOPAUSE",
-                                    "-dNOSAFER",
-                                    "-dNumCopies=1",
-                                    "-sDEVICE=mswinpr2",
-                                    f"-sOutputFile=%printer%{nombre_impresora}",
-                                    ruta_pdf
-                                ]
-
-                                subprocess.run(
-                                    cmd,
-                                    creationflags=subprocess.CREATE_NO_WINDOW,
-                                    stdout=subprocess.DEVNULL,
-                                    stderr=subprocess.DEVNULL,
-                                    check=True
-                                )
-                                gs_found = True
-                                print("PDF enviado a impresora usando GhostScript")
-                                break
-                            except Exception as e_gs:
-                                print(f"GhostScript falló: {e_gs}")
-                                continue
-
-                    if not gs_found:
-                        # Método 3: Usar PowerShell con Adobe Reader parameters
-                        print("Usando PowerShell para imprimir (puede abrir ventana brevemente)...")
-
-                        # Obtener impresora predeterminada
-                        if not nombre_impresora:
-                            try:
-                                import win32print
-                                nombre_impresora = win32print.GetDefaultPrinter()
-                            except ImportError:
-                                nombre_impresora = None
-
-                        # Usar el verbo "print" que debería funcionar con cualquier visor PDF
-                        if nombre_impresora:
-                            # Intentar con parámetro /t de Adobe Reader
-                            cmd = [
-                                'cmd', '/c', 'start', '/min', '',
-                                ruta_pdf,
-                                '/t', nombre_impresora
-                            ]
-                        else:
-                            # Imprimir a predeterminada
-                            cmd = ['cmd', '/c', 'start', '/min', '', ruta_pdf, '/p']
-
-                        subprocess.run(
-                            cmd,
-                            creationflags=subprocess.CREATE_NO_WINDOW,
-                            stdout=subprocess.DEVNULL,
-                            stderr=subprocess.DEVNULL,
-                        )
-                        print("PDF enviado usando comando del sistema")
+        except Exception as e:
+            print(f"Error al imprimir PDF: {e}")
+            traceback.print_exc()
+            return False
+    
+    @staticmethod
+    def _eliminar_seguro(ruta):
+        """Elimina un archivo temporal ignorando errores (ej: todavía en uso por el spooler)"""
+        try:
+            os.remove(ruta)
+        except OSError as e_del:
+            print(f"No se pudo eliminar archivo temporal: {e_del}")
 
-            elif sistema == 'Darwin':  # macOS
-                if nombre_impresora:
-                    subprocess.run(['lpr', '-P', nombre_impresora, ruta_pdf], check=True)
-                else:
-                    subprocess.run(['lpr', ruta_pdf], check=True)
+    # Rutas de SumatraPDF/GhostScript (se descubren en la primera impresión)
+    _sumatra_path = _SENTINEL
+    _gs_path = _SENTINEL
+
+    @staticmethod
+    def _obtener_ejecutables_impresion(refrescar=False):
+        """
+        Devuelve (ruta_sumatra, ruta_gs) buscándolas solo la primera vez
+
+        Args:
+            refrescar: Si True, vuelve a buscar los ejecutables en disco
+
+        Returns:
+            tuple: Rutas encontradas (None si no está instalado)
+        """
+
+        if refrescar:
+            PDFGenerator._sumatra_path = _SENTINEL
+            PDFGenerator._gs_path = _SENTINEL
+
+        if PDFGenerator._sumatra_path is _SENTINEL:
+            # Obtener ruta relativa al proyecto (funciona tanto en dev como empaquetado)
+            if getattr(sys, 'frozen', False):
+                # Si está empaquetado con flet pack/PyInstaller
+                script_dir = os.path.dirname(sys.executable)
+            else:
+                # Si está en modo desarrollo
+                script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+            sumatra_paths = (
+                os.path.join(script_dir, "Sumatra", "SumatraPDF-3.5.2-64.exe"),  # Buscar primero en la carpeta del proyecto
+                *_SUMATRA_RUTAS_SISTEMA,
+            )
+            PDFGenerator._sumatra_path = next(
+                (ruta for ruta in sumatra_paths if os.path.exists(ruta)),
+                shutil.which('SumatraPDF')
+            )
+
+        if PDFGenerator._gs_path is _SENTINEL:
+            PDFGenerator._gs_path = next(
+                (ruta for ruta in _GS_RUTAS if os.path.exists(ruta)),
+                shutil.which('gswin64c') or shutil.which('gswin32c')
+            )
+
+        return PDFGenerator._sumatra_path, PDFGenerator._gs_path
+
+    # Cache de impresoras (enumerarlas es lento cuando hay muchas instaladas)
+    _IMPRESORAS_TTL = 30  # segundos
+    _impresoras_cache = None
+    _impresoras_cache_ts = 0.0
+    _impresora_predeterminada_cache = None
+    _impresora_predeterminada_ts = 0.0
 
-            else:  # Linux
-                if nombre_impresora:
-                    subprocess.run(['lp', '-d', nombre_impresora, ruta_pdf], check=True)
-                else:
-                    subprocess.run(['lp', ruta_pdf], check=True)
+    @staticmethod
+    def _obtener_impresora_predeterminada():
+        """
+        Obtiene el nombre de la impresora predeterminada, memorizado por el mismo
+        tiempo que la lista de impresoras (el usuario puede cambiarla en Windows)
 
-            # Eliminar archivo temporal si se solicita
-            if eliminar_despues:
-                try:
-                    # Esperar un momento para que termine de enviar a la cola de impresión
-                    time.sleep(3)
-                    os.remove(ruta_pdf)
-                except Exception as e_del:
-                    print(f"No se pudo eliminar archivo temporal: {e_del}")
+        Returns:
+            str: Nombre de la impresora, o None si no hay win32print o no se pudo
+            consultar (cada método de impresión usa entonces su "predeterminada")
+        """
+        if win32print is None:
+            return None
 
-            return True
+        ahora = time.monotonic()
+        if (PDFGenerator._impresora_predeterminada_cache is not None
+                and ahora - PDFGenerator._impresora_predeterminada_ts < PDFGenerator._IMPRESORAS_TTL):
+            return PDFGenerator._impresora_predeterminada_cache
 
+        try:
+            nombre = win32print.GetDefaultPrinter()
         except Exception as e:
-            print(f"Error al imprimir PDF: {e}")
-            import traceback
-            traceback.print_exc()
-            return False
-    
+            # Ej: no hay ninguna impresora predeterminada configurada
+            print(f"No se pudo obtener la impresora predeterminada: {e}")
+            return None
+
+        PDFGenerator._impresora_predeterminada_cache = nombre
+        PDFGenerator._impresora_predeterminada_ts = ahora
+        return nombre
+
     @staticmethod
-    def obtener_impresoras():
+    def obtener_impresoras(refrescar=False):
         """
         Obtiene la lista de impresoras disponibles en el sistema
 
+        Args:
+            refrescar: Si True, ignora la cache y vuelve a consultar al sistema
+
         Returns:
             list: Lista de nombres de impresoras
         """
-        import platform
+
+        ahora = time.monotonic()
+        if refrescar:
+            PDFGenerator._impresora_predeterminada_cache = None
+            PDFGenerator._obtener_ejecutables_impresion(refrescar=True)
+        elif (PDFGenerator._impresoras_cache is not None
+                and ahora - PDFGenerator._impresoras_cache_ts < PDFGenerator._IMPRESORAS_TTL):
+            return list(PDFGenerator._impresoras_cache)
 
         sistema = platform.system()
         impresoras = []
 
         try:
             if sistema == 'Windows':
-                try:
+                if win32print is not None:
                     # Usar win32print para obtener impresoras
-                    import win32print
-                    # Enumerar todas las impresoras
-                    impresoras = [printer[2] for printer in win32print.EnumPrinters(2)]
-                except ImportError:
+                    # Nivel 4 evita abrir cada impresora (el nivel 2 hace un OpenPrinter por impresora)
+                    impresoras = [
+                        printer['pPrinterName']
+                        for printer in win32print.EnumPrinters(
+                            win32print.PRINTER_ENUM_LOCAL | win32print.PRINTER_ENUM_CONNECTIONS, None, 4
+                        )
+                    ]
+                else:
                     # Fallback a PowerShell si no está win32print
-                    import subprocess
                     resultado = subprocess.run([
                         'powershell', '-Command',
                         'Get-Printer | Select-Object -ExpandProperty Name'
-                    ], capture_output=True, text=True, check=True)
+                    ], stdin=subprocess.DEVNULL, capture_output=True, text=True, check=True)
                     impresoras = [imp.strip() for imp in resultado.stdout.split('\n') if imp.strip()]
 
             elif sistema == 'Darwin':  # macOS
-                import subprocess
-                resultado = subprocess.run(['lpstat', '-p'], capture_output=True, text=True)
+                resultado = subprocess.run(['lpstat', '-p'], stdin=subprocess.DEVNULL, capture_output=True, text=True)
                 for linea in resultado.stdout.split('\n'):
                     if linea.startswith('printer'):
                         impresoras.append(linea.split()[1])
 
             else:  # Linux
-                import subprocess
-                resultado = subprocess.run(['lpstat', '-p'], capture_output=True, text=True)
+                resultado = subprocess.run(['lpstat', '-p'], stdin=subprocess.DEVNULL, capture_output=True, text=True)
                 for linea in resultado.stdout.split('\n'):
                     if linea.startswith('printer'):
                         impresoras.append(linea.split()[1])
 
         except Exception as e:
             print(f"Error al obtener impresoras: {e}")
+            return impresoras
 
-        return impresoras
+        PDFGenerator._impresoras_cache = impresoras
+        PDFGenerator._impresoras_cache_ts = ahora
+        return list(impresoras)
 
     # ============================================
     # FUNCIONES PARA WEB
@@ -964,26 +881,30 @@ class PDFGenerator:
         Returns:
             bytes: Contenido del PDF en bytes
         """
-        buffer = io.BytesIO()
-
-        # Seleccionar tamaño de papel
-        pagesize = TICKET_80MM if tipo_papel == '80mm' else A4
-
-        # Crear documento PDF en memoria
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=pagesize,
-            leftMargin=3*mm if tipo_papel == '80mm' else 0.75*inch,
-            rightMargin=3*mm if tipo_papel == '80mm' else 0.75*inch,
-            topMargin=3*mm if tipo_papel == '80mm' else 0.75*inch,
-            bottomMargin=3*mm if tipo_papel == '80mm' else 0.75*inch,
-        )
+        _cargar_reportlab()
+        buffer = _acquire_buf()
+        try:
+            # El ticket 80mm se dibuja directo en canvas (ver _render_ticket_80mm_canvas)
+            if tipo_papel == '80mm':
+                PDFGenerator._render_ticket_80mm_canvas(venta, buffer)
+                return _leer_buf(buffer)
+
+            # Crear documento PDF en memoria
+            doc = SimpleDocTemplate(
+                buffer,
+                pagesize=A4,
+                leftMargin=0.75*inch,
+                rightMargin=0.75*inch,
+                topMargin=0.75*inch,
+                bottomMargin=0.75*inch,
+            )
 
-        elementos = PDFGenerator._crear_elementos_venta(venta, tipo_papel)
-        doc.build(elementos)
+            elementos = PDFGenerator._crear_elementos_venta(venta, tipo_papel)
+            doc.build(elementos)
 
-        buffer.seek(0)
-        return buffer.getvalue()
+            return _leer_buf(buffer)
+        finally:
+            _release_buf(buffer)
 
     @staticmethod
     def generar_comprobante_liquidacion_bytes(cliente, abono, nuevo_saldo, ventas_pagadas=None, tipo_papel='A4'):
@@ -1000,25 +921,111 @@ class PDFGenerator:
         Returns:
             bytes: Contenido del PDF en bytes
         """
-        buffer = io.BytesIO()
+        _cargar_reportlab()
+        buffer = _acquire_buf()
+        try:
+            # Seleccionar tamaño de papel
+            pagesize = TICKET_80MM if tipo_papel == '80mm' else A4
+
+            doc = SimpleDocTemplate(
+                buffer,
+                pagesize=pagesize,
+                leftMargin=3*mm if tipo_papel == '80mm' else 0.75*inch,
+                rightMargin=3*mm if tipo_papel == '80mm' else 0.75*inch,
+                topMargin=3*mm if tipo_papel == '80mm' else 0.75*inch,
+                bottomMargin=3*mm if tipo_papel == '80mm' else 0.75*inch,
+            )
 
-        # Seleccionar tamaño de papel
-        pagesize = TICKET_80MM if tipo_papel == '80mm' else A4
+            elementos = PDFGenerator._crear_elementos_liquidacion(cliente, abono, nuevo_saldo, ventas_pagadas, tipo_papel)
+            doc.build(elementos)
 
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=pagesize,
-            leftMargin=3*mm if tipo_papel == '80mm' else 0.75*inch,
-            rightMargin=3*mm if tipo_papel == '80mm' else 0.75*inch,
-            topMargin=3*mm if tipo_papel == '80mm' else 0.75*inch,
-            bottomMargin=3*mm if tipo_papel == '80mm' else 0.75*inch,
-        )
+            return _leer_buf(buffer)
+        finally:
+            _release_buf(buffer)
 
-        elementos = PDFGenerator._crear_elementos_liquidacion(cliente, abono, nuevo_saldo, ventas_pagadas, tipo_papel)
-        doc.build(elementos)
+    @staticmethod
+    def _html_liquidacion(cliente, abono, nuevo_saldo, ventas_pagadas):
+        """Helper: Arma el comprobante de liquidación A4 como HTML (para ferropdf)"""
+        ventas_html = []
+        for venta_info in ventas_pagadas or ():
+            venta = venta_info['venta']
+            productos_html = "".join(
+                f"<tr><td>{escape(item['nombre'])}</td><td class='num'>{item['cantidad']}</td>"
+                f"<td class='num'>${item['subtotal']:.2f}</td></tr>"
+                for item in venta.productos
+            )
+            ventas_html.append(
+                f"<div class='venta'>"
+                f"<div class='venta-hdr'><b>Venta #{venta.id}</b><span>${venta_info['monto']:.2f}</span></div>"
+                f"<div>Fecha: {_fmt_fecha(venta.fecha)}</div>"
+                f"<table class='prod'><tr><th>Producto</th><th>Cant</th><th>Precio</th></tr>{productos_html}</table>"
+                f"</div>"
+            )
+
+        detalle = ""
+        if ventas_html:
+            detalle = "<p><b>DETALLE DE VENTAS ABONADAS</b></p>" + "".join(ventas_html)
 
-        buffer.seek(0)
-        return buffer.getvalue()
+        if nuevo_saldo == 0:
+            mensaje = "<div class='msg ok'><b>DEUDA LIQUIDADA COMPLETAMENTE</b></div>"
+        else:
+            mensaje = f"<div class='msg pend'><b>Saldo pendiente: ${nuevo_saldo:.2f}</b></div>"
+        color_saldo = '#2E7D32' if nuevo_saldo == 0 else '#D32F2F'
+
+        return f"""<html><head><style>
+body {{ font-family: Helvetica, Arial, sans-serif; font-size: 10pt; }}
+h1 {{ text-align: center; color: #1976D2; font-size: 24pt; margin: 0 0 20pt 0; }}
+.sub {{ text-align: center; color: grey; font-size: 12pt; }}
+.info td {{ font-size: 12pt; padding: 6pt 10pt 6pt 0; }}
+.info td:first-child {{ font-weight: bold; color: #424242; }}
+.info tr.saldo td {{ font-weight: bold; font-size: 14pt; background: #F5F5F5; }}
+.info tr.saldo td:last-child {{ color: {color_saldo}; }}
+.venta {{ margin-bottom: 10pt; font-size: 9pt; }}
+.venta-hdr {{ display: flex; justify-content: space-between; color: #1976D2; }}
+.prod {{ border-collapse: collapse; font-size: 8pt; }}
+.prod th, .prod td {{ border: 0.5pt solid grey; padding: 2pt 4pt; }}
+.num {{ text-align: right; }}
+.msg {{ text-align: center; padding: 12pt; margin-top: 20pt; }}
+.msg.ok {{ color: #2E7D32; border: 2pt solid #2E7D32; font-size: 14pt; }}
+.msg.pend {{ color: #D32F2F; border: 1pt solid #D32F2F; font-size: 12pt; }}
+.pie {{ text-align: center; color: grey; font-size: 9pt; margin-top: 50pt; }}
+</style></head><body>
+<h1>LA MILAGROSA</h1>
+<div class='sub'>Sistema de Gestión de Ventas</div>
+<div class='sub'><b>COMPROBANTE DE PAGO</b></div>
+<table class='info'>
+<tr><td>Fecha:</td><td>{datetime.now().strftime("%d/%m/%Y %H:%M")}</td></tr>
+<tr><td>Cliente:</td><td>{escape(cliente.nombre)}</td></tr>
+<tr><td>Saldo Anterior:</td><td>${cliente.deuda_total:.2f}</td></tr>
+<tr><td>Abono:</td><td>${abono:.2f}</td></tr>
+<tr class='saldo'><td>Nuevo Saldo:</td><td>${nuevo_saldo:.2f}</td></tr>
+</table>
+{detalle}
+{mensaje}
+<div class='pie'>Gracias por su pago</div>
+</body></html>"""
+
+    @staticmethod
+    def generar_comprobante_liquidacion_bytes_fast(cliente, abono, nuevo_saldo, ventas_pagadas=None):
+        """
+        Genera el PDF de liquidación A4 con ferropdf (HTML->PDF en Rust)
+
+        Si ferropdf no está instalado o falla, usa ReportLab como siempre.
+
+        Returns:
+            bytes: Contenido del PDF en bytes
+        """
+        if ferropdf is not None:
+            try:
+                html = PDFGenerator._html_liquidacion(cliente, abono, nuevo_saldo, ventas_pagadas)
+                motor = ferropdf.Engine(ferropdf.Options(page_size="A4", margin="20mm"))
+                return bytes(motor.render(html))
+            except Exception as e:
+                print(f"ferropdf falló, usando ReportLab: {e}")
+
+        return PDFGenerator.generar_comprobante_liquidacion_bytes(
+            cliente, abono, nuevo_saldo, ventas_pagadas, tipo_papel='A4'
+        )
 
     @staticmethod
     def _get_temp_pdf_dir():
@@ -1029,72 +1036,108 @@ class PDFGenerator:
         os.makedirs(temp_dir, exist_ok=True)
         return temp_dir
 
+    # Última limpieza de PDFs temporales (para no escanear el directorio en cada llamada)
+    _ultima_limpieza = 0.0
+
+    @staticmethod
+    def _escribir_archivo(ruta, datos: bytes):
+        """
+        Escribe los bytes del PDF con os.write, sin pasar por la capa de buffer de Python
+
+        Escribe en bloques de 64 KB sobre un memoryview (sin copias) y repite
+        mientras os.write devuelva escrituras parciales.
+        """
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+        fd = os.open(ruta, flags, 0o644)
+        try:
+            vista = memoryview(datos)
+            bloque = 64 * 1024
+            while vista:
+                escritos = os.write(fd, vista[:bloque])
+                vista = vista[escritos:]
+        finally:
+            os.close(fd)
+
     @staticmethod
     def _limpiar_pdfs_antiguos():
         """Limpia PDFs temporales con más de 10 minutos"""
-        import time
-        temp_dir = PDFGenerator._get_temp_pdf_dir()
         ahora = time.time()
-        for archivo in os.listdir(temp_dir):
-            ruta = os.path.join(temp_dir, archivo)
-            if os.path.isfile(ruta) and archivo.endswith('.pdf'):
-                edad = ahora - os.path.getmtime(ruta)
-                if edad > 600:  # 10 minutos
+        if ahora - PDFGenerator._ultima_limpieza < 60:
+            return
+        PDFGenerator._ultima_limpieza = ahora
+
+        temp_dir = PDFGenerator._get_temp_pdf_dir()
+        # scandir reutiliza la información del directorio y evita un stat extra por archivo
+        with os.scandir(temp_dir) as entradas:
+            for entrada in entradas:
+                if not entrada.name.endswith('.pdf') or not entrada.is_file(follow_symlinks=False):
+                    continue
+                if ahora - entrada.stat().st_mtime > 600:  # 10 minutos
                     try:
-                        os.remove(ruta)
-                    except:
+                        os.unlink(entrada.path)
+                    except OSError:
                         pass
 
-    # Servidor HTTP para servir PDFs (singleton)
-    _pdf_server = None
-    _pdf_server_port = None
+    # Hilo de limpieza periódica de PDFs temporales (singleton)
+    _hilo_limpieza_iniciado = False
+
+    @staticmethod
+    def _bucle_limpieza():
+        """Limpia los PDFs temporales cada 2 minutos, fuera del hilo de la UI"""
+        while True:
+            try:
+                PDFGenerator._limpiar_pdfs_antiguos()
+            except Exception as e:
+                print(f"Error al limpiar PDFs temporales: {e}")
+            time.sleep(120)
 
     @staticmethod
-    def _iniciar_servidor_pdf():
-        """Inicia un servidor HTTP simple para servir los PDFs"""
-        import http.server
-        import socketserver
-        import threading
+    def _iniciar_limpieza_periodica():
+        """Inicia el hilo de limpieza si todavía no está corriendo"""
+        if PDFGenerator._hilo_limpieza_iniciado:
+            return
+        PDFGenerator._hilo_limpieza_iniciado = True
+        threading.Thread(target=PDFGenerator._bucle_limpieza, daemon=True).start()
 
-        if PDFGenerator._pdf_server is not None:
-            return PDFGenerator._pdf_server_port
 
-        temp_dir = PDFGenerator._get_temp_pdf_dir()
+    @staticmethod
+    def _guardar_pdf_temporal(pdf_bytes: bytes, nombre_archivo: str):
+        """
+        Guarda el PDF en assets/temp_pdfs con un nombre único
 
-        class PDFHandler(http.server.SimpleHTTPRequestHandler):
-            def __init__(self, *args, **kwargs):
-                super().__init__(*args, directory=temp_dir, **kwargs)
+        Returns:
+            tuple: (ruta del archivo, URL relativa con la que Flet lo sirve en web)
+        """
+        ruta_pdf, pdf_url = PDFGenerator._reservar_pdf_temporal(nombre_archivo)
+        PDFGenerator._escribir_archivo(ruta_pdf, pdf_bytes)
+        return ruta_pdf, pdf_url
 
-            def end_headers(self):
-                # Permitir CORS para que el navegador pueda acceder
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.send_header('Content-Disposition', 'inline')
-                super().end_headers()
+    @staticmethod
+    def _reservar_pdf_temporal(nombre_archivo: str):
+        """
+        Elige la ruta única en assets/temp_pdfs sin escribir nada todavía
 
-            def log_message(self, format, *args):
-                pass  # Silenciar logs
+        Sirve para que el generador escriba el PDF directo en el archivo que
+        Flet va a servir, sin armarlo antes entero en memoria.
 
-        # Buscar puerto disponible
-        for port in range(8600, 8700):
-            try:
-                server = socketserver.TCPServer(("", port), PDFHandler)
-                PDFGenerator._pdf_server = server
-                PDFGenerator._pdf_server_port = port
+        Returns:
+            tuple: (ruta del archivo, URL relativa con la que Flet lo sirve en web)
+        """
+        # Limpiar PDFs antiguos en segundo plano
+        PDFGenerator._iniciar_limpieza_periodica()
 
-                # Iniciar en hilo separado
-                thread = threading.Thread(target=server.serve_forever, daemon=True)
-                thread.start()
-                print(f"Servidor PDF iniciado en puerto {port}")
-                return port
-            except OSError:
-                continue
+        # Generar nombre único para el archivo
+        unique_id = str(uuid.uuid4())[:8]
+        archivo_temp = f"{unique_id}_{nombre_archivo}"
+        ruta_pdf = os.path.join(PDFGenerator._get_temp_pdf_dir(), archivo_temp)
 
-        return None
+        # El PDF queda dentro de assets/, que Flet ya sirve en la raíz
+        return ruta_pdf, f"/temp_pdfs/{archivo_temp}"
 
     @staticmethod
     def abrir_pdf_en_navegador(page, pdf_bytes: bytes, nombre_archivo: str = "comprobante.pdf"):
         """
-        En web: guarda el PDF y lo sirve via HTTP local
+        En web: guarda el PDF en assets/temp_pdfs y lo abre desde los assets de Flet
         En desktop: abre el PDF directamente
 
         Args:
@@ -1102,46 +1145,27 @@ class PDFGenerator:
             pdf_bytes: Contenido del PDF en bytes
             nombre_archivo: Nombre del archivo
         """
-        import flet as ft
-        import uuid
+        ruta_pdf, pdf_url = PDFGenerator._guardar_pdf_temporal(pdf_bytes, nombre_archivo)
+        PDFGenerator._mostrar_pdf_guardado(page, ruta_pdf, pdf_url)
 
-        # Limpiar PDFs antiguos
-        PDFGenerator._limpiar_pdfs_antiguos()
-
-        # Generar nombre único para el archivo
-        unique_id = str(uuid.uuid4())[:8]
-        archivo_temp = f"{unique_id}_{nombre_archivo}"
-
-        # Guardar PDF en directorio temporal
-        temp_dir = PDFGenerator._get_temp_pdf_dir()
-        ruta_pdf = os.path.join(temp_dir, archivo_temp)
-
-        with open(ruta_pdf, 'wb') as f:
-            f.write(pdf_bytes)
-
-        # Detectar si es web
-        es_web = getattr(page, 'web', False)
+    @staticmethod
+    def _mostrar_pdf_guardado(page, ruta_pdf, pdf_url):
+        """
+        Helper: Muestra un PDF que ya está en assets/temp_pdfs
 
-        if not es_web:
+        En web abre el modal con el enlace; en desktop lo abre con el visor del sistema.
+        """
+        if not getattr(page, 'web', False):
             # En desktop: abrir directamente con el visor de PDF del sistema
             PDFGenerator.abrir_pdf(ruta_pdf)
             return
 
-        # En WEB: Iniciar servidor HTTP y servir el PDF
-        port = PDFGenerator._iniciar_servidor_pdf()
-
-        if port:
-            pdf_url = f"http://localhost:{port}/{archivo_temp}"
-        else:
-            pdf_url = None
-
         def cerrar_modal(e):
             modal.open = False
             page.update()
 
         def abrir_pdf(e):
-            if pdf_url:
-                page.launch_url(pdf_url)
+            page.launch_url(pdf_url)
 
         # Crear el modal
         modal = ft.AlertDialog(
@@ -1169,7 +1193,6 @@ class PDFGenerator:
                         color=ft.Colors.WHITE,
                         width=200,
                         on_click=abrir_pdf,
-                        disabled=pdf_url is None,
                     ),
                     ft.Container(height=10),
                     ft.Text(
@@ -1202,67 +1225,28 @@ class PDFGenerator:
             pdf_bytes: Contenido del PDF en bytes
             nombre_archivo: Nombre del archivo para descargar
         """
-        PDFGenerator.abrir_pdf_en_navegador(page, pdf_bytes, nombre_archivo)
+        # Sin modal: se abre la URL directamente
+        ruta_pdf, pdf_url = PDFGenerator._guardar_pdf_temporal(pdf_bytes, nombre_archivo)
+
+        if getattr(page, 'web', False):
+            page.launch_url(pdf_url)
+        else:
+            PDFGenerator.abrir_pdf(ruta_pdf)
 
     @staticmethod
     def _crear_elementos_venta(venta, tipo_papel):
         """Helper: Crea los elementos del PDF de venta (reutilizable)"""
+        _cargar_reportlab()
         elementos = []
-        estilos = getSampleStyleSheet()
-
-        if tipo_papel == '80mm':
-            estilo_titulo = ParagraphStyle(
-                'CustomTitle',
-                parent=estilos['Heading1'],
-                fontSize=12,
-                textColor=colors.black,
-                spaceAfter=4,
-                alignment=TA_CENTER,
-                wordWrap='CJK',
-                leading=14,
-            )
-            estilo_subtitulo = ParagraphStyle(
-                'CustomSubtitle',
-                parent=estilos['Normal'],
-                fontSize=7,
-                textColor=colors.black,
-                alignment=TA_CENTER,
-                spaceAfter=3,
-                leading=9,
-            )
-            estilo_normal = ParagraphStyle(
-                'Normal80mm',
-                parent=estilos['Normal'],
-                fontSize=7,
-                wordWrap='CJK',
-                leading=9,
-            )
-        else:
-            estilo_titulo = ParagraphStyle(
-                'CustomTitle',
-                parent=estilos['Heading1'],
-                fontSize=24,
-                textColor=colors.HexColor('#2E7D32'),
-                spaceAfter=30,
-                alignment=TA_CENTER,
-            )
-            estilo_subtitulo = ParagraphStyle(
-                'CustomSubtitle',
-                parent=estilos['Normal'],
-                fontSize=12,
-                textColor=colors.grey,
-                alignment=TA_CENTER,
-                spaceAfter=20,
-            )
-            estilo_normal = estilos['Normal']
+        S = _STYLES_80MM if tipo_papel == '80mm' else _STYLES_A4
 
         # Encabezado
-        elementos.append(Paragraph("LA MILAGROSA", estilo_titulo))
+        elementos.append(Paragraph("LA MILAGROSA", S['titulo']))
         if tipo_papel != '80mm':
-            elementos.append(Paragraph("Sistema de Gestión de Ventas", estilo_subtitulo))
+            elementos.append(Paragraph("Sistema de Gestión de Ventas", S['subtitulo']))
 
         tipo_comprobante = "VENTA FIADA" if venta.es_fiado else "VENTA"
-        elementos.append(Paragraph(f"<b>{tipo_comprobante}</b>", estilo_subtitulo))
+        elementos.append(Paragraph(f"<b>{tipo_comprobante}</b>", S['subtitulo']))
         elementos.append(Spacer(1, 2*mm if tipo_papel == '80mm' else 0.3*inch))
 
         # Info de la venta
@@ -1275,98 +1259,30 @@ class PDFGenerator:
         if venta.usuario_nombre:
             info_data.append(["Vendedor:", venta.usuario_nombre])
 
-        if tipo_papel == '80mm':
-            col_widths = [18*mm, 56*mm]
-            font_size = 7
-            padding = 2
-        else:
-            col_widths = [2*inch, 4*inch]
-            font_size = 11
-            padding = 8
-
-        info_table = Table(info_data, colWidths=col_widths)
-        info_table.setStyle(TableStyle([
-            ('FONT', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONT', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), font_size),
-            ('TEXTCOLOR', (0, 0), (0, -1), colors.black),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), padding),
-            ('TOPPADDING', (0, 0), (-1, -1), 1 if tipo_papel == '80mm' else padding),
-        ]))
+        info_table = Table(info_data, colWidths=S['colw_info'])
+        info_table.setStyle(S['info_table'])
         elementos.append(info_table)
         elementos.append(Spacer(1, 2*mm if tipo_papel == '80mm' else 0.4*inch))
 
         # Detalle de productos
-        elementos.append(Paragraph("<b>DETALLE DE PRODUCTOS</b>", estilo_normal))
+        elementos.append(Paragraph("<b>DETALLE DE PRODUCTOS</b>", S['normal']))
         elementos.append(Spacer(1, 2*mm if tipo_papel == '80mm' else 0.2*inch))
 
         if tipo_papel == '80mm':
-            productos_data = [['Producto', 'Cant', 'Total']]
-            for item in venta.productos:
-                productos_data.append([
-                    item['nombre'],
-                    str(item['cantidad']),
-                    f"${item['subtotal']:.2f}"
-                ])
-            prod_col_widths = [46*mm, 12*mm, 16*mm]
-            header_font = 7
-            content_font = 7
-            header_pad = 2
-            content_pad = 2
-        else:
-            productos_data = [['Producto', 'Precio Unit.', 'Cantidad', 'Subtotal']]
-            for item in venta.productos:
-                productos_data.append([
-                    item['nombre'],
-                    f"${item['precio_unitario']:.2f}",
-                    str(item['cantidad']),
-                    f"${item['subtotal']:.2f}"
-                ])
-            prod_col_widths = [3.5*inch, 1.2*inch, 1*inch, 1.3*inch]
-            header_font = 11
-            content_font = 10
-            header_pad = 12
-            content_pad = 8
-
-        productos_table = Table(productos_data, colWidths=prod_col_widths)
-
-        if tipo_papel == '80mm':
-            productos_table.setStyle(TableStyle([
-                ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), header_font),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), header_pad),
-                ('TOPPADDING', (0, 0), (-1, 0), header_pad),
-                ('LINEBELOW', (0, 0), (-1, 0), 1, colors.black),
-                ('FONT', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), content_font),
-                ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
-                ('ALIGN', (2, 1), (2, -1), 'RIGHT'),
-                ('ALIGN', (0, 1), (0, -1), 'LEFT'),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), content_pad),
-                ('TOPPADDING', (0, 1), (-1, -1), content_pad),
-                ('LINEBELOW', (0, 1), (-1, -1), 0.5, colors.black),
-            ]))
+            productos_data = [
+                ('Producto', 'Cant', 'Total'),
+                *((item['nombre'], str(item['cantidad']), _MONEY(item['subtotal']))
+                  for item in venta.productos),
+            ]
         else:
-            productos_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E7D32')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), header_font),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), header_pad),
-                ('TOPPADDING', (0, 0), (-1, 0), header_pad),
-                ('FONT', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), content_font),
-                ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
-                ('ALIGN', (0, 1), (0, -1), 'LEFT'),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), content_pad),
-                ('TOPPADDING', (0, 1), (-1, -1), content_pad),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                ('BOX', (0, 0), (-1, -1), 2, colors.HexColor('#2E7D32')),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F5F5F5')]),
-            ]))
-
+            productos_data = [
+                ('Producto', 'Precio Unit.', 'Cantidad', 'Subtotal'),
+                *((item['nombre'], _MONEY(item['precio_unitario']), str(item['cantidad']), _MONEY(item['subtotal']))
+                  for item in venta.productos),
+            ]
+
+        productos_table = Table(productos_data, colWidths=S['colw_prod'])
+        productos_table.setStyle(S['prod_table'])
         elementos.append(productos_table)
         elementos.append(Spacer(1, 2*mm if tipo_papel == '80mm' else 0.3*inch))
 
@@ -1378,152 +1294,303 @@ class PDFGenerator:
                 ['', 'RESTA:', f"${venta.resto:.2f}"],
             ])
 
-        if tipo_papel == '80mm':
-            total_col_widths = [46*mm, 12*mm, 16*mm]
-            total_font = 8
-            total_pad = 2
-        else:
-            total_col_widths = [3.5*inch, 1.5*inch, 2*inch]
-            total_font = 12
-            total_pad = 8
-
-        totales_table = Table(totales_data, colWidths=total_col_widths)
-
-        if tipo_papel == '80mm':
-            totales_table.setStyle(TableStyle([
-                ('FONT', (1, 0), (1, -1), 'Helvetica-Bold'),
-                ('FONT', (2, 0), (2, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (1, 0), (2, -1), total_font),
-                ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
-                ('TEXTCOLOR', (1, 0), (2, -1), colors.black),
-                ('BOTTOMPADDING', (1, 0), (2, -1), total_pad),
-                ('TOPPADDING', (1, 0), (2, -1), total_pad),
-                ('LINEABOVE', (1, 0), (2, 0), 1.5, colors.black),
-            ]))
-        else:
-            totales_table.setStyle(TableStyle([
-                ('FONT', (1, 0), (1, -1), 'Helvetica-Bold'),
-                ('FONT', (2, 0), (2, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (1, 0), (2, -1), total_font),
-                ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
-                ('TEXTCOLOR', (2, 0), (2, -1), colors.HexColor('#2E7D32')),
-                ('BOTTOMPADDING', (1, 0), (2, -1), total_pad),
-            ]))
-
+        totales_table = Table(totales_data, colWidths=S['colw_totales'])
+        totales_table.setStyle(S['totales_table'])
         elementos.append(totales_table)
 
         # Nota si es fiado
         if venta.es_fiado:
             elementos.append(Spacer(1, 2*mm if tipo_papel == '80mm' else 0.4*inch))
             if tipo_papel == '80mm':
-                nota_estilo = ParagraphStyle(
-                    'Nota',
-                    parent=estilos['Normal'],
-                    fontSize=7,
-                    textColor=colors.black,
-                    alignment=TA_CENTER,
-                    borderWidth=1,
-                    borderPadding=3,
-                    borderColor=colors.black,
-                    leading=9,
-                )
-                elementos.append(Paragraph(f"<b>FIADO - RESTA: ${venta.resto:.2f}</b>", nota_estilo))
+                elementos.append(Paragraph(f"<b>FIADO - RESTA: ${venta.resto:.2f}</b>", S['nota']))
             else:
-                nota_estilo = ParagraphStyle(
-                    'Nota',
-                    parent=estilos['Normal'],
-                    fontSize=10,
-                    textColor=colors.HexColor('#D32F2F'),
-                    alignment=TA_CENTER,
-                    borderColor=colors.HexColor('#D32F2F'),
-                    borderWidth=1,
-                    borderPadding=10,
-                )
                 elementos.append(Paragraph(
                     f"<b>IMPORTANTE:</b> Esta es una venta fiada. El saldo pendiente de ${venta.resto:.2f} debe ser abonado.",
-                    nota_estilo
+                    S['nota']
                 ))
 
         # Pie de página
         elementos.append(Spacer(1, 2*mm if tipo_papel == '80mm' else 0.5*inch))
-        pie_estilo = ParagraphStyle(
-            'Pie',
-            parent=estilos['Normal'],
-            fontSize=6 if tipo_papel == '80mm' else 9,
-            textColor=colors.black if tipo_papel == '80mm' else colors.grey,
-            alignment=TA_CENTER,
-            leading=8 if tipo_papel == '80mm' else 12,
-        )
-        elementos.append(Paragraph("Gracias por su compra", pie_estilo))
+        elementos.append(Paragraph("Gracias por su compra", S['pie']))
         if tipo_papel != '80mm':
             elementos.append(Paragraph(
                 f"Comprobante generado el {datetime.now().strftime('%d/%m/%Y a las %H:%M')}",
-                pie_estilo
+                S['pie']
             ))
 
         return elementos
 
     @staticmethod
-    def _crear_elementos_liquidacion(cliente, abono, nuevo_saldo, ventas_pagadas, tipo_papel):
-        """Helper: Crea los elementos del PDF de liquidación (reutilizable)"""
-        elementos = []
-        estilos = getSampleStyleSheet()
+    def _render_ticket_80mm_canvas(venta, destino):
+        """
+        Dibuja el ticket de venta 80mm directamente sobre un canvas.
+
+        El ticket es lineal, así que no hace falta el motor de flowables
+        (wrap/split/paginado) de SimpleDocTemplate: se usa un cursor vertical
+        y se dibuja texto y líneas a mano.
+
+        Args:
+            venta: Objeto Venta con todos los datos
+            destino: Ruta de archivo o buffer (BytesIO) donde escribir el PDF
+        """
+        _cargar_reportlab()
+        ancho, alto = TICKET_80MM
+        margen = 3*mm
+        x_izq = margen
+        x_der = ancho - margen
+        x_valor = margen + 18*mm              # columna de valores en la info
+        x_cant = margen + 46*mm + 6*mm        # centro de la columna Cant
+        x_etiqueta_total = margen + 58*mm     # borde derecho de TOTAL:/RESTA:
+        ancho_nombre = 46*mm - 4              # ancho útil para el nombre del producto
+
+        c = canvas.Canvas(destino, pagesize=TICKET_80MM)
+        y = alto - margen
+
+        def asegurar_espacio(necesario):
+            nonlocal y
+            if y - necesario < margen:
+                c.showPage()
+                y = alto - margen
+
+        # Encabezado
+        y -= 12
+        c.setFont('Helvetica-Bold', 12)
+        c.drawCentredString(ancho / 2, y, "LA MILAGROSA")
+        y -= 4 + 9
+
+        tipo_comprobante = "VENTA FIADA" if venta.es_fiado else "VENTA"
+        c.setFont('Helvetica-Bold', 7)
+        c.drawCentredString(ancho / 2, y, tipo_comprobante)
+        y -= 3 + 2*mm
+
+        # Info de la venta
+        info_data = [
+            ("Nº Venta:", f"#{venta.id}"),
+            ("Fecha:", venta.fecha.strftime("%d/%m/%Y %H:%M")),
+        ]
+        if venta.cliente_nombre:
+            info_data.append(("Cliente:", venta.cliente_nombre))
+        if venta.usuario_nombre:
+            info_data.append(("Vendedor:", venta.usuario_nombre))
+
+        for etiqueta, valor in info_data:
+            lineas = simpleSplit(str(valor), 'Helvetica', 7, x_der - x_valor)
+            asegurar_espacio(9 * len(lineas) + 3)
+            y -= 8
+            c.setFont('Helvetica-Bold', 7)
+            c.drawString(x_izq, y, etiqueta)
+            c.setFont('Helvetica', 7)
+            for i, linea in enumerate(lineas):
+                if i:
+                    y -= 9
+                c.drawString(x_valor, y, linea)
+            y -= 3
+        y -= 2*mm
+
+        # Detalle de productos
+        asegurar_espacio(30)
+        y -= 8
+        c.setFont('Helvetica-Bold', 7)
+        c.drawString(x_izq, y, "DETALLE DE PRODUCTOS")
+        y -= 2*mm + 10
+
+        c.drawString(x_izq, y, "Producto")
+        c.drawCentredString(x_cant, y, "Cant")
+        c.drawRightString(x_der, y, "Total")
+        y -= 4
+        c.setLineWidth(1)
+        c.line(x_izq, y, x_der, y)
+
+        c.setFont('Helvetica', 7)
+        c.setLineWidth(0.5)
+        for item in venta.productos:
+            lineas = simpleSplit(str(item['nombre']), 'Helvetica', 7, ancho_nombre) or ['']
+            asegurar_espacio(9 * len(lineas) + 6)
+            y -= 10
+            c.drawCentredString(x_cant, y, str(item['cantidad']))
+            c.drawRightString(x_der, y, f"${item['subtotal']:.2f}")
+            for i, linea in enumerate(lineas):
+                if i:
+                    y -= 9
+                c.drawString(x_izq, y, linea)
+            y -= 4
+            c.line(x_izq, y, x_der, y)
+        y -= 2*mm
+
+        # Totales
+        totales_data = [("TOTAL:", f"${venta.total:.2f}")]
+        if venta.es_fiado:
+            totales_data.extend([
+                ("Abonado:", f"${venta.abonado:.2f}"),
+                ("RESTA:", f"${venta.resto:.2f}"),
+            ])
+
+        asegurar_espacio(12 * len(totales_data) + 4)
+        c.setLineWidth(1.5)
+        c.line(x_izq + 46*mm, y, x_der, y)
+        c.setFont('Helvetica-Bold', 8)
+        for etiqueta, valor in totales_data:
+            y -= 10
+            c.drawRightString(x_etiqueta_total, y, etiqueta)
+            c.drawRightString(x_der, y, valor)
+            y -= 2
+
+        # Nota si es fiado
+        if venta.es_fiado:
+            asegurar_espacio(2*mm + 16)
+            y -= 2*mm + 12
+            c.setFont('Helvetica-Bold', 7)
+            c.drawCentredString(ancho / 2, y, f"FIADO - RESTA: ${venta.resto:.2f}")
+            c.setLineWidth(1)
+            c.rect(x_izq, y - 4, x_der - x_izq, 14)
+            y -= 4
 
+        # Pie de página
+        asegurar_espacio(2*mm + 8)
+        y -= 2*mm + 8
+        c.setFont('Helvetica', 6)
+        c.drawCentredString(ancho / 2, y, "Gracias por su compra")
+
+        c.showPage()
+        c.save()
+
+    # Filas ya formateadas de cada venta abonada, por (venta, papel, monto).
+    # Los productos de una venta no cambian, así que las reimpresiones las reutilizan.
+    _venta_filas_cache = {}
+    _VENTA_FILAS_CACHE_MAX = 512
+    # Los comprobantes se generan en hilos (asyncio.to_thread): el LRU se toca con este lock
+    _venta_filas_lock = threading.Lock()
+
+    @staticmethod
+    def _filas_venta_abonada(venta, monto_abonado, tipo_papel):
+        """
+        Helper: Filas y comandos de estilo de una venta abonada (memorizados)
+
+        Returns:
+            tuple: (filas, comandos, fila_productos) con los índices de fila relativos
+                a la fila 0 de la venta. En 80mm fila_productos es la primera fila de
+                productos (una por producto, hasta el final de la venta), cuyo texto va
+                en un Paragraph (None si la venta no tiene productos).
+        """
+        cache = PDFGenerator._venta_filas_cache
+        clave = (venta.id, tipo_papel, monto_abonado)
+        with PDFGenerator._venta_filas_lock:
+            if clave in cache:
+                resultado = cache[clave] = cache.pop(clave)  # marcar como usada recientemente
+                return resultado
+
+        fecha = _FECHA_FMT % _fmt_fecha(venta.fecha)
+        encabezado = _VENTA_HDR(venta.id)
+        monto = _MONEY(monto_abonado)
+        fila_productos = None
+
+        # Encabezado de la venta: "Venta #N" a la izquierda y el monto abonado a la derecha
         if tipo_papel == '80mm':
-            estilo_titulo = ParagraphStyle(
-                'CustomTitle',
-                parent=estilos['Heading1'],
-                fontSize=12,
-                textColor=colors.black,
-                spaceAfter=4,
-                alignment=TA_CENTER,
-                wordWrap='CJK',
-                leading=14,
-            )
-            estilo_subtitulo = ParagraphStyle(
-                'CustomSubtitle',
-                parent=estilos['Normal'],
-                fontSize=7,
-                textColor=colors.black,
-                alignment=TA_CENTER,
-                spaceAfter=3,
-                leading=9,
-            )
-            estilo_normal = ParagraphStyle(
-                'Normal80mm',
-                parent=estilos['Normal'],
-                fontSize=7,
-                wordWrap='CJK',
-                leading=9,
-            )
+            filas = [
+                (encabezado, monto),
+                (fecha, ""),
+            ]
+            comandos = []
+        else:
+            filas = [
+                (encabezado, "", "", monto),
+                (fecha, "", "", ""),
+            ]
+            comandos = [
+                ('SPAN', (0, 0), (2, 0)),
+                ('SPAN', (0, 1), (3, 1)),
+            ]
+        comandos += [
+            ('ALIGN', (-1, 0), (-1, 0), 'RIGHT'),
+            ('TEXTCOLOR', (0, 0), (0, 0), C_BLUE),
+            ('FONT', (0, 0), (0, 0), 'Helvetica-Bold'),
+        ]
+
+        # Productos de la venta: una fila por producto, así la tabla se puede
+        # partir entre páginas aunque la venta tenga muchos
+        if tipo_papel == '80mm':
+            if venta.productos:
+                fila_productos = len(filas)
+                filas.extend(
+                    (f"  - {escape(item['nombre'])} x{item['cantidad']}", "")
+                    for item in venta.productos
+                )
+                ultima = len(filas) - 1
+                comandos += [
+                    ('SPAN', (0, fila), (1, fila)) for fila in range(fila_productos, ultima + 1)
+                ]
+                comandos.append(('LEFTPADDING', (0, fila_productos), (-1, ultima), 0))
         else:
-            estilo_titulo = ParagraphStyle(
-                'CustomTitle',
-                parent=estilos['Heading1'],
-                fontSize=24,
-                textColor=colors.HexColor('#1976D2'),
-                spaceAfter=30,
-                alignment=TA_CENTER,
+            h = len(filas)
+            filas.append(("Producto", "Cant", "Precio", ""))
+            filas.extend(
+                (item['nombre'], str(item['cantidad']), _MONEY(item['subtotal']), "")
+                for item in venta.productos
+            )
+            ultima = len(filas) - 1
+            comandos += [
+                ('FONT', (0, h), (2, h), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, h), (2, ultima), 8),
+                ('ALIGN', (1, h), (2, ultima), 'RIGHT'),
+                ('BOTTOMPADDING', (0, h), (2, ultima), 3),
+                ('GRID', (0, h), (2, ultima), 0.5, colors.grey),
+            ]
+
+        resultado = (tuple(filas), tuple(comandos), fila_productos)
+        with PDFGenerator._venta_filas_lock:
+            if clave not in cache and len(cache) >= PDFGenerator._VENTA_FILAS_CACHE_MAX:
+                cache.pop(next(iter(cache)))  # descartar la menos usada
+            cache[clave] = resultado
+        return resultado
+
+    @staticmethod
+    def _crear_tabla_ventas_abonadas(ventas_pagadas, tipo_papel, S):
+        """
+        Helper: Arma el detalle de ventas abonadas como una sola tabla
+
+        Todas las ventas (encabezado, fecha y productos) van en la misma Table,
+        así ReportLab la mide en una sola pasada en vez de 2-3 flowables por venta.
+        """
+        separacion = 2*mm if tipo_papel == '80mm' else 0.15*inch  # espacio entre ventas
+        filas = []
+        comandos = []
+
+        for venta_info in ventas_pagadas:
+            filas_venta, comandos_venta, fila_productos = PDFGenerator._filas_venta_abonada(
+                venta_info['venta'], venta_info['monto'], tipo_papel
             )
-            estilo_subtitulo = ParagraphStyle(
-                'CustomSubtitle',
-                parent=estilos['Normal'],
-                fontSize=12,
-                textColor=colors.grey,
-                alignment=TA_CENTER,
-                spaceAfter=20,
+
+            # Pasar los índices de fila de la venta a índices de la tabla completa
+            i = len(filas)
+            filas.extend(list(fila) for fila in filas_venta)
+            comandos.extend(
+                (cmd, (c0, r0 + i), (c1, r1 + i), *resto)
+                for cmd, (c0, r0), (c1, r1), *resto in comandos_venta
             )
-            estilo_normal = estilos['Normal']
+            if fila_productos is not None:
+                for fila in filas[i + fila_productos:]:
+                    fila[0] = Paragraph(fila[0], S['normal'])
+            if i:
+                comandos.append(('TOPPADDING', (0, i), (-1, i), 3 + separacion))
 
-        # Encabezado
-        elementos.append(Paragraph("LA MILAGROSA", estilo_titulo))
-        if tipo_papel != '80mm':
-            elementos.append(Paragraph("Sistema de Gestión de Ventas", estilo_subtitulo))
-        elementos.append(Paragraph("<b>COMPROBANTE DE PAGO</b>", estilo_subtitulo))
-        elementos.append(Spacer(1, 2*mm if tipo_papel == '80mm' else 0.5*inch))
+        tabla = Table(filas, colWidths=S['colw_liq_ventas'])
+        tabla.setStyle(S['liq_ventas_table'])
+        tabla.setStyle(TableStyle(comandos))
+        return tabla
 
-        # Info del pago
-        info_data = [
+    @staticmethod
+    def _crear_elementos_liquidacion(cliente, abono, nuevo_saldo, ventas_pagadas, tipo_papel):
+        """Helper: Crea los elementos del PDF de liquidación (reutilizable)"""
+        _cargar_reportlab()
+        constructor = (PDFGenerator._crear_elementos_liquidacion_80mm if tipo_papel == '80mm'
+                       else PDFGenerator._crear_elementos_liquidacion_a4)
+        # None y lista vacía se tratan igual: sin ventas no se arma el bloque de detalle
+        return constructor(cliente, abono, nuevo_saldo, ventas_pagadas or ())
+
+    @staticmethod
+    def _info_pago_liquidacion(cliente, abono, nuevo_saldo):
+        """Helper: Filas de la tabla con la info del pago (igual en ambos papeles)"""
+        return [
             ["Fecha:", datetime.now().strftime("%d/%m/%Y %H:%M")],
             ["Cliente:", cliente.nombre],
             ["", ""],
@@ -1532,196 +1599,102 @@ class PDFGenerator:
             ["Nuevo Saldo:", f"${nuevo_saldo:.2f}"],
         ]
 
-        if tipo_papel == '80mm':
-            info_col_widths = [22*mm, 52*mm]
-            info_font = 7
-            info_pad = 2
-            nuevo_saldo_font = 9
-        else:
-            info_col_widths = [2.5*inch, 3.5*inch]
-            info_font = 12
-            info_pad = 10
-            nuevo_saldo_font = 14
+    @staticmethod
+    def _crear_elementos_liquidacion_80mm(cliente, abono, nuevo_saldo, ventas_pagadas):
+        """Helper: Elementos del comprobante de liquidación para ticket 80mm"""
+        S = _STYLES_80MM
+        elementos = [
+            Paragraph("LA MILAGROSA", S['titulo_liquidacion']),
+            Paragraph("<b>COMPROBANTE DE PAGO</b>", S['subtitulo']),
+            Spacer(1, 2*mm),
+        ]
 
-        info_table = Table(info_data, colWidths=info_col_widths)
+        # Info del pago
+        info_table = Table(PDFGenerator._info_pago_liquidacion(cliente, abono, nuevo_saldo),
+                           colWidths=S['colw_liq_info'])
+        info_table.setStyle(S['liq_info_table'])
+        elementos.append(info_table)
+        elementos.append(Spacer(1, 2*mm))
 
-        if tipo_papel == '80mm':
-            info_table.setStyle(TableStyle([
-                ('FONT', (0, 0), (0, -1), 'Helvetica-Bold'),
-                ('FONT', (1, 0), (1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), info_font),
-                ('TEXTCOLOR', (0, 0), (0, -1), colors.black),
-                ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-                ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), info_pad),
-                ('TOPPADDING', (0, 0), (-1, -1), 1),
-                ('FONT', (0, 5), (1, 5), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 5), (1, 5), nuevo_saldo_font),
-                ('TEXTCOLOR', (1, 5), (1, 5), colors.black),
-                ('LINEABOVE', (0, 5), (1, 5), 1.5, colors.black),
-            ]))
+        # Detalle de ventas pagadas
+        if ventas_pagadas:
+            elementos.append(Paragraph("<b>DETALLE DE VENTAS ABONADAS</b>", S['normal']))
+            elementos.append(Spacer(1, 2*mm))
+            elementos.append(PDFGenerator._crear_tabla_ventas_abonadas(ventas_pagadas, '80mm', S))
+            elementos.append(Spacer(1, 4*mm))
+
+        # Mensaje según saldo
+        if nuevo_saldo == 0:
+            elementos.append(Paragraph("<b>DEUDA LIQUIDADA</b>", S['mensaje_liquidada']))
         else:
-            info_table.setStyle(TableStyle([
-                ('FONT', (0, 0), (0, -1), 'Helvetica-Bold'),
-                ('FONT', (1, 0), (1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), info_font),
-                ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#424242')),
-                ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-                ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), info_pad),
-                ('FONT', (0, 5), (1, 5), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 5), (1, 5), nuevo_saldo_font),
-                ('TEXTCOLOR', (1, 5), (1, 5), colors.HexColor('#2E7D32') if nuevo_saldo == 0 else colors.HexColor('#D32F2F')),
-                ('BACKGROUND', (0, 5), (1, 5), colors.HexColor('#F5F5F5')),
-            ]))
+            elementos.append(Paragraph(f"<b>Saldo: ${nuevo_saldo:.2f}</b>", S['mensaje_pendiente']))
 
-        elementos.append(info_table)
-        elementos.append(Spacer(1, 2*mm if tipo_papel == '80mm' else 0.5*inch))
+        # Pie de página
+        elementos.append(Spacer(1, 2*mm))
+        elementos.append(Paragraph("Gracias por su pago", S['pie']))
 
-        # Detalle de ventas pagadas
-        if ventas_pagadas and len(ventas_pagadas) > 0:
-            elementos.append(Paragraph("<b>DETALLE DE VENTAS ABONADAS</b>", estilo_normal))
-            elementos.append(Spacer(1, 2*mm if tipo_papel == '80mm' else 0.2*inch))
+        return elementos
 
-            for venta_info in ventas_pagadas:
-                venta = venta_info['venta']
-                monto_abonado = venta_info['monto']
+    @staticmethod
+    def _crear_elementos_liquidacion_a4(cliente, abono, nuevo_saldo, ventas_pagadas):
+        """Helper: Elementos del comprobante de liquidación para hoja A4"""
+        S = _STYLES_A4
+        elementos = [
+            Paragraph("LA MILAGROSA", S['titulo_liquidacion']),
+            Paragraph("Sistema de Gestión de Ventas", S['subtitulo']),
+            Paragraph("<b>COMPROBANTE DE PAGO</b>", S['subtitulo']),
+            Spacer(1, 0.5*inch),
+        ]
 
-                venta_data = [
-                    [f"Venta #{venta.id}", f"${monto_abonado:.2f}"],
-                    [f"Fecha: {venta.fecha.strftime('%d/%m/%Y')}", ""],
-                ]
+        # Info del pago (saldo en verde si quedó liquidado, en rojo si no)
+        info_table = Table(PDFGenerator._info_pago_liquidacion(cliente, abono, nuevo_saldo),
+                           colWidths=S['colw_liq_info'])
+        info_table.setStyle(S['liq_info_table'])
+        info_table.setStyle(S['liq_saldo_liquidado'] if nuevo_saldo == 0 else S['liq_saldo_pendiente'])
+        elementos.append(info_table)
+        elementos.append(Spacer(1, 0.5*inch))
 
-                if tipo_papel == '80mm':
-                    venta_col_widths = [50*mm, 24*mm]
-                    venta_font = 7
-                else:
-                    venta_col_widths = [4*inch, 2*inch]
-                    venta_font = 9
-
-                venta_table = Table(venta_data, colWidths=venta_col_widths)
-                venta_table.setStyle(TableStyle([
-                    ('FONT', (0, 0), (-1, -1), 'Helvetica'),
-                    ('FONTSIZE', (0, 0), (-1, -1), venta_font),
-                    ('ALIGN', (1, 0), (1, 0), 'RIGHT'),
-                    ('TEXTCOLOR', (0, 0), (0, 0), colors.HexColor('#1976D2')),
-                    ('FONT', (0, 0), (0, 0), 'Helvetica-Bold'),
-                    ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
-                ]))
-                elementos.append(venta_table)
-
-                if tipo_papel == '80mm':
-                    for item in venta.productos:
-                        prod_text = f"  - {item['nombre']} x{item['cantidad']}"
-                        elementos.append(Paragraph(prod_text, estilo_normal))
-                else:
-                    productos_data = [["Producto", "Cant", "Precio"]]
-                    for item in venta.productos:
-                        productos_data.append([
-                            item['nombre'],
-                            str(item['cantidad']),
-                            f"${item['subtotal']:.2f}"
-                        ])
-
-                    prod_table = Table(productos_data, colWidths=[3*inch, 0.8*inch, 1*inch])
-                    prod_table.setStyle(TableStyle([
-                        ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                        ('FONTSIZE', (0, 0), (-1, -1), 8),
-                        ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
-                        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-                        ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
-                        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                    ]))
-                    elementos.append(prod_table)
-
-                elementos.append(Spacer(1, 2*mm if tipo_papel == '80mm' else 0.15*inch))
-
-            elementos.append(Spacer(1, 2*mm if tipo_papel == '80mm' else 0.3*inch))
+        # Detalle de ventas pagadas
+        if ventas_pagadas:
+            elementos.append(Paragraph("<b>DETALLE DE VENTAS ABONADAS</b>", S['normal']))
+            elementos.append(Spacer(1, 0.2*inch))
+            elementos.append(PDFGenerator._crear_tabla_ventas_abonadas(ventas_pagadas, 'A4', S))
+            elementos.append(Spacer(1, 0.45*inch))
 
         # Mensaje según saldo
         if nuevo_saldo == 0:
-            if tipo_papel == '80mm':
-                mensaje_estilo = ParagraphStyle(
-                    'Mensaje',
-                    parent=estilos['Normal'],
-                    fontSize=8,
-                    textColor=colors.black,
-                    alignment=TA_CENTER,
-                    borderColor=colors.black,
-                    borderWidth=1,
-                    borderPadding=3,
-                    leading=10,
-                )
-                elementos.append(Paragraph("<b>DEUDA LIQUIDADA</b>", mensaje_estilo))
-            else:
-                mensaje_estilo = ParagraphStyle(
-                    'Mensaje',
-                    parent=estilos['Normal'],
-                    fontSize=14,
-                    textColor=colors.HexColor('#2E7D32'),
-                    alignment=TA_CENTER,
-                    borderColor=colors.HexColor('#2E7D32'),
-                    borderWidth=2,
-                    borderPadding=15,
-                )
-                elementos.append(Paragraph("<b>DEUDA LIQUIDADA COMPLETAMENTE</b>", mensaje_estilo))
+            elementos.append(Paragraph("<b>DEUDA LIQUIDADA COMPLETAMENTE</b>", S['mensaje_liquidada']))
         else:
-            if tipo_papel == '80mm':
-                mensaje_estilo = ParagraphStyle(
-                    'Mensaje',
-                    parent=estilos['Normal'],
-                    fontSize=7,
-                    textColor=colors.black,
-                    alignment=TA_CENTER,
-                    borderColor=colors.black,
-                    borderWidth=1,
-                    borderPadding=3,
-                    leading=9,
-                )
-                elementos.append(Paragraph(f"<b>Saldo: ${nuevo_saldo:.2f}</b>", mensaje_estilo))
-            else:
-                mensaje_estilo = ParagraphStyle(
-                    'Mensaje',
-                    parent=estilos['Normal'],
-                    fontSize=12,
-                    textColor=colors.HexColor('#D32F2F'),
-                    alignment=TA_CENTER,
-                    borderColor=colors.HexColor('#D32F2F'),
-                    borderWidth=1,
-                    borderPadding=10,
-                )
-                elementos.append(Paragraph(f"<b>Saldo pendiente: ${nuevo_saldo:.2f}</b>", mensaje_estilo))
+            elementos.append(Paragraph(f"<b>Saldo pendiente: ${nuevo_saldo:.2f}</b>", S['mensaje_pendiente']))
 
         # Pie de página
-        elementos.append(Spacer(1, 2*mm if tipo_papel == '80mm' else 1*inch))
-        pie_estilo = ParagraphStyle(
-            'Pie',
-            parent=estilos['Normal'],
-            fontSize=6 if tipo_papel == '80mm' else 9,
-            textColor=colors.black if tipo_papel == '80mm' else colors.grey,
-            alignment=TA_CENTER,
-            leading=8 if tipo_papel == '80mm' else 12,
-        )
-        elementos.append(Paragraph("Gracias por su pago", pie_estilo))
+        elementos.append(Spacer(1, 1*inch))
+        elementos.append(Paragraph("Gracias por su pago", S['pie']))
 
         return elementos
 
+    # Resultado de es_web() (no cambia mientras corre el proceso)
+    _es_web_cache = None
+
     @staticmethod
     def es_web():
         """Detecta si la aplicación está corriendo en modo web"""
-        import flet as ft
-        try:
-            # En web, algunas funciones de sistema no están disponibles
-            import platform
-            return platform.system() == 'Emscripten' or hasattr(ft, 'WEB_BROWSER')
-        except:
-            return False
+        if PDFGenerator._es_web_cache is None:
+            try:
+                # En web, algunas funciones de sistema no están disponibles
+                PDFGenerator._es_web_cache = _PLATFORM_SYSTEM == 'Emscripten' or hasattr(ft, 'WEB_BROWSER')
+            except:
+                PDFGenerator._es_web_cache = False
+        return PDFGenerator._es_web_cache
 
     @staticmethod
-    def imprimir_o_mostrar(page, venta=None, cliente=None, abono=None, nuevo_saldo=None, ventas_pagadas=None, tipo='venta'):
+    async def imprimir_o_mostrar(page, venta=None, cliente=None, abono=None, nuevo_saldo=None, ventas_pagadas=None, tipo='venta'):
         """
         Método unificado: imprime en desktop, muestra en navegador en web
 
+        La generación del PDF y el envío a la impresora corren en un hilo aparte
+        (asyncio.to_thread) para no bloquear el loop de eventos de Flet.
+
         Args:
             page: Objeto page de Flet
             venta: Objeto Venta (para tipo='venta')
@@ -1732,25 +1705,36 @@ class PDFGenerator:
             tipo: 'venta' o 'liquidacion'
         """
         # Detectar si es web basándose en el tipo de plataforma
-        es_web = page.web if hasattr(page, 'web') else False
+        es_web = getattr(page, 'web', False)
 
         if es_web:
-            # Modo web: generar en memoria y abrir en navegador
+            # Modo web: ReportLab escribe el PDF directo en el archivo que sirve Flet,
+            # sin armarlo antes entero en memoria (las liquidaciones largas pesan)
             if tipo == 'venta':
-                pdf_bytes = PDFGenerator.generar_comprobante_venta_bytes(venta, tipo_papel='A4')
-                PDFGenerator.abrir_pdf_en_navegador(page, pdf_bytes, f"venta_{venta.id}.pdf")
-            else:
-                pdf_bytes = PDFGenerator.generar_comprobante_liquidacion_bytes(
-                    cliente, abono, nuevo_saldo, ventas_pagadas, tipo_papel='A4'
+                ruta, url = PDFGenerator._reservar_pdf_temporal(f"venta_{venta.id}.pdf")
+                await asyncio.to_thread(PDFGenerator.generar_comprobante_venta, venta, ruta, 'A4')
+                PDFGenerator._mostrar_pdf_guardado(page, ruta, url)
+            elif ferropdf is not None:
+                # ferropdf devuelve bytes: se guardan como antes
+                pdf_bytes = await asyncio.to_thread(
+                    PDFGenerator.generar_comprobante_liquidacion_bytes_fast,
+                    cliente, abono, nuevo_saldo, ventas_pagadas
                 )
                 PDFGenerator.abrir_pdf_en_navegador(page, pdf_bytes, f"liquidacion_{cliente.id}.pdf")
+            else:
+                ruta, url = PDFGenerator._reservar_pdf_temporal(f"liquidacion_{cliente.id}.pdf")
+                await asyncio.to_thread(
+                    PDFGenerator.generar_comprobante_liquidacion,
+                    cliente, abono, nuevo_saldo, ventas_pagadas, ruta, 'A4'
+                )
+                PDFGenerator._mostrar_pdf_guardado(page, ruta, url)
         else:
             # Modo desktop: generar archivo e imprimir
             if tipo == 'venta':
-                ruta = PDFGenerator.generar_comprobante_venta(venta)
-                PDFGenerator.imprimir_pdf(ruta)
+                ruta = await asyncio.to_thread(PDFGenerator.generar_comprobante_venta, venta)
             else:
-                ruta = PDFGenerator.generar_comprobante_liquidacion(
+                ruta = await asyncio.to_thread(
+                    PDFGenerator.generar_comprobante_liquidacion,
                     cliente, abono, nuevo_saldo, ventas_pagadas
                 )
-                PDFGenerator.imprimir_pdf(ruta)
\ No newline at end of file
+            await asyncio.to_thread(PDFGenerator.imprimir_pdf, ruta)
\ No newline at end of file
@@ -1,18 +1,86 @@
 """Vista de gestión de clientes"""
 
+import asyncio
+import bisect
+import math
+import threading
+from contextlib import contextmanager
 import flet as ft
-from typing import List, Optional
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime
-from models.cliente import Cliente
-from database.connection import get_session_context
+from models.cliente import Cliente, ClienteResumen
+from models.abono import Abono
+from database.connection import get_scoped_session
 from database.db_service import ClienteRepository, VentaRepository, AbonoRepository
 from config.settings import AppColors
 
 from utils.pdf_generator import PDFGenerator
 
+# Línea de cada producto en las tarjetas de venta del historial
+_LINEA_PRODUCTO = "  • %s x%s @ $%.2f = $%.2f"
+
+# Estilo de los TextButton de los modales (Cancelar/Cerrar); se comparte, no se modifica
+_ESTILO_BOTON_TEXTO = ft.ButtonStyle(color=AppColors.PRIMARY)
+
+# Margen de los recuadros resaltados dentro de los modales (resumen, advertencias)
+_MARGEN_RECUADRO = ft.margin.only(top=10, bottom=10)
+
+# Estilo común de los campos de texto de los formularios
+_ESTILO_CAMPO = dict(
+    color=AppColors.PRIMARY,
+    border_color=AppColors.INPUT_BORDER,
+    focused_border_color=AppColors.INPUT_FOCUS,
+)
+
+
+def _campo_texto(label: str, **kwargs) -> ft.TextField:
+    """TextField de formulario con el estilo común"""
+    return ft.TextField(label=label, **_ESTILO_CAMPO, **kwargs)
+
+
+def _texto_o_none(campo: ft.TextField) -> Optional[str]:
+    """Valor del campo sin espacios en los bordes, o None si quedó vacío"""
+    return (campo.value or "").strip() or None
+
+
+def _fmt_fecha_hora(d: datetime) -> str:
+    """dd/mm/aaaa hh:mm sin pasar por strftime (que reinterpreta el formato en cada llamada)"""
+    return "%02d/%02d/%04d %02d:%02d" % (d.day, d.month, d.year, d.hour, d.minute)
+
+
+def _fmt_fecha_corta(d: datetime) -> str:
+    """dd/mm/aa sin pasar por strftime"""
+    return "%02d/%02d/%02d" % (d.day, d.month, d.year % 100)
+
+
+def _resumen_de(cliente: Cliente, deuda: float) -> ClienteResumen:
+    """Datos de listado de un cliente completo, con la deuda real dada"""
+    return ClienteResumen(
+        cliente.id, cliente.nombre, cliente.telefono, cliente.direccion, cliente.limite_credito, deuda
+    )
+
+
+def _trigramas(texto: str) -> Set[str]:
+    """Grupos de 3 caracteres seguidos del texto (vacío si tiene menos de 3)"""
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
 
 class ClientesPage:
     """Página de gestión de clientes"""
+
+    # Tarjetas que se crean por bloque y distancia al final (px) que dispara el siguiente
+    TAM_BLOQUE = 40
+    MARGEN_SCROLL = 300
+
+    # Clientes cargados a partir de los cuales ya se muestra la lista
+    PRIMER_LOTE = 200
+
+    # Segundos sin tipear antes de filtrar la búsqueda
+    DEMORA_BUSQUEDA = 0.15
+
+    # Segundos sin cambios (crear/editar/eliminar) antes de recargar la lista
+    DEMORA_RECARGA = 0.15
     
     def __init__(self, state, api, page):
         self.state = state
@@ -40,15 +108,75 @@ class ClientesPage:
             on_change=self._on_filter_change,
         )
         
-        self.clientes_list = ft.Column(
+        # ListView: Flutter solo dibuja las tarjetas visibles, y desde Python
+        # se van agregando de a bloques a medida que se acerca el final
+        self.clientes_list = ft.ListView(
             spacing=10,
-            scroll=ft.ScrollMode.AUTO,
+            expand=True,
+            on_scroll_interval=100,
+            on_scroll=self._on_scroll_lista,
         )
         
         self.loading = ft.ProgressRing(visible=False)
         
         # Lista completa de clientes (para filtrar)
-        self.todos_clientes: List[Cliente] = []
+        self.todos_clientes: List[ClienteResumen] = []
+        self._indice_busqueda: List[Tuple[str, ClienteResumen]] = []
+        self._indice_con_deuda: List[Tuple[str, ClienteResumen]] = []
+
+        # Trigrama -> posiciones en _indice_busqueda, y posiciones con deuda.
+        # Se arman al terminar la carga; mientras tanto (None) se busca recorriendo todo
+        self._indice_trigramas: Optional[Dict[str, Set[int]]] = None
+        self._posiciones_con_deuda: Set[int] = set()
+
+        # Tarjetas ya creadas por id de cliente: al cambiar el filtro se reutilizan
+        # (y Flet solo envía las que entran o salen). Se vacía al recargar clientes.
+        self._cards: Dict[int, ft.Card] = {}
+
+        # Clientes completos (detalle/edición) ya traídos de la BD, por id.
+        # Se vacía en cada recarga de la lista, que es lo que sigue a toda modificación
+        self._clientes_completos: Dict[int, Cliente] = {}
+
+        # Sesiones de BD de la página: una por hilo mientras dura cada operación.
+        # Las operaciones corren en hilos de trabajo (run_thread, to_thread, handlers
+        # sync), así que cada una la descarta al terminar (ver _db)
+        self._session = get_scoped_session()
+
+        # Diálogo de impresión de liquidación (se crea la primera vez que se usa)
+        # y los datos de la liquidación que está mostrando
+        self._modal_imprimir_liq: Optional[ft.AlertDialog] = None
+        self._liquidacion_pendiente = None
+
+        # Confirmaciones que se reutilizan entre aperturas (ver _abrir_modal)
+        self._modal_sincronizar: Optional[ft.AlertDialog] = None
+        self._modal_eliminar_venta: Optional[ft.AlertDialog] = None
+        self._venta_a_eliminar = None
+
+        # SnackBar de avisos, compartida por todos los mensajes (ver _mostrar_mensaje)
+        self._snack_texto = ft.Text()
+        self._snackbar = ft.SnackBar(content=self._snack_texto)
+
+        # Bloque de _updates_agrupados abierto en cada hilo: mientras existe, su
+        # lista "pendientes" junta los modales cerrados a quitar del overlay al
+        # terminar. Los demás hilos (carga de clientes, timers) no se ven afectados
+        self._agrupado = threading.local()
+
+        # Controles que esta página agregó al overlay y siguen ahí: dispose()
+        # los saca todos al navegar a otra (ver _agregar_al_overlay)
+        self._overlay_propio: List[ft.Control] = []
+
+        # Número de la última recarga pedida (las anteriores dejan de cargar)
+        self._carga_actual = 0
+
+        # Timer de la búsqueda en curso (se reinicia con cada tecla)
+        self._search_timer: Optional[threading.Timer] = None
+
+        # Timer de la recarga pedida tras una modificación (se reinicia con cada una)
+        self._recarga_timer: Optional[threading.Timer] = None
+
+        # Clientes que pasan los filtros y cuántas tarjetas de ellos ya se crearon
+        self._clientes_visibles: List[ClienteResumen] = []
+        self._cards_creadas = 0
     
     def build(self):
         """Construye la interfaz de la página"""
@@ -112,36 +240,136 @@ class ClientesPage:
         
         return self.container
     
+    def dispose(self):
+        """
+        Libera los recursos de la página al navegar a otra: cancela los timers,
+        descarta la sesión de BD de este hilo (las de los hilos de trabajo ya se
+        descartan al terminar cada operación, ver _db) y saca del overlay todos los
+        controles que agregó (modales, SnackBar)
+        """
+        if self._search_timer is not None:
+            self._search_timer.cancel()
+        if self._recarga_timer is not None:
+            self._recarga_timer.cancel()
+        self._session.remove()
+        for control in self._overlay_propio:
+            if control in self.page.overlay:
+                self.page.overlay.remove(control)
+        self._overlay_propio.clear()
+
     def _cargar_clientes(self, e):
-        """Carga la lista de clientes desde la base de datos"""
+        """Carga la lista de clientes desde la base de datos (en un hilo aparte)"""
+        self._clientes_completos.clear()
         self.loading.visible = True
-        self.page.update()
+        self._actualizar()
 
-        try:
-            session = get_session_context()
-
-            # Obtener clientes
-            self.todos_clientes = ClienteRepository.listar_activos(session)
+        # La consulta corre fuera del hilo del evento para que la UI (y el
+        # ProgressRing) sigan respondiendo; si se pide otra recarga, esta se abandona
+        self._carga_actual += 1
+        self.page.run_thread(self._cargar_clientes_worker, self._carga_actual)
 
-            # Sincronizar deuda de cada cliente con la realidad
-            for cliente in self.todos_clientes:
-                deuda_real = ClienteRepository.calcular_deuda_real(session, cliente.id)
-                # Actualizar en memoria para mostrar correctamente
-                cliente.deuda_total = deuda_real
-
-            session.close()
+    def _cargar_clientes_worker(self, carga: int):
+        """Hace la consulta de _cargar_clientes y va mostrando los resultados"""
+        try:
+            with self._db() as session:
+                trigramas, posiciones_con_deuda = self._reiniciar_indices()
+                self._cards.clear()
+
+                # Obtener clientes (solo los datos de la tarjeta, con la deuda real ya calculada).
+                # Llegan por lotes: el primero se muestra sin esperar al resto
+                for cliente in ClienteRepository.iterar_activos_resumen(session):
+                    if carga != self._carga_actual:
+                        break
+                    self._indexar_cliente(cliente, trigramas, posiciones_con_deuda)
+                    if len(self.todos_clientes) == self.PRIMER_LOTE:
+                        self._aplicar_filtros()
 
-            self._aplicar_filtros()
+            if carga == self._carga_actual:
+                self._posiciones_con_deuda = posiciones_con_deuda
+                self._indice_trigramas = trigramas
+                self._aplicar_filtros()
 
         except Exception as error:
             self._mostrar_error(f"Error al cargar clientes: {error}")
         finally:
-            self.loading.visible = False
-            self.page.update()
+            if carga == self._carga_actual:
+                self.loading.visible = False
+                self._actualizar()
     
-    def _on_search_change(self, e):
-        """Filtra la lista cuando cambia el texto de búsqueda"""
+    def _reiniciar_indices(self) -> Tuple[Dict[str, Set[int]], Set[int]]:
+        """
+        Vacía la lista y los índices para filtrar sin recalcular en cada tecla (nombre
+        en minúsculas junto a cada cliente, y el subconjunto de los que tienen deuda).
+        Devuelve el índice de trigramas y las posiciones con deuda a llenar con
+        _indexar_cliente, que se publican al terminar
+        """
+        self.todos_clientes = []
+        self._indice_busqueda = []
+        self._indice_con_deuda = []
+        self._indice_trigramas = None
+        return defaultdict(set), set()
+
+    def _indexar_cliente(self, cliente: ClienteResumen, trigramas: Dict[str, Set[int]], posiciones_con_deuda: Set[int]):
+        """Agrega un cliente al final de la lista y de los índices de búsqueda"""
+        self.todos_clientes.append(cliente)
+        nombre_lc = cliente.nombre.lower()
+        entrada = (nombre_lc, cliente)
+        posicion = len(self._indice_busqueda)
+        self._indice_busqueda.append(entrada)
+        for trigrama in _trigramas(nombre_lc):
+            trigramas[trigrama].add(posicion)
+        if cliente.tiene_deuda():
+            self._indice_con_deuda.append(entrada)
+            posiciones_con_deuda.add(posicion)
+
+    def _reflejar_cambio_cliente(self, cliente_id: int, resumen: Optional[ClienteResumen] = None):
+        """
+        Refleja en la lista un cliente creado o editado (resumen con sus datos nuevos)
+        o eliminado (resumen None) sin volver a consultar la BD: los índices se rearman
+        en memoria y solo se vuelve a crear la tarjeta de ese cliente
+        """
+        self._clientes_completos.pop(cliente_id, None)
+        if self._indice_trigramas is None:
+            # Hay una carga en curso: recargar cuando termine la ráfaga de cambios
+            self._programar_recarga()
+            return
+
+        clientes = [c for c in self.todos_clientes if c.id != cliente_id]
+        if resumen is not None:
+            bisect.insort(clientes, resumen, key=lambda c: c.nombre.lower())
+        self._cards.pop(cliente_id, None)
+
+        trigramas, posiciones_con_deuda = self._reiniciar_indices()
+        for cliente in clientes:
+            self._indexar_cliente(cliente, trigramas, posiciones_con_deuda)
+        self._posiciones_con_deuda = posiciones_con_deuda
+        self._indice_trigramas = trigramas
         self._aplicar_filtros()
+
+    def _programar_recarga(self):
+        """
+        Recarga la lista cuando pasa DEMORA_RECARGA sin otra modificación: varios
+        guardados seguidos terminan en una sola consulta y un solo redibujado
+        """
+        # Los datos ya cambiaron: el detalle no puede esperar a la recarga
+        self._clientes_completos.clear()
+        if self._recarga_timer is not None:
+            self._recarga_timer.cancel()
+        self._recarga_timer = threading.Timer(
+            self.DEMORA_RECARGA, lambda: self.page.run_thread(self._cargar_clientes, None)
+        )
+        self._recarga_timer.daemon = True
+        self._recarga_timer.start()
+
+    def _on_search_change(self, e):
+        """Filtra la lista cuando cambia el texto de búsqueda (espera a que se deje de tipear)"""
+        if self._search_timer is not None:
+            self._search_timer.cancel()
+        self._search_timer = threading.Timer(
+            self.DEMORA_BUSQUEDA, lambda: self.page.run_thread(self._aplicar_filtros)
+        )
+        self._search_timer.daemon = True
+        self._search_timer.start()
     
     def _on_filter_change(self, e):
         """Filtra la lista cuando cambia el checkbox de deuda"""
@@ -151,28 +379,58 @@ class ClientesPage:
         """Aplica todos los filtros activos"""
         texto_busqueda = self.search_field.value.lower().strip() if self.search_field.value else ""
         solo_con_deuda = self.filter_deuda_checkbox.value
+
+        # Sin filtros se muestra la lista completa tal cual (sin copiarla)
+        if not texto_busqueda and not solo_con_deuda:
+            self._actualizar_lista(self.todos_clientes)
+            return
+
+        # Búsqueda de 3+ letras: solo se revisan los clientes que tienen todos sus trigramas
+        trigramas_busqueda = _trigramas(texto_busqueda)
+        if trigramas_busqueda and self._indice_trigramas is not None:
+            self._actualizar_lista(self._filtrar_por_trigramas(texto_busqueda, trigramas_busqueda, solo_con_deuda))
+            return
+
+        # Filtrar por deuda (subconjunto precalculado al cargar)
+        indice = self._indice_con_deuda if solo_con_deuda else self._indice_busqueda
         
-        # Filtrar por nombre
-        clientes_filtrados = self.todos_clientes
-        
+        # Filtrar por nombre (ya en minúsculas)
         if texto_busqueda:
-            clientes_filtrados = [
-                c for c in clientes_filtrados
-                if texto_busqueda in c.nombre.lower()
-            ]
-        
-        # Filtrar por deuda
-        if solo_con_deuda:
-            clientes_filtrados = [
-                c for c in clientes_filtrados
-                if c.tiene_deuda()
-            ]
+            clientes_filtrados = [c for nombre_lc, c in indice if texto_busqueda in nombre_lc]
+        else:
+            clientes_filtrados = [c for _, c in indice]
         
         self._actualizar_lista(clientes_filtrados)
     
-    def _actualizar_lista(self, clientes: List[Cliente]):
+    def _filtrar_por_trigramas(self, texto_busqueda: str, trigramas_busqueda: Set[str], solo_con_deuda: bool) -> List[ClienteResumen]:
+        """Clientes cuyo nombre contiene el texto, usando el índice de trigramas como prefiltro"""
+        indice_trigramas = self._indice_trigramas
+        candidatos = None
+        # Empezar por el trigrama menos frecuente deja el conjunto chico desde el principio
+        for trigrama in sorted(trigramas_busqueda, key=lambda t: len(indice_trigramas.get(t, ()))):
+            posiciones = indice_trigramas.get(trigrama)
+            if not posiciones:
+                return []
+            candidatos = set(posiciones) if candidatos is None else candidatos & posiciones
+            if not candidatos:
+                return []
+
+        if solo_con_deuda:
+            candidatos &= self._posiciones_con_deuda
+
+        # Los trigramas pueden aparecer sueltos: confirmar la subcadena, en orden alfabético
+        indice = self._indice_busqueda
+        return [
+            indice[posicion][1]
+            for posicion in sorted(candidatos)
+            if texto_busqueda in indice[posicion][0]
+        ]
+
+    def _actualizar_lista(self, clientes: List[ClienteResumen]):
         """Actualiza la lista visual de clientes"""
         self.clientes_list.controls.clear()
+        self._clientes_visibles = clientes
+        self._cards_creadas = 0
         
         if not clientes:
             self.clientes_list.controls.append(
@@ -188,14 +446,35 @@ class ClientesPage:
                 )
             )
         else:
-            for cliente in clientes:
-                self.clientes_list.controls.append(
-                    self._crear_card_cliente(cliente)
-                )
+            self._agregar_bloque_cards()
         
-        self.page.update()
+        self._actualizar()
+
+    def _agregar_bloque_cards(self) -> bool:
+        """Crea las tarjetas del siguiente bloque de clientes. Devuelve False si ya no quedaban"""
+        inicio = self._cards_creadas
+        bloque = self._clientes_visibles[inicio:inicio + self.TAM_BLOQUE]
+        if not bloque:
+            return False
+        self.clientes_list.controls.extend(self._obtener_card_cliente(c) for c in bloque)
+        self._cards_creadas = inicio + len(bloque)
+        return True
+
+    def _obtener_card_cliente(self, cliente: ClienteResumen) -> ft.Card:
+        """Devuelve la tarjeta ya creada del cliente, o la crea si todavía no existe"""
+        card = self._cards.get(cliente.id)
+        if card is None:
+            card = self._cards[cliente.id] = self._crear_card_cliente(cliente)
+        return card
+
+    def _on_scroll_lista(self, e: ft.OnScrollEvent):
+        """Al acercarse al final de la lista agrega el siguiente bloque de tarjetas"""
+        if e.max_scroll_extent is None or e.pixels is None:
+            return
+        if e.pixels >= e.max_scroll_extent - self.MARGEN_SCROLL and self._agregar_bloque_cards():
+            self.clientes_list.update()
     
-    def _crear_card_cliente(self, cliente: Cliente) -> ft.Card:
+    def _crear_card_cliente(self, cliente: ClienteResumen) -> ft.Card:
         """Crea una tarjeta para mostrar un cliente"""
         
         # Indicador de deuda
@@ -354,28 +633,28 @@ class ClientesPage:
                 ),
             ], tight=True, spacing=10),
             actions=[
-                ft.TextButton("Cancelar", style=ft.ButtonStyle(color=AppColors.PRIMARY), on_click=lambda e: self._cerrar_modal(modal)),
+                ft.TextButton("Cancelar", style=_ESTILO_BOTON_TEXTO, on_click=lambda e: self._cerrar_modal(modal)),
                 ft.ElevatedButton(
                     "Pago Parcial",
                     icon=ft.Icons.PAYMENTS_OUTLINED,
                     bgcolor=ft.Colors.BLUE_600,
                     color=ft.Colors.WHITE,
-                    on_click=lambda e: [self._cerrar_modal(modal), self._realizar_pago_parcial(cliente)],
+                    on_click=self._agrupar_updates(lambda e: [self._cerrar_modal(modal), self._realizar_pago_parcial(cliente)]),
                 ),
                 ft.ElevatedButton(
                     "Liquidar Total",
                     icon=ft.Icons.PAID,
                     bgcolor=ft.Colors.GREEN_600,
                     color=ft.Colors.WHITE,
-                    on_click=lambda e: [self._cerrar_modal(modal), self._confirmar_liquidacion_deuda(cliente)],
+                    on_click=self._agrupar_updates(lambda e: [self._cerrar_modal(modal), self._confirmar_liquidacion_deuda(cliente)]),
                 ),
             ],
             actions_alignment=ft.MainAxisAlignment.END,
         )
 
-        self.page.overlay.append(modal)
+        self._agregar_al_overlay(modal)
         modal.open = True
-        self.page.update()
+        self._actualizar()
 
     # ============================================
     # MODAL: PAGO PARCIAL
@@ -384,16 +663,13 @@ class ClientesPage:
         """Permite realizar un abono parcial a la deuda del cliente"""
 
         # Campo para ingresar el monto
-        monto_field = ft.TextField(
-            label="Monto a abonar",
+        monto_field = _campo_texto(
+            "Monto a abonar",
             hint_text="0.00",
             prefix_text="$",
             keyboard_type=ft.KeyboardType.NUMBER,
             autofocus=True,
             width=200,
-            color=AppColors.PRIMARY,
-            border_color=AppColors.INPUT_BORDER,
-            focused_border_color=AppColors.INPUT_FOCUS,
         )
 
         # Mensaje de validación
@@ -407,61 +683,53 @@ class ClientesPage:
                 if monto <= 0:
                     mensaje_error.value = "El monto debe ser mayor a 0"
                     mensaje_error.visible = True
-                    self.page.update()
+                    self._actualizar()
                     return
 
                 if monto > cliente.deuda_total:
                     mensaje_error.value = f"El monto no puede ser mayor a la deuda (${cliente.deuda_total:.2f})"
                     mensaje_error.visible = True
-                    self.page.update()
+                    self._actualizar()
                     return
 
                 # Procesar el abono
-                session = get_session_context()
-
-                # Obtener todas las ventas fiadas pendientes del cliente
-                ventas_pendientes = VentaRepository.listar_fiados_cliente(session, cliente.id)
-
-                if not ventas_pendientes:
-                    self._mostrar_info("El cliente no tiene ventas fiadas pendientes")
-                    modal.open = False
-                    self.page.update()
-                    session.close()
-                    return
-
-                # Distribuir el abono entre las ventas pendientes (FIFO - primero las más antiguas)
-                monto_restante = monto
-                ventas_abonadas = []
+                with self._db() as session:
+                    # Obtener todas las ventas fiadas pendientes del cliente
+                    ventas_pendientes = VentaRepository.listar_fiados_cliente(session, cliente.id)
 
-                for venta in ventas_pendientes:
-                    if monto_restante <= 0:
-                        break
+                    if not ventas_pendientes:
+                        self._mostrar_info("El cliente no tiene ventas fiadas pendientes")
+                        self._cerrar_modal(modal)
+                        return
 
-                    # Calcular cuánto abonar a esta venta
-                    monto_a_abonar = min(monto_restante, venta.resto)
+                    # Distribuir el abono entre las ventas pendientes (FIFO - primero las más antiguas)
+                    monto_restante = monto
+                    abonos = []
 
-                    if monto_a_abonar > 0:
-                        # Registrar el abono
-                        VentaRepository.registrar_abono(session, venta.id, monto_a_abonar)
+                    for venta in ventas_pendientes:
+                        if monto_restante <= 0:
+                            break
 
-                        # Obtener la venta actualizada con todos los productos
-                        venta_actualizada = VentaRepository.obtener_por_id(session, venta.id)
+                        # Calcular cuánto abonar a esta venta
+                        monto_a_abonar = min(monto_restante, venta.resto)
 
-                        ventas_abonadas.append({
-                            'venta': venta_actualizada,
-                            'monto': monto_a_abonar
-                        })
-                        monto_restante -= monto_a_abonar
+                        if monto_a_abonar > 0:
+                            abonos.append((venta.id, monto_a_abonar))
+                            monto_restante -= monto_a_abonar
 
-                # Obtener cliente actualizado
-                cliente_actualizado = ClienteRepository.obtener_por_id(session, cliente.id)
-                nuevo_saldo = cliente_actualizado.deuda_total
+                    # Registrar todos los abonos juntos (devuelve las ventas actualizadas)
+                    ventas_actualizadas = VentaRepository.registrar_abonos_bulk(session, abonos)
+                    ventas_abonadas = [
+                        {'venta': venta_actualizada, 'monto': monto_abonado}
+                        for venta_actualizada, (_, monto_abonado) in zip(ventas_actualizadas, abonos)
+                    ]
 
-                session.close()
+                    # Obtener cliente actualizado
+                    cliente_actualizado = ClienteRepository.obtener_por_id(session, cliente.id)
+                    nuevo_saldo = cliente_actualizado.deuda_total
 
                 # Cerrar modal
-                modal.open = False
-                self.page.update()
+                self._cerrar_modal(modal)
 
                 # Mostrar diálogo para imprimir comprobante
                 self._mostrar_dialogo_imprimir_liquidacion(
@@ -477,7 +745,7 @@ class ClientesPage:
             except ValueError:
                 mensaje_error.value = "Ingrese un monto válido"
                 mensaje_error.visible = True
-                self.page.update()
+                self._actualizar()
             except Exception as error:
                 self._mostrar_error(f"Error al procesar abono: {error}")
 
@@ -511,7 +779,7 @@ class ClientesPage:
                     bgcolor=ft.Colors.BLUE_50,
                     padding=15,
                     border_radius=8,
-                    margin=ft.margin.only(top=10, bottom=10),
+                    margin=_MARGEN_RECUADRO,
                 ),
                 monto_field,
                 mensaje_error,
@@ -523,21 +791,21 @@ class ClientesPage:
                 ),
             ], tight=True, spacing=10),
             actions=[
-                ft.TextButton("Cancelar", style=ft.ButtonStyle(color=AppColors.PRIMARY), on_click=lambda e: self._cerrar_modal(modal)),
+                ft.TextButton("Cancelar", style=_ESTILO_BOTON_TEXTO, on_click=lambda e: self._cerrar_modal(modal)),
                 ft.ElevatedButton(
                     "Procesar Abono",
                     bgcolor=ft.Colors.GREEN_600,
                     color=ft.Colors.WHITE,
                     icon=ft.Icons.CHECK_CIRCLE,
-                    on_click=procesar_abono,
+                    on_click=self._agrupar_updates(procesar_abono),
                 ),
             ],
             actions_alignment=ft.MainAxisAlignment.END,
         )
 
-        self.page.overlay.append(modal)
+        self._agregar_al_overlay(modal)
         modal.open = True
-        self.page.update()
+        self._actualizar()
 
     # ============================================
     # MODAL: LIQUIDAR DEUDA
@@ -547,47 +815,34 @@ class ClientesPage:
         
         def liquidar(e):
             try:
-                session = get_session_context()
-                
-                # Obtener todas las ventas fiadas pendientes del cliente
-                ventas_pendientes = VentaRepository.listar_fiados_cliente(session, cliente.id)
-                
-                if not ventas_pendientes:
-                    self._mostrar_info("El cliente no tiene ventas fiadas pendientes")
-                    modal.open = False
-                    self.page.update()
-                    return
-                
-                # Calcular saldo anterior
-                saldo_anterior = cliente.deuda_total
+                with self._db() as session:
+                    # Obtener todas las ventas fiadas pendientes del cliente
+                    ventas_pendientes = VentaRepository.listar_fiados_cliente(session, cliente.id)
 
-                # Liquidar cada venta
-                total_liquidado = 0
-                ventas_abonadas = []
+                    if not ventas_pendientes:
+                        self._mostrar_info("El cliente no tiene ventas fiadas pendientes")
+                        self._cerrar_modal(modal)
+                        return
 
-                for venta in ventas_pendientes:
-                    monto_pendiente = venta.resto
-                    if monto_pendiente > 0:
-                        VentaRepository.registrar_abono(session, venta.id, monto_pendiente)
+                    # Calcular saldo anterior
+                    saldo_anterior = cliente.deuda_total
 
-                        # Obtener la venta actualizada con todos los productos
-                        venta_actualizada = VentaRepository.obtener_por_id(session, venta.id)
+                    # Liquidar cada venta (todos los abonos juntos)
+                    abonos = [(venta.id, venta.resto) for venta in ventas_pendientes if venta.resto > 0]
+                    total_liquidado = sum(monto_pendiente for _, monto_pendiente in abonos)
 
-                        ventas_abonadas.append({
-                            'venta': venta_actualizada,
-                            'monto': monto_pendiente
-                        })
-                        total_liquidado += monto_pendiente
+                    ventas_actualizadas = VentaRepository.registrar_abonos_bulk(session, abonos)
+                    ventas_abonadas = [
+                        {'venta': venta_actualizada, 'monto': monto_pendiente}
+                        for venta_actualizada, (_, monto_pendiente) in zip(ventas_actualizadas, abonos)
+                    ]
 
-                # Actualizar cliente (recargar desde BD para obtener nuevo saldo)
-                cliente_actualizado = ClienteRepository.obtener_por_id(session, cliente.id)
-                nuevo_saldo = cliente_actualizado.deuda_total
-
-                session.close()
+                    # Actualizar cliente (recargar desde BD para obtener nuevo saldo)
+                    cliente_actualizado = ClienteRepository.obtener_por_id(session, cliente.id)
+                    nuevo_saldo = cliente_actualizado.deuda_total
 
                 # Cerrar modal
-                modal.open = False
-                self.page.update()
+                self._cerrar_modal(modal)
 
                 # Mostrar diálogo para imprimir comprobante
                 self._mostrar_dialogo_imprimir_liquidacion(
@@ -634,44 +889,58 @@ class ClientesPage:
                     bgcolor=ft.Colors.AMBER_50,
                     padding=15,
                     border_radius=8,
-                    margin=ft.margin.only(top=10, bottom=10),
+                    margin=_MARGEN_RECUADRO,
                 ),
             ], tight=True, spacing=10),
             actions=[
-                ft.TextButton("Cancelar", style=ft.ButtonStyle(color=AppColors.PRIMARY), on_click=lambda e: self._cerrar_modal(modal)),
+                ft.TextButton("Cancelar", style=_ESTILO_BOTON_TEXTO, on_click=lambda e: self._cerrar_modal(modal)),
                 ft.ElevatedButton(
                     "Liquidar Deudas",
                     bgcolor=ft.Colors.GREEN_600,
                     color=ft.Colors.WHITE,
                     icon=ft.Icons.CHECK_CIRCLE,
-                    on_click=liquidar,
+                    on_click=self._agrupar_updates(liquidar),
                 ),
             ],
             actions_alignment=ft.MainAxisAlignment.END,
         )
         
-        self.page.overlay.append(modal)
+        self._agregar_al_overlay(modal)
         modal.open = True
-        self.page.update()
+        self._actualizar()
     
     def _mostrar_dialogo_imprimir_liquidacion(self, cliente, abono, nuevo_saldo, ventas_pagadas=None):
         """Muestra diálogo preguntando si desea imprimir comprobante de liquidación"""
 
-        # Referencias a los botones para poder deshabilitarlos
-        btn_imprimir = None
-        btn_no_imprimir = None
+        # El diálogo se arma una sola vez; en cada apertura solo cambian los textos
+        if self._modal_imprimir_liq is None:
+            self._construir_modal_imprimir_liquidacion()
+
+        self._liquidacion_pendiente = (cliente, abono, nuevo_saldo, ventas_pagadas)
+        self._txt_liq_resumen.value = f"Se liquidaron ${abono:.2f} de '{cliente.nombre}'"
+        self._txt_liq_abono.value = f"Abono realizado: ${abono:.2f}"
+        self._txt_liq_saldo.value = f"Nuevo saldo: ${nuevo_saldo:.2f}"
+        self._txt_liq_saldo.color = ft.Colors.GREEN_600 if nuevo_saldo == 0 else ft.Colors.ORANGE_600
+
+        self._modal_imprimir_liq.open = True
+        self._actualizar()
+
+    def _construir_modal_imprimir_liquidacion(self):
+        """Crea (una vez) el diálogo de impresión de liquidación y lo agrega al overlay"""
+        modal = None
         progress_ring = ft.ProgressRing(visible=False, width=20, height=20)
 
-        def imprimir_y_cerrar(e):
+        async def imprimir_y_cerrar(e):
+            cliente, abono, nuevo_saldo, ventas_pagadas = self._liquidacion_pendiente
             try:
                 es_web = getattr(self.page, 'web', False)
 
                 # Cerrar el modal de confirmación primero
                 modal.open = False
-                self.page.update()
+                self._actualizar()
 
                 # Usar método unificado (detecta web/desktop automáticamente)
-                PDFGenerator.imprimir_o_mostrar(
+                await PDFGenerator.imprimir_o_mostrar(
                     self.page,
                     cliente=cliente,
                     abono=abono,
@@ -688,18 +957,23 @@ class ClientesPage:
                 self._mostrar_error(f"Error al generar comprobante: {error}")
         
         def no_imprimir(e):
+            cliente = self._liquidacion_pendiente[0]
             self._mostrar_exito(
                 f"Deuda de '{cliente.nombre}' liquidada exitosamente"
             )
             modal.open = False
-            self.page.update()
+            self._actualizar()
+
+        # Textos que cambian en cada apertura
+        self._txt_liq_resumen = ft.Text(size=14, color=AppColors.PRIMARY)
+        self._txt_liq_abono = ft.Text(size=16, weight=ft.FontWeight.BOLD, color=ft.Colors.GREEN_600)
+        self._txt_liq_saldo = ft.Text(size=16, weight=ft.FontWeight.BOLD)
         
-        # Crear botones con referencias
         btn_no_imprimir = ft.TextButton(
             "No, gracias",
             icon=ft.Icons.CANCEL,
-            style=ft.ButtonStyle(color=AppColors.PRIMARY),
-            on_click=no_imprimir,
+            style=_ESTILO_BOTON_TEXTO,
+            on_click=self._agrupar_updates(no_imprimir),
         )
 
         btn_imprimir = ft.ElevatedButton(
@@ -720,30 +994,16 @@ class ClientesPage:
             ], spacing=10),
             content=ft.Container(
                 content=ft.Column([
-                    ft.Text(
-                        f"Se liquidaron ${abono:.2f} de '{cliente.nombre}'",
-                        size=14,
-                        color=AppColors.PRIMARY,
-                    ),
+                    self._txt_liq_resumen,
                     ft.Container(
                         content=ft.Column([
-                            ft.Text(
-                                f"Abono realizado: ${abono:.2f}",
-                                size=16,
-                                weight=ft.FontWeight.BOLD,
-                                color=ft.Colors.GREEN_600,
-                            ),
-                            ft.Text(
-                                f"Nuevo saldo: ${nuevo_saldo:.2f}",
-                                size=16,
-                                weight=ft.FontWeight.BOLD,
-                                color=ft.Colors.GREEN_600 if nuevo_saldo == 0 else ft.Colors.ORANGE_600,
-                            ),
+                            self._txt_liq_abono,
+                            self._txt_liq_saldo,
                         ], spacing=5),
                         bgcolor=ft.Colors.GREEN_50,
                         padding=10,
                         border_radius=8,
-                        margin=ft.margin.only(top=10, bottom=10),
+                        margin=_MARGEN_RECUADRO,
                     ),
                     ft.Divider(),
                     ft.Text(
@@ -762,9 +1022,9 @@ class ClientesPage:
             actions_alignment=ft.MainAxisAlignment.END,
         )
         
-        self.page.overlay.append(modal)
-        modal.open = True
-        self.page.update()
+        self._modal_imprimir_liq = modal
+        self._agregar_al_overlay(modal)
+
     # ============================================
     # MODAL: NUEVO CLIENTE
     # ============================================
@@ -772,65 +1032,47 @@ class ClientesPage:
         """Abre el modal para crear un nuevo cliente"""
         
         # Campos del formulario
-        nombre_field = ft.TextField(
-            label="Nombre *",
+        nombre_field = _campo_texto(
+            "Nombre *",
             hint_text="Nombre completo del cliente",
             autofocus=True,
-            color=AppColors.PRIMARY,
-            border_color=AppColors.INPUT_BORDER,
-            focused_border_color=AppColors.INPUT_FOCUS,
         )
         
-        telefono_field = ft.TextField(
-            label="Teléfono",
+        telefono_field = _campo_texto(
+            "Teléfono",
             hint_text="099123456",
             prefix_icon=ft.Icons.PHONE,
-            color=AppColors.PRIMARY,
-            border_color=AppColors.INPUT_BORDER,
-            focused_border_color=AppColors.INPUT_FOCUS,
         )
         
-        direccion_field = ft.TextField(
-            label="Dirección",
+        direccion_field = _campo_texto(
+            "Dirección",
             hint_text="Av. 18 de Julio 1234",
             prefix_icon=ft.Icons.LOCATION_ON,
-            color=AppColors.PRIMARY,
-            border_color=AppColors.INPUT_BORDER,
-            focused_border_color=AppColors.INPUT_FOCUS,
         )
         
-        email_field = ft.TextField(
-            label="Email",
+        email_field = _campo_texto(
+            "Email",
             hint_text="cliente@ejemplo.com",
             prefix_icon=ft.Icons.EMAIL,
-            color=AppColors.PRIMARY,
-            border_color=AppColors.INPUT_BORDER,
-            focused_border_color=AppColors.INPUT_FOCUS,
         )
         
-        limite_field = ft.TextField(
-            label="Límite de crédito",
+        limite_field = _campo_texto(
+            "Límite de crédito",
             hint_text="0.00",
             value="0",
             prefix_icon=ft.Icons.ATTACH_MONEY,
             keyboard_type=ft.KeyboardType.NUMBER,
-            color=AppColors.PRIMARY,
-            border_color=AppColors.INPUT_BORDER,
-            focused_border_color=AppColors.INPUT_FOCUS,
         )
         
-        notas_field = ft.TextField(
-            label="Notas",
+        notas_field = _campo_texto(
+            "Notas",
             hint_text="Información adicional",
             multiline=True,
             min_lines=2,
             max_lines=4,
-            color=AppColors.PRIMARY,
-            border_color=AppColors.INPUT_BORDER,
-            focused_border_color=AppColors.INPUT_FOCUS,
         )
         
-        def guardar_cliente(e):
+        async def guardar_cliente(e):
             # Validar campos requeridos
             if not nombre_field.value or nombre_field.value.strip() == "":
                 self._mostrar_error("El nombre es obligatorio")
@@ -840,27 +1082,30 @@ class ClientesPage:
                 # Crear cliente
                 nuevo_cliente = Cliente(
                     nombre=nombre_field.value.strip(),
-                    telefono=telefono_field.value.strip() or None,
-                    direccion=direccion_field.value.strip() or None,
-                    email=email_field.value.strip() or None,
-                    limite_credito=float(limite_field.value or 0),
-                    notas=notas_field.value.strip() or None,
+                    telefono=_texto_o_none(telefono_field),
+                    direccion=_texto_o_none(direccion_field),
+                    email=_texto_o_none(email_field),
+                    limite_credito=limite_field.data,
+                    notas=_texto_o_none(notas_field),
                 )
                 
-                # Guardar en BD
-                session = get_session_context()
-                ClienteRepository.crear(session, nuevo_cliente)
-                session.close()
+                # Guardar en BD (fuera del hilo de la UI)
+                await asyncio.to_thread(
+                    self._con_sesion, lambda session: ClienteRepository.crear(session, nuevo_cliente)
+                )
                 
-                # Cerrar modal y recargar lista
-                modal.open = False
-                self.page.update()
-                self._mostrar_exito(f"Cliente '{nuevo_cliente.nombre}' creado exitosamente")
-                self._cargar_clientes(None)
+                # Cerrar modal, avisar y agregar la tarjeta en un solo page.update()
+                with self._updates_agrupados():
+                    self._cerrar_modal(modal)
+                    self._mostrar_exito(f"Cliente '{nuevo_cliente.nombre}' creado exitosamente")
+                    self._reflejar_cambio_cliente(nuevo_cliente.id, _resumen_de(nuevo_cliente, 0.0))
                 
             except Exception as error:
                 self._mostrar_error(f"Error al crear cliente: {error}")
         
+        btn_guardar = ft.ElevatedButton("Guardar", bgcolor=AppColors.PRIMARY, color=ft.Colors.WHITE, on_click=guardar_cliente)
+        self._validar_campo_numerico(limite_field, btn_guardar)
+
         # Crear modal
         modal = ft.AlertDialog(
             modal=True,
@@ -878,15 +1123,15 @@ class ClientesPage:
                 width=500,
             ),
             actions=[
-                ft.TextButton("Cancelar", style=ft.ButtonStyle(color=AppColors.PRIMARY), on_click=lambda e: self._cerrar_modal(modal)),
-                ft.ElevatedButton("Guardar", bgcolor=AppColors.PRIMARY, color=ft.Colors.WHITE, on_click=guardar_cliente),
+                ft.TextButton("Cancelar", style=_ESTILO_BOTON_TEXTO, on_click=lambda e: self._cerrar_modal(modal)),
+                btn_guardar,
             ],
             actions_alignment=ft.MainAxisAlignment.END,
         )
 
-        self.page.overlay.append(modal)
+        self._agregar_al_overlay(modal)
         modal.open = True
-        self.page.update()
+        self._actualizar()
 
     # ============================================
     # MODAL: VER DETALLES
@@ -894,14 +1139,14 @@ class ClientesPage:
     def _ver_cliente(self, cliente: Cliente):
         """Muestra los detalles completos de un cliente"""
         
-        # Recargar datos actuales de la BD
-        session = get_session_context()
-        cliente_actual = ClienteRepository.obtener_por_id(session, cliente.id)
-        session.close()
+        # Datos completos del cliente (de la BD solo si no se trajeron desde la última recarga)
+        cliente_actual = self._obtener_cliente_completo(cliente.id)
         
         if not cliente_actual:
             self._mostrar_error("Cliente no encontrado")
             return
+
+        deuda = cliente_actual.deuda_total
         
         # Crear contenido del modal
         contenido = ft.Column([
@@ -918,9 +1163,9 @@ class ClientesPage:
             self._crear_campo_detalle("Límite de crédito", f"${cliente_actual.limite_credito:.2f}", ft.Icons.CREDIT_CARD),
             self._crear_campo_detalle(
                 "Deuda actual",
-                f"${cliente_actual.deuda_total:.2f}",
+                f"${deuda:.2f}",
                 ft.Icons.ACCOUNT_BALANCE_WALLET,
-                color=AppColors.DANGER if cliente_actual.tiene_deuda() else AppColors.SUCCESS
+                color=AppColors.DANGER if deuda > 0 else AppColors.SUCCESS
             ),
             
             ft.Divider(),
@@ -933,7 +1178,7 @@ class ClientesPage:
             
             # Metadata
             ft.Text("Información del sistema", size=12, color=AppColors.PRIMARY),
-            ft.Text(f"Creado: {cliente_actual.fecha_creacion.strftime('%d/%m/%Y %H:%M')}", size=12, color=AppColors.PRIMARY),
+            ft.Text(f"Creado: {_fmt_fecha_hora(cliente_actual.fecha_creacion)}", size=12, color=AppColors.PRIMARY),
         ], spacing=10, scroll=ft.ScrollMode.AUTO)
         
         modal = ft.AlertDialog(
@@ -945,21 +1190,51 @@ class ClientesPage:
             ]),
             content=ft.Container(content=contenido, width=500, height=400),
             actions=[
-                ft.TextButton("Cerrar", style=ft.ButtonStyle(color=AppColors.PRIMARY), on_click=lambda e: self._cerrar_modal(modal)),
+                ft.TextButton("Cerrar", style=_ESTILO_BOTON_TEXTO, on_click=lambda e: self._cerrar_modal(modal)),
                 ft.ElevatedButton(
                     "Editar",
                     icon=ft.Icons.EDIT,
                     bgcolor=AppColors.PRIMARY,
                     color=ft.Colors.WHITE,
-                    on_click=lambda e: [self._cerrar_modal(modal), self._editar_cliente(cliente_actual)]
+                    on_click=self._agrupar_updates(lambda e: [self._cerrar_modal(modal), self._editar_cliente(cliente_actual)])
                 ),
             ],
             actions_alignment=ft.MainAxisAlignment.END,
         )
 
-        self.page.overlay.append(modal)
+        self._agregar_al_overlay(modal)
         modal.open = True
-        self.page.update()
+        self._actualizar()
+
+    def _validar_campo_numerico(self, campo: ft.TextField, boton: ft.ElevatedButton):
+        """
+        Valida el campo a medida que se escribe: deja el número ya convertido en
+        campo.data (vacío = 0) y deshabilita el botón mientras el valor no es válido
+        """
+        def validar(e=None):
+            try:
+                campo.data = float(campo.value or 0)
+            except ValueError:
+                campo.data = None
+            if campo.data is not None and not math.isfinite(campo.data):
+                campo.data = None  # float() también acepta "nan" e "inf"
+            campo.error_text = "Ingrese un número válido" if campo.data is None else None
+            boton.disabled = campo.data is None
+            if e is not None:
+                self._actualizar()
+
+        campo.on_change = validar
+        validar()
+
+    def _obtener_cliente_completo(self, cliente_id: int) -> Optional[Cliente]:
+        """Cliente completo por id, consultando la BD solo la primera vez desde la última recarga"""
+        cliente = self._clientes_completos.get(cliente_id)
+        if cliente is None:
+            with self._db() as session:
+                cliente = ClienteRepository.obtener_por_id(session, cliente_id)
+            if cliente:
+                self._clientes_completos[cliente_id] = cliente
+        return cliente
 
     def _crear_campo_detalle(self, label: str, valor: str, icono, color=None):
         """Helper para crear un campo de detalle"""
@@ -974,68 +1249,57 @@ class ClientesPage:
     # ============================================
     # MODAL: EDITAR CLIENTE
     # ============================================
-    def _editar_cliente(self, cliente: Cliente):
+    def _editar_cliente(self, cliente: ClienteResumen):
         """Abre el modal para editar un cliente"""
         
+        # La lista solo tiene el resumen: usar el cliente completo
+        cliente = self._obtener_cliente_completo(cliente.id)
+        
+        if not cliente:
+            self._mostrar_error("Cliente no encontrado")
+            return
+        
         # Campos del formulario pre-llenados
-        nombre_field = ft.TextField(
-            label="Nombre *",
+        nombre_field = _campo_texto(
+            "Nombre *",
             value=cliente.nombre,
             autofocus=True,
-            color=AppColors.PRIMARY,
-            border_color=AppColors.INPUT_BORDER,
-            focused_border_color=AppColors.INPUT_FOCUS,
         )
 
-        telefono_field = ft.TextField(
-            label="Teléfono",
+        telefono_field = _campo_texto(
+            "Teléfono",
             value=cliente.telefono or "",
             prefix_icon=ft.Icons.PHONE,
-            color=AppColors.PRIMARY,
-            border_color=AppColors.INPUT_BORDER,
-            focused_border_color=AppColors.INPUT_FOCUS,
         )
 
-        direccion_field = ft.TextField(
-            label="Dirección",
+        direccion_field = _campo_texto(
+            "Dirección",
             value=cliente.direccion or "",
             prefix_icon=ft.Icons.LOCATION_ON,
-            color=AppColors.PRIMARY,
-            border_color=AppColors.INPUT_BORDER,
-            focused_border_color=AppColors.INPUT_FOCUS,
         )
 
-        email_field = ft.TextField(
-            label="Email",
+        email_field = _campo_texto(
+            "Email",
             value=cliente.email or "",
             prefix_icon=ft.Icons.EMAIL,
-            color=AppColors.PRIMARY,
-            border_color=AppColors.INPUT_BORDER,
-            focused_border_color=AppColors.INPUT_FOCUS,
         )
 
-        limite_field = ft.TextField(
-            label="Límite de crédito",
+        limite_field = _campo_texto(
+            "Límite de crédito",
             value=str(cliente.limite_credito),
             prefix_icon=ft.Icons.ATTACH_MONEY,
             keyboard_type=ft.KeyboardType.NUMBER,
-            color=AppColors.PRIMARY,
-            border_color=AppColors.INPUT_BORDER,
-            focused_border_color=AppColors.INPUT_FOCUS,
         )
 
-        notas_field = ft.TextField(
-            label="Notas",
+        notas_field = _campo_texto(
+            "Notas",
             value=cliente.notas or "",
             multiline=True,
             min_lines=2,
             max_lines=4,
-            color=AppColors.PRIMARY,
-            border_color=AppColors.INPUT_BORDER,
-            focused_border_color=AppColors.INPUT_FOCUS,
         )
         
-        def actualizar_cliente(e):
+        async def actualizar_cliente(e):
             if not nombre_field.value or nombre_field.value.strip() == "":
                 self._mostrar_error("El nombre es obligatorio")
                 return
@@ -1043,27 +1307,37 @@ class ClientesPage:
             try:
                 # Actualizar datos del cliente
                 cliente.nombre = nombre_field.value.strip()
-                cliente.telefono = telefono_field.value.strip() or None
-                cliente.direccion = direccion_field.value.strip() or None
-                cliente.email = email_field.value.strip() or None
-                cliente.limite_credito = float(limite_field.value or 0)
-                cliente.notas = notas_field.value.strip() or None
+                cliente.telefono = _texto_o_none(telefono_field)
+                cliente.direccion = _texto_o_none(direccion_field)
+                cliente.email = _texto_o_none(email_field)
+                cliente.limite_credito = limite_field.data
+                cliente.notas = _texto_o_none(notas_field)
                 cliente.fecha_actualizacion = datetime.now()
                 
-                # Guardar en BD
-                session = get_session_context()
-                ClienteRepository.actualizar(session, cliente)
-                session.close()
+                # Guardar en BD (fuera del hilo de la UI)
+                await asyncio.to_thread(
+                    self._con_sesion, lambda session: ClienteRepository.actualizar(session, cliente)
+                )
                 
-                # Cerrar modal y recargar lista
-                modal.open = False
-                self.page.update()
-                self._mostrar_exito(f"Cliente '{cliente.nombre}' actualizado exitosamente")
-                self._cargar_clientes(None)
+                # La deuda real no cambia al editar: se conserva la del listado
+                deuda_listado = next(
+                    (c.deuda_total for c in self.todos_clientes if c.id == cliente.id), cliente.deuda_total
+                )
+
+                # Cerrar modal, avisar y rehacer su tarjeta en un solo page.update()
+                with self._updates_agrupados():
+                    self._cerrar_modal(modal)
+                    self._mostrar_exito(f"Cliente '{cliente.nombre}' actualizado exitosamente")
+                    self._reflejar_cambio_cliente(cliente.id, _resumen_de(cliente, deuda_listado))
                 
             except Exception as error:
+                # El objeto quedó con los cambios sin guardar: no reutilizarlo
+                self._clientes_completos.pop(cliente.id, None)
                 self._mostrar_error(f"Error al actualizar cliente: {error}")
         
+        btn_actualizar = ft.ElevatedButton("Actualizar", bgcolor=AppColors.PRIMARY, color=ft.Colors.WHITE, on_click=actualizar_cliente)
+        self._validar_campo_numerico(limite_field, btn_actualizar)
+
         modal = ft.AlertDialog(
             modal=True,
             bgcolor=AppColors.MODAL_BG,
@@ -1080,48 +1354,51 @@ class ClientesPage:
                 width=500,
             ),
             actions=[
-                ft.TextButton("Cancelar", style=ft.ButtonStyle(color=AppColors.PRIMARY), on_click=lambda e: self._cerrar_modal(modal)),
-                ft.ElevatedButton("Actualizar", bgcolor=AppColors.PRIMARY, color=ft.Colors.WHITE, on_click=actualizar_cliente),
+                ft.TextButton("Cancelar", style=_ESTILO_BOTON_TEXTO, on_click=lambda e: self._cerrar_modal(modal)),
+                btn_actualizar,
             ],
             actions_alignment=ft.MainAxisAlignment.END,
         )
         
-        self.page.overlay.append(modal)
+        self._agregar_al_overlay(modal)
         modal.open = True
-        self.page.update()
+        self._actualizar()
     
     # ============================================
     # MODAL: CONFIRMAR ELIMINACIÓN
     # ============================================
-    def _confirmar_eliminacion(self, cliente: Cliente):
+    def _confirmar_eliminacion(self, cliente: ClienteResumen):
         """Muestra un diálogo de confirmación antes de eliminar"""
         
-        def eliminar(e):
+        def desactivar(session):
+            # Desactivar cliente (eliminación lógica) sobre el registro completo
+            cliente_bd = ClienteRepository.obtener_por_id(session, cliente.id)
+            if cliente_bd:
+                cliente_bd.activo = False
+                ClienteRepository.actualizar(session, cliente_bd)
+
+        async def eliminar(e):
             try:
-                # Desactivar cliente (eliminación lógica)
-                session = get_session_context()
-                cliente.activo = False
-                cliente.fecha_actualizacion = datetime.now()
-                ClienteRepository.actualizar(session, cliente)
-                session.close()
+                await asyncio.to_thread(self._con_sesion, desactivar)
                 
-                # Cerrar modal y recargar lista
-                modal.open = False
-                self.page.update()
-                self._mostrar_exito(f"Cliente '{cliente.nombre}' eliminado exitosamente")
-                self._cargar_clientes(None)
+                # Cerrar modal, avisar y quitar la tarjeta en un solo page.update()
+                with self._updates_agrupados():
+                    self._cerrar_modal(modal)
+                    self._mostrar_exito(f"Cliente '{cliente.nombre}' eliminado exitosamente")
+                    self._reflejar_cambio_cliente(cliente.id)
                 
             except Exception as error:
                 self._mostrar_error(f"Error al eliminar cliente: {error}")
         
         # Advertencia si tiene deuda
         advertencia = None
-        if cliente.tiene_deuda():
+        deuda = cliente.deuda_total
+        if deuda > 0:
             advertencia = ft.Container(
                 content=ft.Row([
                     ft.Icon(ft.Icons.WARNING, color=ft.Colors.ORANGE_400),
                     ft.Text(
-                        f"⚠️ Este cliente tiene una deuda de ${cliente.deuda_total:.2f}",
+                        f"⚠️ Este cliente tiene una deuda de ${deuda:.2f}",
                         color=ft.Colors.ORANGE_700,
                         weight=ft.FontWeight.BOLD,
                     ),
@@ -1153,7 +1430,7 @@ class ClientesPage:
                 advertencia if advertencia else ft.Container(),
             ], tight=True, spacing=10),
             actions=[
-                ft.TextButton("Cancelar", style=ft.ButtonStyle(color=AppColors.PRIMARY), on_click=lambda e: self._cerrar_modal(modal)),
+                ft.TextButton("Cancelar", style=_ESTILO_BOTON_TEXTO, on_click=lambda e: self._cerrar_modal(modal)),
                 ft.ElevatedButton(
                     "Eliminar",
                     bgcolor=AppColors.DANGER,
@@ -1164,9 +1441,9 @@ class ClientesPage:
             actions_alignment=ft.MainAxisAlignment.END,
         )
         
-        self.page.overlay.append(modal)
+        self._agregar_al_overlay(modal)
         modal.open = True
-        self.page.update()
+        self._actualizar()
 
     # ============================================
     # MODAL: VER HISTORIAL
@@ -1174,15 +1451,18 @@ class ClientesPage:
     def _ver_historial_cliente(self, cliente: Cliente):
         """Muestra el historial de compras y pagos del cliente"""
 
-        # Cargar todas las ventas del cliente
-        session = get_session_context()
-        ventas = VentaRepository.listar_por_cliente(session, cliente.id)
-        session.close()
+        # Cargar todas las ventas del cliente y los abonos de las fiadas (una consulta para todas)
+        with self._db() as session:
+            ventas = VentaRepository.listar_por_cliente(session, cliente.id)
+            abonos_por_venta = AbonoRepository.listar_por_ventas(
+                session, [venta.id for venta in ventas if venta.es_fiado]
+            )
 
-        # Crear lista de ventas
-        ventas_list = ft.Column(
+        # Crear lista de ventas (las tarjetas se crean por bloques al hacer scroll)
+        ventas_list = ft.ListView(
             spacing=10,
-            scroll=ft.ScrollMode.AUTO,
+            expand=True,
+            on_scroll_interval=100,
         )
 
         if not ventas:
@@ -1199,10 +1479,11 @@ class ClientesPage:
                 )
             )
         else:
-            for venta in ventas:
-                ventas_list.controls.append(
-                    self._crear_card_venta(venta, cliente)
-                )
+            self._llenar_por_bloques(
+                ventas_list,
+                ventas,
+                lambda venta: self._crear_card_venta(venta, cliente, abonos_por_venta.get(venta.id, [])),
+            )
 
         modal = ft.AlertDialog(
             modal=True,
@@ -1217,16 +1498,16 @@ class ClientesPage:
                 height=500,
             ),
             actions=[
-                ft.TextButton("Cerrar", style=ft.ButtonStyle(color=AppColors.PRIMARY), on_click=lambda e: self._cerrar_modal(modal)),
+                ft.TextButton("Cerrar", style=_ESTILO_BOTON_TEXTO, on_click=lambda e: self._cerrar_modal(modal)),
             ],
             actions_alignment=ft.MainAxisAlignment.END,
         )
 
-        self.page.overlay.append(modal)
+        self._agregar_al_overlay(modal)
         modal.open = True
-        self.page.update()
+        self._actualizar()
 
-    def _crear_card_venta(self, venta, cliente: Cliente) -> ft.Card:
+    def _crear_card_venta(self, venta, cliente: Cliente, abonos: List[Abono]) -> ft.Card:
         """Crea una tarjeta para mostrar una venta en el historial"""
 
         # Determinar estado y color
@@ -1245,24 +1526,19 @@ class ClientesPage:
             estado_icon = ft.Icons.PAYMENT
 
         # Lista de productos
-        productos_texto = []
-        for item in venta.productos:
-            nombre = item.get("nombre", "Sin nombre")
-            cantidad = item.get("cantidad", 0)
-            precio = item.get("precio_unitario", 0)
-            subtotal = item.get("subtotal", 0)
-            productos_texto.append(
-                f"  • {nombre} x{cantidad} @ ${precio:.2f} = ${subtotal:.2f}"
+        productos_texto = [
+            _LINEA_PRODUCTO % (
+                item.get("nombre", "Sin nombre"),
+                item.get("cantidad", 0),
+                item.get("precio_unitario", 0),
+                item.get("subtotal", 0),
             )
+            for item in venta.productos
+        ]
 
         # Información de pagos (si es fiado)
         info_pagos = []
         if venta.es_fiado:
-            # Obtener abonos
-            session = get_session_context()
-            abonos = AbonoRepository.listar_por_venta(session, venta.id)
-            session.close()
-
             info_pagos.append(
                 ft.Text(f"Total: ${venta.total:.2f}", size=12, color=AppColors.PRIMARY)
             )
@@ -1283,7 +1559,7 @@ class ClientesPage:
                     usuario_abono = f" por {abono.usuario_nombre}" if abono.usuario_nombre else ""
                     info_pagos.append(
                         ft.Text(
-                            f"  • ${abono.monto:.2f} - {abono.fecha.strftime('%d/%m/%y')}{usuario_abono}",
+                            f"  • ${abono.monto:.2f} - {_fmt_fecha_corta(abono.fecha)}{usuario_abono}",
                             size=10,
                             color=AppColors.PRIMARY,
                         )
@@ -1314,7 +1590,7 @@ class ClientesPage:
                             ft.Row([
                                 ft.Icon(ft.Icons.CALENDAR_TODAY, size=16, color=ft.Colors.WHITE70),
                                 ft.Text(
-                                    venta.fecha.strftime("%d/%m/%Y %H:%M"),
+                                    _fmt_fecha_hora(venta.fecha),
                                     size=14,
                                     weight=ft.FontWeight.BOLD,
                                     color=ft.Colors.WHITE,
@@ -1390,79 +1666,80 @@ class ClientesPage:
             return
 
         # Cargar abonos de la venta
-        session = get_session_context()
-        abonos = AbonoRepository.listar_por_venta(session, venta.id)
-        session.close()
+        with self._db() as session:
+            abonos = AbonoRepository.listar_por_venta(session, venta.id)
 
-        # Lista de abonos
+        # Lista de abonos: una tarjeta por abono, por id, para agregar o quitar solo
+        # la que cambia en vez de rearmar la lista entera
         abonos_list = ft.Column(spacing=5, scroll=ft.ScrollMode.AUTO)
+        tarjetas_abono: Dict[int, ft.Card] = {}
+        sin_abonos = ft.Text("No hay abonos registrados", size=12, color=AppColors.PRIMARY, italic=True)
 
-        def actualizar_lista_abonos():
-            """Recarga la lista de abonos"""
-            session = get_session_context()
-            abonos_actuales = AbonoRepository.listar_por_venta(session, venta.id)
-            venta_actualizada = VentaRepository.obtener_por_id(session, venta.id)
-            session.close()
-
-            abonos_list.controls.clear()
-
-            if not abonos_actuales:
-                abonos_list.controls.append(
-                    ft.Text("No hay abonos registrados", size=12, color=AppColors.PRIMARY, italic=True)
-                )
-            else:
-                for abono in abonos_actuales:
-                    abonos_list.controls.append(
-                        ft.Card(
-                            content=ft.Container(
-                                content=ft.Row([
-                                    ft.Column([
-                                        ft.Text(
-                                            f"${abono.monto:.2f}",
-                                            size=14,
-                                            weight=ft.FontWeight.BOLD,
-                                            color=ft.Colors.GREEN_600,
-                                        ),
-                                        ft.Text(
-                                            abono.fecha.strftime("%d/%m/%Y %H:%M"),
-                                            size=11,
-                                            color=AppColors.PRIMARY,
-                                        ),
-                                    ], spacing=2),
-                                    ft.IconButton(
-                                        icon=ft.Icons.DELETE,
-                                        icon_color=AppColors.DANGER,
-                                        icon_size=18,
-                                        tooltip="Eliminar abono",
-                                        on_click=lambda e, a=abono: eliminar_abono(a),
-                                    ),
-                                ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
-                                padding=10,
+        def crear_card_abono(abono) -> ft.Card:
+            return ft.Card(
+                content=ft.Container(
+                    content=ft.Row([
+                        ft.Column([
+                            ft.Text(
+                                f"${abono.monto:.2f}",
+                                size=14,
+                                weight=ft.FontWeight.BOLD,
+                                color=ft.Colors.GREEN_600,
                             ),
-                        )
-                    )
+                            ft.Text(
+                                _fmt_fecha_hora(abono.fecha),
+                                size=11,
+                                color=AppColors.PRIMARY,
+                            ),
+                        ], spacing=2),
+                        ft.IconButton(
+                            icon=ft.Icons.DELETE,
+                            icon_color=AppColors.DANGER,
+                            icon_size=18,
+                            tooltip="Eliminar abono",
+                            on_click=lambda e, a=abono: eliminar_abono(a),
+                        ),
+                    ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+                    padding=10,
+                ),
+            )
 
-            # Actualizar información de la venta
+        def agregar_card_abono(abono):
+            if not tarjetas_abono:
+                abonos_list.controls.clear()  # quitar el aviso de "no hay abonos"
+            tarjeta = crear_card_abono(abono)
+            tarjetas_abono[abono.id] = tarjeta
+            abonos_list.controls.append(tarjeta)
+
+        def quitar_card_abono(abono_id: int):
+            tarjeta = tarjetas_abono.pop(abono_id, None)
+            if tarjeta is not None:
+                abonos_list.controls.remove(tarjeta)
+            if not tarjetas_abono:
+                abonos_list.controls.append(sin_abonos)
+
+        def actualizar_info_venta(venta_actualizada):
+            """Actualiza los totales de la venta mostrados en el modal"""
             info_total.value = f"Total: ${venta_actualizada.total:.2f}"
             info_abonado.value = f"Abonado: ${venta_actualizada.abonado:.2f}"
             info_resto.value = f"Resto: ${venta_actualizada.resto:.2f}"
             info_resto.color = ft.Colors.GREEN_600 if venta_actualizada.resto == 0 else ft.Colors.RED_600
 
-            self.page.update()
-
         def eliminar_abono(abono):
             """Elimina un abono"""
-            def confirmar_eliminar(e):
-                try:
-                    session = get_session_context()
-                    AbonoRepository.eliminar(session, abono.id)
-                    session.close()
+            def eliminar_y_recargar_venta(session):
+                AbonoRepository.eliminar(session, abono.id)
+                return VentaRepository.obtener_por_id(session, venta.id)
 
-                    confirm_modal.open = False
-                    self.page.update()
+            async def confirmar_eliminar(e):
+                try:
+                    venta_actualizada = await asyncio.to_thread(self._con_sesion, eliminar_y_recargar_venta)
 
-                    actualizar_lista_abonos()
-                    self._mostrar_exito("Abono eliminado exitosamente")
+                    with self._updates_agrupados():
+                        self._cerrar_modal(confirm_modal)
+                        quitar_card_abono(abono.id)
+                        actualizar_info_venta(venta_actualizada)
+                        self._mostrar_exito("Abono eliminado exitosamente")
 
                 except Exception as error:
                     self._mostrar_error(f"Error al eliminar abono: {error}")
@@ -1473,7 +1750,7 @@ class ClientesPage:
                 title=ft.Text("Confirmar eliminación", color=AppColors.PRIMARY),
                 content=ft.Text(f"¿Eliminar abono de ${abono.monto:.2f}?"),
                 actions=[
-                    ft.TextButton("Cancelar", style=ft.ButtonStyle(color=AppColors.PRIMARY), on_click=lambda e: self._cerrar_modal(confirm_modal)),
+                    ft.TextButton("Cancelar", style=_ESTILO_BOTON_TEXTO, on_click=lambda e: self._cerrar_modal(confirm_modal)),
                     ft.ElevatedButton(
                         "Eliminar",
                         bgcolor=AppColors.DANGER,
@@ -1482,63 +1759,76 @@ class ClientesPage:
                     ),
                 ],
             )
-            self.page.overlay.append(confirm_modal)
+            self._agregar_al_overlay(confirm_modal)
             confirm_modal.open = True
-            self.page.update()
+            self._actualizar()
 
         def agregar_abono(e):
             """Muestra el diálogo para agregar un nuevo abono"""
-            monto_field = ft.TextField(
-                label="Monto del abono",
+            monto_field = _campo_texto(
+                "Monto del abono",
                 prefix_text="$",
                 keyboard_type=ft.KeyboardType.NUMBER,
                 autofocus=True,
-                color=AppColors.PRIMARY,
-                border_color=AppColors.INPUT_BORDER,
-                focused_border_color=AppColors.INPUT_FOCUS,
             )
-            notas_field = ft.TextField(
-                label="Notas (opcional)",
+            notas_field = _campo_texto(
+                "Notas (opcional)",
                 multiline=True,
                 max_lines=2,
-                color=AppColors.PRIMARY,
-                border_color=AppColors.INPUT_BORDER,
-                focused_border_color=AppColors.INPUT_FOCUS,
             )
             error_msg = ft.Text("", color=AppColors.DANGER, size=12, visible=False)
 
-            def guardar_abono(e):
+            async def guardar_abono(e):
+                # Ya validado y convertido al escribir (ver _validar_campo_numerico);
+                # un monto en cero se rechaza acá, sin ir a la BD
+                monto = monto_field.data
+                if monto <= 0:
+                    error_msg.value = "El monto del abono debe ser mayor a 0"
+                    error_msg.visible = True
+                    self._actualizar()
+                    return
+
                 try:
-                    monto = float(monto_field.value or 0)
-                    notas = notas_field.value.strip() or None
+                    notas = _texto_o_none(notas_field)
 
                     # Obtener usuario actual del estado
                     usuario_actual = self.state.get("usuario_actual")
 
-                    session = get_session_context()
-                    AbonoRepository.crear(
-                        session,
-                        venta.id,
-                        monto,
-                        notas,
-                        usuario_id=usuario_actual.id if usuario_actual else None,
-                        usuario_nombre=usuario_actual.nombre if usuario_actual else None
-                    )
-                    session.close()
+                    def crear_y_recargar_venta(session):
+                        abono = AbonoRepository.crear(
+                            session,
+                            venta.id,
+                            monto,
+                            notas,
+                            usuario_id=usuario_actual.id if usuario_actual else None,
+                            usuario_nombre=usuario_actual.nombre if usuario_actual else None
+                        )
+                        return abono, VentaRepository.obtener_por_id(session, venta.id)
 
-                    abono_modal.open = False
-                    self.page.update()
+                    # Guardar en BD (fuera del hilo de la UI)
+                    abono, venta_actualizada = await asyncio.to_thread(self._con_sesion, crear_y_recargar_venta)
 
-                    actualizar_lista_abonos()
-                    self._mostrar_exito("Abono registrado exitosamente")
+                    with self._updates_agrupados():
+                        self._cerrar_modal(abono_modal)
+                        agregar_card_abono(abono)
+                        actualizar_info_venta(venta_actualizada)
+                        self._mostrar_exito("Abono registrado exitosamente")
 
                 except ValueError as ve:
                     error_msg.value = str(ve)
                     error_msg.visible = True
-                    self.page.update()
+                    self._actualizar()
                 except Exception as error:
                     self._mostrar_error(f"Error al registrar abono: {error}")
 
+            btn_guardar = ft.ElevatedButton(
+                "Guardar",
+                bgcolor=ft.Colors.GREEN_600,
+                color=ft.Colors.WHITE,
+                on_click=guardar_abono,
+            )
+            self._validar_campo_numerico(monto_field, btn_guardar)
+
             abono_modal = ft.AlertDialog(
                 modal=True,
                 bgcolor=AppColors.MODAL_BG,
@@ -1549,18 +1839,13 @@ class ClientesPage:
                     error_msg,
                 ], tight=True, spacing=10),
                 actions=[
-                    ft.TextButton("Cancelar", style=ft.ButtonStyle(color=AppColors.PRIMARY), on_click=lambda e: self._cerrar_modal(abono_modal)),
-                    ft.ElevatedButton(
-                        "Guardar",
-                        bgcolor=ft.Colors.GREEN_600,
-                        color=ft.Colors.WHITE,
-                        on_click=guardar_abono,
-                    ),
+                    ft.TextButton("Cancelar", style=_ESTILO_BOTON_TEXTO, on_click=lambda e: self._cerrar_modal(abono_modal)),
+                    btn_guardar,
                 ],
             )
-            self.page.overlay.append(abono_modal)
+            self._agregar_al_overlay(abono_modal)
             abono_modal.open = True
-            self.page.update()
+            self._actualizar()
 
         # Información de la venta
         info_total = ft.Text(f"Total: ${venta.total:.2f}", size=14, color=AppColors.PRIMARY)
@@ -1572,8 +1857,11 @@ class ClientesPage:
             color=ft.Colors.GREEN_600 if venta.resto == 0 else ft.Colors.RED_600,
         )
 
-        # Inicializar lista de abonos
-        actualizar_lista_abonos()
+        # Inicializar lista de abonos (los ya cargados arriba)
+        for abono in abonos:
+            agregar_card_abono(abono)
+        if not abonos:
+            abonos_list.controls.append(sin_abonos)
 
         modal = ft.AlertDialog(
             modal=True,
@@ -1585,7 +1873,7 @@ class ClientesPage:
             content=ft.Container(
                 content=ft.Column([
                     ft.Text(
-                        f"Venta del {venta.fecha.strftime('%d/%m/%Y %H:%M')}",
+                        f"Venta del {_fmt_fecha_hora(venta.fecha)}",
                         size=14,
                         weight=ft.FontWeight.BOLD,
                         color=AppColors.PRIMARY,
@@ -1595,7 +1883,7 @@ class ClientesPage:
                         bgcolor=ft.Colors.GREY_100,
                         padding=10,
                         border_radius=8,
-                        margin=ft.margin.only(top=10, bottom=10),
+                        margin=_MARGEN_RECUADRO,
                     ),
                     ft.Row([
                         ft.Text("Abonos registrados:", size=14, weight=ft.FontWeight.BOLD, color=AppColors.PRIMARY),
@@ -1614,14 +1902,14 @@ class ClientesPage:
                 width=500,
             ),
             actions=[
-                ft.TextButton("Cerrar", style=ft.ButtonStyle(color=AppColors.PRIMARY), on_click=lambda e: [self._cerrar_modal(modal), self._cargar_clientes(None)]),
+                ft.TextButton("Cerrar", style=_ESTILO_BOTON_TEXTO, on_click=self._agrupar_updates(lambda e: [self._cerrar_modal(modal), self._cargar_clientes(None)])),
             ],
             actions_alignment=ft.MainAxisAlignment.END,
         )
 
-        self.page.overlay.append(modal)
+        self._agregar_al_overlay(modal)
         modal.open = True
-        self.page.update()
+        self._actualizar()
 
     # ============================================
     # MODAL: CONFIRMAR ELIMINAR VENTA
@@ -1629,35 +1917,52 @@ class ClientesPage:
     def _confirmar_eliminar_venta(self, venta, cliente: Cliente):
         """Confirma la eliminación de una venta"""
 
-        def eliminar(e):
-            try:
-                session = get_session_context()
+        # El diálogo se arma una sola vez; en cada apertura solo cambian los textos
+        if self._modal_eliminar_venta is None:
+            self._construir_modal_eliminar_venta()
 
-                # Eliminar venta (esto ya revierte stock y deuda automáticamente)
-                exito = VentaRepository.eliminar(session, venta.id)
+        # Advertencia
+        advertencia_texto = "Esta acción eliminará la venta y revertirá los cambios de stock"
+        if venta.es_fiado and venta.abonado > 0:
+            advertencia_texto += f" y la deuda del cliente (se restarán ${venta.resto:.2f} de la deuda)."
+        else:
+            advertencia_texto += "."
 
-                session.close()
+        self._venta_a_eliminar = venta
+        self._txt_elim_fecha.value = f"Fecha: {_fmt_fecha_hora(venta.fecha)}"
+        self._txt_elim_total.value = f"Total: ${venta.total:.2f}"
+        self._txt_elim_advertencia.value = advertencia_texto
 
-                if exito:
-                    modal.open = False
-                    self.page.update()
+        self._abrir_modal(self._modal_eliminar_venta)
 
-                    self._mostrar_exito("Venta eliminada exitosamente")
+    def _construir_modal_eliminar_venta(self):
+        """Crea (una vez) el diálogo de confirmación para eliminar una venta"""
+        modal = None
 
-                    # Recargar la lista de clientes
-                    self._cargar_clientes(None)
+        async def eliminar(e):
+            venta = self._venta_a_eliminar
+            try:
+                # Eliminar venta (esto ya revierte stock y deuda automáticamente)
+                exito = await asyncio.to_thread(
+                    self._con_sesion, lambda session: VentaRepository.eliminar(session, venta.id)
+                )
+
+                if exito:
+                    # Cerrar modal, avisar y recargar la lista en un solo page.update()
+                    with self._updates_agrupados():
+                        self._cerrar_modal(modal)
+                        self._mostrar_exito("Venta eliminada exitosamente")
+                        self._cargar_clientes(None)
                 else:
                     self._mostrar_error("No se pudo eliminar la venta")
 
             except Exception as error:
                 self._mostrar_error(f"Error al eliminar venta: {error}")
 
-        # Advertencia
-        advertencia_texto = "Esta acción eliminará la venta y revertirá los cambios de stock"
-        if venta.es_fiado and venta.abonado > 0:
-            advertencia_texto += f" y la deuda del cliente (se restarán ${venta.resto:.2f} de la deuda)."
-        else:
-            advertencia_texto += "."
+        # Textos que cambian en cada apertura
+        self._txt_elim_fecha = ft.Text(size=14, color=AppColors.PRIMARY)
+        self._txt_elim_total = ft.Text(size=14, weight=ft.FontWeight.BOLD, color=AppColors.PRIMARY)
+        self._txt_elim_advertencia = ft.Text(size=12, color=ft.Colors.ORANGE_700, italic=True)
 
         modal = ft.AlertDialog(
             modal=True,
@@ -1674,32 +1979,18 @@ class ClientesPage:
                 ),
                 ft.Container(
                     content=ft.Column([
-                        ft.Text(
-                            f"Fecha: {venta.fecha.strftime('%d/%m/%Y %H:%M')}",
-                            size=14,
-                            color=AppColors.PRIMARY,
-                        ),
-                        ft.Text(
-                            f"Total: ${venta.total:.2f}",
-                            size=14,
-                            weight=ft.FontWeight.BOLD,
-                            color=AppColors.PRIMARY,
-                        ),
-                        ft.Text(
-                            advertencia_texto,
-                            size=12,
-                            color=ft.Colors.ORANGE_700,
-                            italic=True,
-                        ),
+                        self._txt_elim_fecha,
+                        self._txt_elim_total,
+                        self._txt_elim_advertencia,
                     ], spacing=5),
                     bgcolor=ft.Colors.ORANGE_50,
                     padding=15,
                     border_radius=8,
-                    margin=ft.margin.only(top=10, bottom=10),
+                    margin=_MARGEN_RECUADRO,
                 ),
             ], tight=True, spacing=10),
             actions=[
-                ft.TextButton("Cancelar", style=ft.ButtonStyle(color=AppColors.PRIMARY), on_click=lambda e: self._cerrar_modal(modal)),
+                ft.TextButton("Cancelar", style=_ESTILO_BOTON_TEXTO, on_click=lambda e: self._cerrar_modal(modal)),
                 ft.ElevatedButton(
                     "Eliminar",
                     bgcolor=AppColors.DANGER,
@@ -1711,37 +2002,44 @@ class ClientesPage:
             actions_alignment=ft.MainAxisAlignment.END,
         )
 
-        self.page.overlay.append(modal)
-        modal.open = True
-        self.page.update()
+        self._modal_eliminar_venta = modal
 
     # ============================================
     # SINCRONIZACIÓN DE DEUDAS
     # ============================================
     def _sincronizar_todas_deudas(self, e):
         """Sincroniza las deudas de todos los clientes con la realidad desde las ventas"""
+        # El diálogo de confirmación no cambia: se arma la primera vez y se reutiliza
+        if self._modal_sincronizar is None:
+            self._construir_modal_sincronizar()
+        self._abrir_modal(self._modal_sincronizar)
+
+    def _construir_modal_sincronizar(self):
+        """Crea (una vez) el diálogo de confirmación de la sincronización de deudas"""
+        confirm_modal = None
 
-        def confirmar_sincronizacion(e):
+        async def confirmar_sincronizacion(e):
             try:
                 confirm_modal.open = False
                 self.loading.visible = True
-                self.page.update()
+                self._actualizar()
+                self._quitar_del_overlay(confirm_modal)
 
-                session = get_session_context()
-                stats = ClienteRepository.sincronizar_todas_las_deudas(session)
-                session.close()
-
-                # Mostrar resultados
-                self._mostrar_resultados_sincronizacion(stats)
+                # Fuera del hilo de la UI: el ProgressRing sigue animándose mientras tanto
+                stats = await asyncio.to_thread(
+                    self._con_sesion, ClienteRepository.sincronizar_todas_las_deudas
+                )
 
-                # Recargar lista
-                self._cargar_clientes(None)
+                # Resultados y recarga de la lista en un solo page.update(); el
+                # ProgressRing lo oculta la recarga cuando termina
+                with self._updates_agrupados():
+                    self._mostrar_resultados_sincronizacion(stats)
+                    self._cargar_clientes(None)
 
             except Exception as error:
-                self._mostrar_error(f"Error al sincronizar deudas: {error}")
-            finally:
-                self.loading.visible = False
-                self.page.update()
+                with self._updates_agrupados():
+                    self.loading.visible = False
+                    self._mostrar_error(f"Error al sincronizar deudas: {error}")
 
         confirm_modal = ft.AlertDialog(
             modal=True,
@@ -1771,11 +2069,11 @@ class ClientesPage:
                     bgcolor=ft.Colors.ORANGE_50,
                     padding=10,
                     border_radius=8,
-                    margin=ft.margin.only(top=10, bottom=10),
+                    margin=_MARGEN_RECUADRO,
                 ),
             ], tight=True, spacing=10),
             actions=[
-                ft.TextButton("Cancelar", style=ft.ButtonStyle(color=AppColors.PRIMARY), on_click=lambda e: self._cerrar_modal(confirm_modal)),
+                ft.TextButton("Cancelar", style=_ESTILO_BOTON_TEXTO, on_click=lambda e: self._cerrar_modal(confirm_modal)),
                 ft.ElevatedButton(
                     "Sincronizar",
                     bgcolor=ft.Colors.ORANGE_600,
@@ -1787,22 +2085,21 @@ class ClientesPage:
             actions_alignment=ft.MainAxisAlignment.END,
         )
 
-        self.page.overlay.append(confirm_modal)
-        confirm_modal.open = True
-        self.page.update()
+        self._modal_sincronizar = confirm_modal
 
     def _mostrar_resultados_sincronizacion(self, stats: dict):
         """Muestra los resultados de la sincronización"""
 
-        contenido = []
+        # Encabezado y resumen fijos; las filas de cada corrección se crean por bloques al hacer scroll
+        contenido = ft.ListView(spacing=10, expand=True, on_scroll_interval=100)
 
-        contenido.append(ft.Text(
+        contenido.controls.append(ft.Text(
             f"Total de clientes: {stats['total_clientes']}",
             size=16,
             color=AppColors.PRIMARY,
         ))
 
-        contenido.append(ft.Text(
+        contenido.controls.append(ft.Text(
             f"Clientes corregidos: {stats['clientes_corregidos']}",
             size=16,
             weight=ft.FontWeight.BOLD,
@@ -1810,26 +2107,9 @@ class ClientesPage:
         ))
 
         if stats['diferencias']:
-            contenido.append(ft.Divider())
-            contenido.append(ft.Text("Detalles de las correcciones:", size=14, weight=ft.FontWeight.BOLD, color=AppColors.PRIMARY))
-
-            for diff in stats['diferencias']:
-                diferencia_texto = f"+${abs(diff['diferencia']):.2f}" if diff['diferencia'] > 0 else f"-${abs(diff['diferencia']):.2f}"
-                color_diferencia = ft.Colors.RED_600 if diff['diferencia'] > 0 else ft.Colors.GREEN_600
-
-                contenido.append(
-                    ft.Container(
-                        content=ft.Column([
-                            ft.Text(f"{diff['nombre']}", size=13, weight=ft.FontWeight.BOLD),
-                            ft.Text(f"BD: ${diff['deuda_bd']:.2f} → Real: ${diff['deuda_real']:.2f}", size=12),
-                            ft.Text(f"Diferencia: {diferencia_texto}", size=12, color=color_diferencia),
-                        ], spacing=3),
-                        bgcolor=ft.Colors.GREY_100,
-                        padding=10,
-                        border_radius=5,
-                        margin=ft.margin.only(bottom=5),
-                    )
-                )
+            contenido.controls.append(ft.Divider())
+            contenido.controls.append(ft.Text("Detalles de las correcciones:", size=14, weight=ft.FontWeight.BOLD, color=AppColors.PRIMARY))
+            self._llenar_por_bloques(contenido, stats['diferencias'], self._crear_fila_diferencia)
 
         modal = ft.AlertDialog(
             modal=True,
@@ -1839,54 +2119,186 @@ class ClientesPage:
                 ft.Text("Sincronización Completada", size=20, weight=ft.FontWeight.BOLD, color=AppColors.PRIMARY),
             ]),
             content=ft.Container(
-                content=ft.Column(contenido, spacing=10, scroll=ft.ScrollMode.AUTO),
+                content=contenido,
                 width=500,
                 height=400 if stats['diferencias'] else 150,
             ),
             actions=[
-                ft.TextButton("Cerrar", style=ft.ButtonStyle(color=AppColors.PRIMARY), on_click=lambda e: self._cerrar_modal(modal)),
+                ft.TextButton("Cerrar", style=_ESTILO_BOTON_TEXTO, on_click=lambda e: self._cerrar_modal(modal)),
             ],
             actions_alignment=ft.MainAxisAlignment.END,
         )
 
-        self.page.overlay.append(modal)
+        self._agregar_al_overlay(modal)
         modal.open = True
-        self.page.update()
+        self._actualizar()
+
+    def _crear_fila_diferencia(self, diff: dict) -> ft.Container:
+        """Crea la fila de una corrección en los resultados de la sincronización"""
+        diferencia = diff['diferencia']
+        if diferencia > 0:
+            diferencia_texto, color_diferencia = f"+${diferencia:.2f}", ft.Colors.RED_600
+        else:
+            diferencia_texto, color_diferencia = f"-${abs(diferencia):.2f}", ft.Colors.GREEN_600
+
+        return ft.Container(
+            content=ft.Column([
+                ft.Text(f"{diff['nombre']}", size=13, weight=ft.FontWeight.BOLD),
+                ft.Text(f"BD: ${diff['deuda_bd']:.2f} → Real: ${diff['deuda_real']:.2f}", size=12),
+                ft.Text(f"Diferencia: {diferencia_texto}", size=12, color=color_diferencia),
+            ], spacing=3),
+            bgcolor=ft.Colors.GREY_100,
+            padding=10,
+            border_radius=5,
+            margin=ft.margin.only(bottom=5),
+        )
 
     # ============================================
     # HELPERS
     # ============================================
+    def _llenar_por_bloques(self, lista: ft.ListView, items: list, crear_control):
+        """
+        Agrega a la lista los controles de los primeros TAM_BLOQUE items y el resto
+        por bloques, cuando el scroll se acerca al final (a MARGEN_SCROLL px)
+        """
+        creados = 0
+
+        def agregar_bloque() -> bool:
+            nonlocal creados
+            bloque = items[creados:creados + self.TAM_BLOQUE]
+            if not bloque:
+                return False
+            lista.controls.extend(crear_control(item) for item in bloque)
+            creados += len(bloque)
+            return True
+
+        def on_scroll(e: ft.OnScrollEvent):
+            if e.max_scroll_extent is None or e.pixels is None:
+                return
+            if e.pixels >= e.max_scroll_extent - self.MARGEN_SCROLL and agregar_bloque():
+                lista.update()
+
+        lista.on_scroll = on_scroll
+        agregar_bloque()
+
+    @contextmanager
+    def _db(self):
+        """
+        Sesión del hilo actual para un bloque with: al salir se cierra (devuelve su
+        conexión al pool) y se descarta del registro, aunque el bloque termine con
+        una excepción. Así no quedan sesiones en los hilos de trabajo, que
+        dispose() no puede alcanzar (remove() solo actúa sobre el hilo que lo llama)
+        """
+        session = self._session()
+        try:
+            yield session
+        finally:
+            self._session.remove()
+
+    def _con_sesion(self, operacion):
+        """Ejecuta operacion(session) con la sesión del hilo actual y la descarta al terminar"""
+        with self._db() as session:
+            return operacion(session)
+
+    def _abrir_modal(self, modal):
+        """Abre un modal reutilizable, volviéndolo a agregar al overlay si se había quitado al cerrarlo"""
+        pendientes = self._overlay_pendiente()
+        if pendientes is not None and modal in pendientes:
+            pendientes.remove(modal)
+        else:
+            self._agregar_al_overlay(modal)
+        modal.open = True
+        self._actualizar()
+
     def _cerrar_modal(self, modal):
-        """Cierra un modal"""
+        """Cierra un modal y lo saca del overlay"""
         modal.open = False
-        self.page.update()
+        self._actualizar()
+        self._quitar_del_overlay(modal)
+
+    def _quitar_del_overlay(self, control):
+        """
+        Saca del overlay un control ya cerrado para que no se acumule en cada
+        page.update(). Si hay un bloque de updates agrupados abierto, se espera
+        a que se envíe el cierre antes de quitarlo.
+        """
+        pendientes = self._overlay_pendiente()
+        if pendientes is not None:
+            pendientes.append(control)
+            return
+        if control in self.page.overlay:
+            self.page.overlay.remove(control)
+        if control in self._overlay_propio:
+            self._overlay_propio.remove(control)
+
+    def _agregar_al_overlay(self, control):
+        """Agrega un control al overlay (si no está ya) y lo anota como propio de la página"""
+        if control not in self.page.overlay:
+            self.page.overlay.append(control)
+        if control not in self._overlay_propio:
+            self._overlay_propio.append(control)
 
     def _mostrar_error(self, mensaje: str):
         """Muestra un mensaje de error"""
-        snack = ft.SnackBar(
-            content=ft.Text(mensaje),
-            bgcolor=AppColors.DANGER,
-        )
-        self.page.overlay.append(snack)
-        snack.open = True
-        self.page.update()
-    
+        self._mostrar_mensaje(mensaje, AppColors.DANGER)
+
+    def _actualizar(self):
+        """
+        page.update(), salvo dentro de un bloque de _updates_agrupados abierto en
+        este mismo hilo: ahí lo envía el bloque al terminar
+        """
+        if self._overlay_pendiente() is None:
+            self.page.update()
+
+    def _overlay_pendiente(self) -> Optional[List[ft.Control]]:
+        """Modales pendientes de quitar del bloque agrupado de este hilo (None si no hay bloque)"""
+        return getattr(self._agrupado, 'pendientes', None)
+
+    @contextmanager
+    def _updates_agrupados(self):
+        """
+        Junta todos los updates del bloque en uno solo al salir: cerrar el modal,
+        mostrar el aviso, abrir el siguiente diálogo, etc. se envían juntos al
+        cliente de Flet en vez de uno por paso. Solo afecta a _actualizar() en el
+        hilo que abrió el bloque; page.update() no se toca.
+        """
+        if self._overlay_pendiente() is not None:
+            # Ya hay un bloque abierto más afuera: ese hace el update final
+            yield
+            return
+
+        self._agrupado.pendientes = []
+        try:
+            yield
+        finally:
+            pendientes = self._agrupado.pendientes
+            self._agrupado.pendientes = None
+            self.page.update()
+            for control in pendientes:
+                self._quitar_del_overlay(control)
+
+    def _agrupar_updates(self, handler):
+        """Envuelve un handler de evento para que corra dentro de _updates_agrupados"""
+        def envoltura(e):
+            with self._updates_agrupados():
+                return handler(e)
+        return envoltura
+
     def _mostrar_exito(self, mensaje: str):
         """Muestra un mensaje de éxito"""
-        snack = ft.SnackBar(
-            content=ft.Text(mensaje),
-            bgcolor=AppColors.SUCCESS,
-        )
-        self.page.overlay.append(snack)
-        snack.open = True
-        self.page.update()
-    
+        self._mostrar_mensaje(mensaje, AppColors.SUCCESS)
+
     def _mostrar_info(self, mensaje: str):
         """Muestra un mensaje informativo"""
-        snack = ft.SnackBar(
-            content=ft.Text(mensaje),
-            bgcolor=ft.Colors.BLUE_400,
-        )
-        self.page.overlay.append(snack)
-        snack.open = True
-        self.page.update()
\ No newline at end of file
+        self._mostrar_mensaje(mensaje, ft.Colors.BLUE_400)
+
+    def _mostrar_mensaje(self, mensaje: str, color):
+        """
+        Muestra el aviso en la SnackBar de la página: es una sola y se reutiliza
+        cambiando texto y color, en vez de sumar una nueva al overlay por mensaje
+        """
+        self._snack_texto.value = mensaje
+        self._snackbar.bgcolor = color
+        self._agregar_al_overlay(self._snackbar)
+        self._snackbar.open = True
+        self._actualizar()
@@ -5,6 +5,15 @@ from config.settings import AppColors
 class Sidebar:
     """Sidebar con navegación moderna y expansible"""
 
+    # Fondos de los botones (se calculan una vez, no por botón)
+    COLOR_BOTON = ft.Colors.with_opacity(0.05, ft.Colors.WHITE)
+    COLOR_BOTON_HOVER = ft.Colors.with_opacity(0.15, ft.Colors.WHITE)
+
+    # Padding de los botones con la sidebar expandida / colapsada, y su borde
+    PADDING_EXPANDIDO = ft.padding.symmetric(horizontal=15, vertical=12)
+    PADDING_COLAPSADO = ft.padding.all(12)
+    RADIO_BOTON = ft.border_radius.all(8)
+
     def __init__(self, page, router, usuario=None, on_logout=None):
         self.page = page
         self.router = router
@@ -132,8 +141,8 @@ class Sidebar:
         return self.sidebar_container
 
     def _create_nav_button(self, text: str, icon, route: str, color=ft.Colors.WHITE):
-        base_color = ft.Colors.with_opacity(0.05, ft.Colors.WHITE)
-        hover_color = ft.Colors.with_opacity(0.15, ft.Colors.WHITE)
+        base_color = self.COLOR_BOTON
+        hover_color = self.COLOR_BOTON_HOVER
         active_color = AppColors.SIDEBAR_ACCENT
 
         icon_ref = ft.Icon(icon, color=color, size=15)
@@ -151,14 +160,6 @@ class Sidebar:
             alignment=ft.MainAxisAlignment.START,
         )
         
-        btn_container = ft.Container(
-            content=btn_row,
-            padding=ft.padding.symmetric(horizontal=15, vertical=12),
-            border_radius=ft.border_radius.all(8),
-            bgcolor=base_color,
-            alignment=ft.alignment.center_left,
-        )
-
         def update_active_style(is_active: bool):
             btn_container.bgcolor = active_color if is_active else base_color
             icon_ref.color = ft.Colors.WHITE if is_active else color
@@ -175,42 +176,42 @@ class Sidebar:
                 btn_container.bgcolor = hover_color if e.data == "true" else base_color
                 btn_container.update()
 
-        btn = ft.GestureDetector(
-            content=btn_container,
-            on_tap=on_tap,
+        # El propio Container maneja el click (con ripple nativo) y el hover; su
+        # on_hover solo avisa al entrar y salir, no en cada movimiento del mouse
+        btn_container = ft.Container(
+            content=btn_row,
+            padding=self.PADDING_EXPANDIDO,
+            border_radius=self.RADIO_BOTON,
+            bgcolor=base_color,
+            alignment=ft.alignment.center_left,
+            ink=True,
+            ink_color=hover_color,
+            on_click=on_tap,
             on_hover=on_hover,
         )
 
         # Guardamos el botón con su texto para poder ocultarlo/mostrarlo
-        self.buttons.append((btn, update_active_style, route, text_ref))
-        return btn
+        self.buttons.append((btn_container, update_active_style, route, text_ref))
+        return btn_container
 
     def _toggle_sidebar(self, e):
         """Alterna entre sidebar expandida y colapsada"""
         self.is_expanded = not self.is_expanded
 
-        if self.is_expanded:
-            # Expandir
-            self.sidebar_container.width = 220
-            self.logo_text.visible = True
-            self.usuario_text.visible = True
-            self.rol_text.visible = True
-            # Mostrar todos los textos de los botones y alinear a la izquierda
-            for btn, update_style, route, text_ref in self.buttons:
-                text_ref.visible = True
-                btn.content.alignment = ft.alignment.center_left
-                btn.content.padding = ft.padding.symmetric(horizontal=15, vertical=12)
-        else:
-            # Colapsar
-            self.sidebar_container.width = 70
-            self.logo_text.visible = False
-            self.usuario_text.visible = False
-            self.rol_text.visible = False
-            # Ocultar todos los textos de los botones y centrar íconos
-            for btn, update_style, route, text_ref in self.buttons:
-                text_ref.visible = False
-                btn.content.alignment = ft.alignment.center
-                btn.content.padding = ft.padding.all(12)
+        expandida = self.is_expanded
+        self.sidebar_container.width = 220 if expandida else 70
+        self.logo_text.visible = expandida
+        self.usuario_text.visible = expandida
+        self.rol_text.visible = expandida
+
+        # Textos de los botones visibles y alineados a la izquierda solo si está
+        # expandida; colapsada quedan los íconos centrados
+        alineacion = ft.alignment.center_left if expandida else ft.alignment.center
+        padding = self.PADDING_EXPANDIDO if expandida else self.PADDING_COLAPSADO
+        for btn, update_style, route, text_ref in self.buttons:
+            text_ref.visible = expandida
+            btn.alignment = alineacion
+            btn.padding = padding
 
         self.page.update()
 
@@ -222,8 +223,8 @@ class Sidebar:
 
     def _create_action_button(self, text: str, icon, on_click_handler, color=ft.Colors.WHITE):
         """Crea un botón de acción (no de navegación)"""
-        base_color = ft.Colors.with_opacity(0.05, ft.Colors.WHITE)
-        hover_color = ft.Colors.with_opacity(0.15, ft.Colors.WHITE)
+        base_color = self.COLOR_BOTON
+        hover_color = self.COLOR_BOTON_HOVER
 
         icon_ref = ft.Icon(icon, color=color, size=15)
         text_ref = ft.Text(
@@ -240,14 +241,6 @@ class Sidebar:
             alignment=ft.MainAxisAlignment.START,
         )
 
-        btn_container = ft.Container(
-            content=btn_row,
-            padding=ft.padding.symmetric(horizontal=15, vertical=12),
-            border_radius=ft.border_radius.all(8),
-            bgcolor=base_color,
-            alignment=ft.alignment.center_left,
-        )
-
         def on_tap(e):
             on_click_handler()
 
@@ -255,15 +248,21 @@ class Sidebar:
             btn_container.bgcolor = hover_color if e.data == "true" else base_color
             btn_container.update()
 
-        btn = ft.GestureDetector(
-            content=btn_container,
-            on_tap=on_tap,
+        btn_container = ft.Container(
+            content=btn_row,
+            padding=self.PADDING_EXPANDIDO,
+            border_radius=self.RADIO_BOTON,
+            bgcolor=base_color,
+            alignment=ft.alignment.center_left,
+            ink=True,
+            ink_color=hover_color,
+            on_click=on_tap,
             on_hover=on_hover,
         )
 
         # Guardamos también el text_ref para ocultarlo/mostrarlo al colapsar
-        self.buttons.append((btn, lambda x: None, "action", text_ref))
-        return btn
+        self.buttons.append((btn_container, lambda x: None, "action", text_ref))
+        return btn_container
 
     def _cerrar_sesion(self):
         """Maneja el cierre de sesión"""
@@ -1,5 +1,6 @@
 """Página de login"""
 
+import asyncio
 import flet as ft
 from config.settings import AppColors
 from database.connection import get_session_context
@@ -23,7 +24,7 @@ class LoginPage:
             bgcolor=AppColors.INPUT_BG,
             border_color=AppColors.INPUT_BORDER,
             focused_border_color=AppColors.INPUT_FOCUS,
-            on_submit=lambda e: self._intentar_login(e),
+            on_submit=self._intentar_login,
         )
 
         self.contraseña_field = ft.TextField(
@@ -35,7 +36,7 @@ class LoginPage:
             bgcolor=AppColors.INPUT_BG,
             border_color=AppColors.INPUT_BORDER,
             focused_border_color=AppColors.INPUT_FOCUS,
-            on_submit=lambda e: self._intentar_login(e),
+            on_submit=self._intentar_login,
         )
 
         self.error_text = ft.Text(
@@ -150,7 +151,7 @@ class LoginPage:
 
         return self.container
 
-    def _intentar_login(self, e):
+    async def _intentar_login(self, e):
         """Intenta autenticar al usuario"""
 
         # Validar campos
@@ -171,31 +172,14 @@ class LoginPage:
         self.page.update()
 
         try:
-            session = get_session_context()
+            # Fuera del hilo de la UI: el ProgressRing sigue animándose mientras tanto
+            resultado = await asyncio.to_thread(self._autenticar, nombre, contraseña)
 
-            # Autenticar usuario
-            usuario = UsuarioRepository.autenticar(session, nombre, contraseña)
-
-            if not usuario:
-                session.close()
+            if not resultado:
                 self._mostrar_error("Usuario o contraseña incorrectos")
-                self.loading.visible = False
-                self.page.update()
                 return
 
-            # Crear sesión
-            sesion = SesionRepository.iniciar_sesion(session, usuario.id, duracion_horas=8)
-
-            # Extraer datos ANTES de cerrar la sesión para evitar DetachedInstanceError
-            usuario_data = {
-                "id": usuario.id,
-                "nombre": usuario.nombre,
-                "rol": usuario.rol,
-                "activo": usuario.activo,
-            }
-            token = sesion.token
-
-            session.close()
+            usuario_data, token = resultado
 
             # Crear objeto usuario con los datos extraídos para pasar al callback
             from models.usuario import Usuario
@@ -211,8 +195,33 @@ class LoginPage:
 
         except Exception as error:
             self._mostrar_error(f"Error al iniciar sesión: {error}")
-            self.loading.visible = False
-            self.page.update()
+
+    @staticmethod
+    def _autenticar(nombre: str, contraseña: str):
+        """
+        Autentica y abre la sesión en la BD (corre en un hilo aparte).
+        Retorna (datos del usuario, token), o None si el usuario o la contraseña no son válidos.
+        """
+        session = get_session_context()
+        try:
+            # Autenticar usuario
+            usuario = UsuarioRepository.autenticar(session, nombre, contraseña)
+            if not usuario:
+                return None
+
+            # Crear sesión
+            sesion = SesionRepository.iniciar_sesion(session, usuario.id, duracion_horas=8)
+
+            # Extraer datos ANTES de cerrar la sesión para evitar DetachedInstanceError
+            usuario_data = {
+                "id": usuario.id,
+                "nombre": usuario.nombre,
+                "rol": usuario.rol,
+                "activo": usuario.activo,
+            }
+            return usuario_data, sesion.token
+        finally:
+            session.close()
 
     def _mostrar_error(self, mensaje: str):
         """Muestra un mensaje de error"""
@@ -830,7 +830,7 @@ class NuevaVentaPage:
         btn_no_imprimir = None
         progress_ring = ft.ProgressRing(visible=False, width=20, height=20)
 
-        def imprimir_directo(e):
+        async def imprimir_directo(e):
             try:
                 es_web = getattr(self.page, 'web', False)
 
@@ -839,7 +839,7 @@ class NuevaVentaPage:
                 self.page.update()
 
                 # Usar método unificado (detecta web/desktop automáticamente)
-                PDFGenerator.imprimir_o_mostrar(self.page, venta=venta, tipo='venta')
+                await PDFGenerator.imprimir_o_mostrar(self.page, venta=venta, tipo='venta')
 
                 # Solo mostrar snackbar en desktop (en web el modal del PDF ya informa)
                 if not es_web:
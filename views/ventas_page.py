@@ -347,7 +347,7 @@ class VentasPage:
         # Variable para guardar referencia al modal
         modal_ref = [None]
 
-        def imprimir_comprobante(e):
+        async def imprimir_comprobante(e):
             es_web = getattr(self.page, 'web', False)
 
             # Cerrar el modal de detalles primero
@@ -357,7 +357,7 @@ class VentasPage:
 
             try:
                 # Usar método unificado (detecta web/desktop automáticamente)
-                PDFGenerator.imprimir_o_mostrar(self.page, venta=venta_actual, tipo='venta')
+                await PDFGenerator.imprimir_o_mostrar(self.page, venta=venta_actual, tipo='venta')
 
                 # Solo mostrar snackbar en desktop (en web el modal del PDF ya informa)
                 if not es_web: